@@ -1,6 +1,6 @@
 # Domain layer: domain models, aggregates and domain-specific rules.
-from .actor import Actor, Facet
+from .actor import Actor, Facet, act_batch, handles
 from .character import Character
 from .scene import Scene, Participant
 
-__all__ = ["Actor", "Character", "Facet", "Scene", "Participant"]
+__all__ = ["Actor", "Character", "Facet", "Scene", "Participant", "act_batch", "handles"]
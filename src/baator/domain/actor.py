@@ -1,35 +1,166 @@
 # domain/actor.py
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+import copy
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
 from uuid import UUID
 from baator.kernel.base import AggregateRoot
 from baator.kernel.events import Event
 from baator.kernel.commands import Command
 from baator.kernel.layers import Layer
 
+Handler = Callable[[Any, Command], List[Event]]
+
+def handles(*names: str, route: str = "target_id"):
+    """
+    Mark a facet method as the handler for the given command names. `route`
+    is the payload key naming the actor the command applies to (falling back
+    to actor_id): "actor_id" for commands an actor issues on itself.
+    """
+    def mark(fn):
+        fn._handles = names
+        fn._route = route
+        return fn
+    return mark
+
 class Facet:
+    __slots__ = ()   # keeps slotted facet dataclasses free of a __dict__
     layer: Layer
+    shareable = True   # forks may share it until one of them writes (see Actor.fork)
+    _handlers: Dict[str, Handler] = {}   # command name -> method; built per class
+    _routes: Dict[str, str] = {}         # command name -> routing payload key (see handles)
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        table: Dict[str, Handler] = {}
+        routes: Dict[str, str] = {}
+        for klass in reversed(cls.__mro__):   # subclasses override their bases
+            for fn in vars(klass).values():
+                for name in getattr(fn, "_handles", ()):
+                    table[name] = fn
+                    routes[name] = fn._route
+        cls._handlers = table
+        cls._routes = routes
+
     def apply_command(self, cmd: Command) -> list[Event]:  # returns domain events
-        raise NotImplementedError
+        fn = self._handlers.get(cmd.name)
+        return fn(self, cmd) if fn is not None else []
 
-@dataclass
+@dataclass(slots=True)
 class Actor(AggregateRoot):
+    """
+    `facets` is for reading. Change a facet through act/act_many, or through
+    writable(layer) for direct edits: after fork() a facet may be shared
+    with another actor, and only those copy it before the first write.
+    Assigning to actor.facets[layer].hp changes every fork sharing it.
+    """
     name: str = ""
     facets: Dict[Layer, Facet] = field(default_factory=dict)
+    # layers whose facet object may also belong to a fork: copied before the first write
+    _shared: Set[Layer] = field(default_factory=set, init=False, repr=False, compare=False)
 
     def attach_facet(self, facet: Facet) -> None:
         self.facets[facet.layer] = facet
+        self._shared.discard(facet.layer)
 
-    def act(self, cmd: Command) -> None:
-        # cmd.payload should include layer, verb, etc.
-        layer = Layer(cmd.payload.get("layer"))
+    def fork(self) -> "Actor":
+        """
+        A what-if copy that shares facets with this actor: whichever side
+        writes a facet first (through act/act_many/writable) copies it.
+        Pending events are not carried over.
+        """
+        facets: Dict[Layer, Facet] = {}
+        shared: Set[Layer] = set()
+        for layer, facet in self.facets.items():
+            if facet.shareable:
+                facets[layer] = facet
+                shared.add(layer)
+            else:   # e.g. a FacetStore view: its storage is live, copy now
+                facets[layer] = copy.copy(facet)
+        child = type(self)(**{f.name: getattr(self, f.name) for f in fields(self)
+                              if f.init and f.name not in ("facets", "_events")})
+        child.facets = facets
+        child._shared = shared
+        self._shared |= shared
+        return child
+
+    def writable(self, layer: Layer | str) -> Facet:
+        """The facet for `layer`, copied first if a fork still shares it."""
+        facet = self.facets[layer]
+        if layer in self._shared:
+            facet = self.facets[layer] = copy.copy(facet)
+            self._shared.discard(layer)
+        return facet
+
+    def _facet(self, cmd: Command) -> Facet:
+        # cmd.payload should include layer, verb, etc.; Layer is a str enum,
+        # so "physical" and Layer.PHYSICAL find the same facet
+        layer = cmd.payload.get("layer")
         facet = self.facets.get(layer)
         if not facet:
             raise ValueError(f"No facet for layer {layer} on actor {self.id}")
-        events = facet.apply_command(cmd)
+        if self._shared and layer in self._shared:
+            facet = self.writable(layer)
+        return facet
+
+    def _enrich(self, facet: Facet, events: List[Event]) -> List[Event]:
+        # actor metadata + layer for routing/observability
+        aid, layer = self.id, facet.layer.value
         for ev in events:
-            # enrich with actor metadata + layer for routing/observability
-            ev.payload.setdefault("actor_id", self.id)
-            ev.payload.setdefault("layer", layer.value)
-            self.record_event(ev)
+            p = ev.payload
+            if "actor_id" not in p:
+                p["actor_id"] = aid
+            if "layer" not in p:
+                p["layer"] = layer
+        return events
+
+    def act(self, cmd: Command) -> None:
+        facet = self._facet(cmd)
+        self.record_events(self._enrich(facet, facet.apply_command(cmd)))
+
+    def act_many(self, commands: Iterable[Command]) -> List[Event]:
+        """
+        Apply `commands` in order and return the events they produced (also
+        recorded). Every facet is resolved before any command runs, so a
+        command for a missing layer rejects the whole batch; the handler for
+        each (layer, name) is looked up once. If a handler raises, the
+        commands before it stay applied and their events recorded, as with
+        sequential act().
+        """
+        plan = []
+        resolved: Dict[Tuple[Any, str], Tuple[Facet, Handler | None]] = {}
+        for cmd in commands:
+            key = (cmd.payload.get("layer"), cmd.name)
+            hit = resolved.get(key)
+            if hit is None:
+                facet = self._facet(cmd)
+                hit = resolved[key] = (facet, facet._handlers.get(cmd.name)
+                                       if type(facet).apply_command is Facet.apply_command else None)
+            plan.append((hit, cmd))
+        out: List[Event] = []
+        try:
+            for (facet, fn), cmd in plan:
+                events = fn(facet, cmd) if fn is not None else facet.apply_command(cmd)
+                if events:
+                    out.extend(self._enrich(facet, events))
+        finally:
+            # a handler that raises leaves earlier commands applied: keep their events
+            self.record_events(out)
+        return out
 
+def act_batch(batch: Iterable[Tuple[Actor, Command]]) -> List[Event]:
+    """
+    Apply (actor, command) pairs across actors: each actor's commands run
+    through one act_many, in their original order. Returns all events,
+    grouped by actor in first-seen order.
+    """
+    per_actor: Dict[UUID, Tuple[Actor, List[Command]]] = {}
+    for actor, cmd in batch:
+        entry = per_actor.get(actor.id)
+        if entry is None:
+            per_actor[actor.id] = (actor, [cmd])
+        else:
+            entry[1].append(cmd)
+    out: List[Event] = []
+    for actor, cmds in per_actor.values():
+        out.extend(actor.act_many(cmds))
+    return out
@@ -3,7 +3,7 @@ from uuid import UUID
 from .actor import Actor
 from baator.kernel.events import Event
 
-@dataclass
+@dataclass(slots=True)
 class Character(Actor):
     hp: int = 10
     name: str = ""
@@ -1,5 +1,27 @@
+from dataclasses import is_dataclass
+from typing import Dict
+
 from .physical import PhysicalFacet
 from .mythic import MythicFacet
 from .cyber import CyberFacet
+from .store import FacetStore
+
+# facet class name -> class, used to rebuild stored or snapshotted facets
+FACET_TYPES: Dict[str, type] = {cls.__name__: cls for cls in (PhysicalFacet, CyberFacet, MythicFacet)}
+
+def register_facet_type(cls: type) -> type:
+    """Make a dataclass facet storable; usable as a class decorator."""
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls.__name__} must be a dataclass to be stored")
+    FACET_TYPES[cls.__name__] = cls
+    return cls
+
+def facet_kind(facet) -> str:
+    """Registered name of the facet's class (FacetStore views report their base)."""
+    for klass in type(facet).__mro__:
+        if FACET_TYPES.get(klass.__name__) is klass:
+            return klass.__name__
+    raise TypeError(f"Unregistered facet type: {type(facet).__name__}")
 
-__all__ = ["PhysicalFacet", "MythicFacet", "CyberFacet"]
+__all__ = ["PhysicalFacet", "MythicFacet", "CyberFacet", "FacetStore",
+           "FACET_TYPES", "register_facet_type", "facet_kind"]
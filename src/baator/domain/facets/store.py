@@ -0,0 +1,200 @@
+"""
+Struct-of-arrays facet storage for large battles.
+
+A FacetStore keeps every facet field (hp, stamina, firewall, ...) in its own
+contiguous typed array, indexed by an actor slot. Adopted actors get view
+facets in place of their dataclass facets: a view is a subclass of the
+original facet class whose fields are properties over the arrays, so
+`actor.act(...)`, `facet.hp` and `apply_command` behave exactly as before.
+
+Bulk operations (take_damage, heal, ice_attack) touch only the arrays and
+record the same events `Actor.act` would, one per slot.
+"""
+from __future__ import annotations
+from array import array
+from dataclasses import fields
+from itertools import repeat
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+from uuid import UUID
+
+from baator.domain import Actor
+from baator.kernel import Event, Layer
+from .physical import PhysicalFacet
+from .cyber import CyberFacet
+from .mythic import MythicFacet
+
+TYPECODE = "i"   # int32 per field and slot
+
+# layer -> facet class stored for it
+LAYOUT: Dict[Layer, type] = {
+    Layer.PHYSICAL: PhysicalFacet,
+    Layer.CYBER: CyberFacet,
+    Layer.MYTHIC: MythicFacet,
+}
+
+Amounts = Union[int, Sequence[int]]
+
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.name != "layer")
+
+def _view_class(cls: type, layer: Layer, cols: Dict[str, array]) -> type:
+    """Subclass of `cls` whose fields read and write `cols[name][slot]`."""
+    def column(col: array) -> property:
+        def get(self):
+            return col[self._slot]
+        def set(self, value):
+            col[self._slot] = value
+        return property(get, set)
+
+    def __init__(self, slot: int):
+        self._slot = slot
+
+    names = _field_names(cls)
+    def __copy__(self):   # a detached plain facet holding the current values
+        return cls(layer=layer, **{n: getattr(self, n) for n in names})
+
+    ns = {name: column(cols[name]) for name in names}
+    ns.update(__slots__=("_slot",), __init__=__init__, __copy__=__copy__,
+              layer=layer, shareable=False)
+    return type(f"{cls.__name__}View", (cls,), ns)
+
+class FacetStore:
+    def __init__(self):
+        self._cols: Dict[str, array] = {}
+        self._present: Dict[Layer, bytearray] = {}
+        self._views: Dict[Layer, type] = {}
+        for layer, cls in LAYOUT.items():
+            for name in _field_names(cls):
+                self._cols[name] = array(TYPECODE)
+            self._present[layer] = bytearray()
+            self._views[layer] = _view_class(cls, layer, self._cols)
+        self._actors: List[Actor | None] = []
+        self._slots: Dict[UUID, int] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, actor_id: object) -> bool:
+        return actor_id in self._slots
+
+    def slot(self, actor_id: UUID) -> int:
+        return self._slots[actor_id]
+
+    def slots(self, actor_ids: Iterable[UUID]) -> List[int]:
+        return [self._slots[aid] for aid in actor_ids]
+
+    def column(self, name: str) -> array:
+        """The live array behind one field; index it by slot."""
+        return self._cols[name]
+
+    def adopt(self, actor: Actor) -> int:
+        """
+        Move the actor's known facets into the arrays and attach views in
+        their place. Facets of other types are left on the actor untouched.
+        """
+        if actor.id in self._slots:
+            return self._slots[actor.id]
+        if self._free:
+            slot = self._free.pop()
+            self._actors[slot] = actor
+        else:
+            slot = len(self._actors)
+            self._actors.append(actor)
+            for col in self._cols.values():
+                col.append(0)
+            for present in self._present.values():
+                present.append(0)
+        self._slots[actor.id] = slot
+
+        for layer, cls in LAYOUT.items():
+            facet = actor.facets.get(layer)
+            if type(facet) is not cls:
+                continue
+            for name in _field_names(cls):
+                self._cols[name][slot] = getattr(facet, name)
+            self._present[layer][slot] = 1
+            actor.facets[layer] = self._views[layer](slot)
+        return slot
+
+    def adopt_many(self, actors: Iterable[Actor]) -> List[int]:
+        return [self.adopt(a) for a in actors]
+
+    def release(self, actor: Actor) -> None:
+        """Give the actor plain dataclass facets again and free its slot (old views go stale)."""
+        slot = self._slots.pop(actor.id)
+        for layer, cls in LAYOUT.items():
+            if self._present[layer][slot]:
+                actor.facets[layer] = cls(**{n: self._cols[n][slot] for n in _field_names(cls)})
+                self._present[layer][slot] = 0
+        self._actors[slot] = None
+        self._free.append(slot)
+
+    # ---- bulk operations ---------------------------------------------------------
+
+    def _require(self, layer: Layer, slots: Sequence[int]) -> None:
+        present = self._present[layer]
+        for s in slots:
+            if not present[s]:
+                actor = self._actors[s]
+                raise ValueError(f"No facet for layer {layer} on actor {actor.id if actor else s}")
+
+    def _record(self, slots: Sequence[int], layer: Layer, name: str,
+                payloads: Iterable[Dict[str, int]]) -> None:
+        actors = self._actors
+        for s, payload in zip(slots, payloads):
+            actor = actors[s]
+            payload["actor_id"] = actor.id
+            payload["layer"] = layer.value
+            actor.record_event(Event(name=name, payload=payload))
+
+    def take_damage(self, slots: Sequence[int], amounts: Amounts, *, record: bool = True) -> List[int]:
+        """Same as physical.take_damage on each slot; returns the new hp values."""
+        return self._shift(slots, amounts, Layer.PHYSICAL, "hp", -1,
+                           "physical.damage_taken" if record else None)
+
+    def heal(self, slots: Sequence[int], amounts: Amounts, *, record: bool = True) -> List[int]:
+        return self._shift(slots, amounts, Layer.PHYSICAL, "hp", 1,
+                           "physical.healed" if record else None)
+
+    def _shift(self, slots: Sequence[int], amounts: Amounts, layer: Layer, field_name: str,
+               sign: int, event: str | None) -> List[int]:
+        self._require(layer, slots)
+        amts = repeat(int(amounts)) if isinstance(amounts, int) else [int(a) for a in amounts]
+        col = self._cols[field_name]
+        out: List[int] = []
+        applied: List[int] = []
+        for s, amt in zip(slots, amts):
+            v = col[s] + sign * amt
+            v = 0 if v < 0 else 999 if v > 999 else v   # physical.py clamps to 0..999
+            col[s] = v
+            out.append(v)
+            applied.append(amt)
+        if event is not None:
+            self._record(slots, layer, event,
+                         ({"amount": a, field_name: v} for a, v in zip(applied, out)))
+        return out
+
+    def ice_attack(self, slots: Sequence[int], damage: Amounts, *, record: bool = True) -> List[int]:
+        """Same as cyber.ice_attack on each slot; returns the new integrity values."""
+        self._require(Layer.CYBER, slots)
+        dmgs = repeat(int(damage)) if isinstance(damage, int) else [int(d) for d in damage]
+        col = self._cols["integrity"]
+        out: List[int] = []
+        applied: List[int] = []
+        for s, dmg in zip(slots, dmgs):
+            v = col[s] - dmg
+            v = 0 if v < 0 else v
+            col[s] = v
+            out.append(v)
+            applied.append(dmg)
+        if record:
+            self._record(slots, Layer.CYBER, "cyber.integrity_damaged",
+                         ({"damage": d, "integrity": v} for d, v in zip(applied, out)))
+        return out
+
+    def where(self, field_name: str, predicate) -> List[int]:
+        """Live slots whose `field_name` satisfies `predicate`, e.g. where("hp", lambda v: v > 0)."""
+        layer = next(l for l, cls in LAYOUT.items() if field_name in _field_names(cls))
+        present, col = self._present[layer], self._cols[field_name]
+        return [s for s, v in enumerate(col) if present[s] and predicate(v)]
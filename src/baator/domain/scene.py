@@ -1,24 +1,166 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Set, Tuple
+import copy
 from uuid import UUID
 
-@dataclass
+@dataclass(slots=True)
 class Participant:
     actor_id: UUID
     name: str
     initiative: int
-    # optional: layer routing preferences, team tags, etc.
+    hp: int = 10
+    team: str = ""      # "" fights everyone; otherwise allies share a team
+    # optional: layer routing preferences, etc.
 
-@dataclass
+Key = Tuple[int, int]   # (-initiative, arrival): highest first, ties by arrival
+
+@dataclass(slots=True)
 class Scene:
+    """
+    `participants` is kept in turn order (initiative high to low, ties in
+    arrival order). add/remove/update_initiative keep it sorted with a
+    binary search and adjust `turn_index` so the current participant stays
+    current. Change initiative only through update_initiative. A list
+    assigned or appended to directly is re-sorted on next use.
+
+    fork() shares Participant objects with the copy; mutate participants of
+    a forked (or forking) scene through writable(actor_id), which copies on
+    first write.
+    """
     scene_id: str
     participants: List[Participant] = field(default_factory=list)
     round: int = 1
     turn_index: int = 0
+    _keys: List[Key] = field(default_factory=list, init=False, repr=False, compare=False)
+    _by_id: Dict[UUID, Participant] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_name: Dict[str, Participant] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _key_of: Dict[UUID, Key] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _arrivals: int = field(default=0, init=False, repr=False, compare=False)
+    _synced: Tuple[Optional[List[Participant]], int] = field(default=(None, -1), init=False, repr=False, compare=False)
+    _forked: bool = field(default=False, init=False, repr=False, compare=False)   # participants may be shared
+    _owned: Set[UUID] = field(default_factory=set, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._sync()
+
+    # ---- index maintenance -------------------------------------------------------
+
+    def _sync(self) -> None:
+        # (list identity, length) catches `scene.participants = [...]` and append()
+        src, n = self._synced
+        if src is self.participants and n == len(src):
+            return
+        members = self.participants
+        self._keys, self._by_id, self._by_name, self._key_of = [], {}, {}, {}
+        self._arrivals = 0
+        self.participants = []
+        for p in sorted(members, key=lambda p: p.initiative, reverse=True):
+            self._insert(p)
+        self._mark()
+
+    def _mark(self) -> None:
+        self._synced = (self.participants, len(self.participants))
+
+    def _position(self, actor_id: UUID) -> int:
+        return bisect_left(self._keys, self._key_of[actor_id])
+
+    def _insert(self, p: Participant) -> int:
+        if p.actor_id in self._by_id:
+            raise ValueError(f"Participant already in scene: {p.actor_id}")
+        key = (-p.initiative, self._arrivals)
+        self._arrivals += 1
+        i = bisect_left(self._keys, key)
+        self._keys.insert(i, key)
+        self.participants.insert(i, p)
+        self._by_id[p.actor_id] = p
+        self._by_name[p.name] = p
+        self._key_of[p.actor_id] = key
+        return i
+
+    def _delete(self, actor_id: UUID) -> Tuple[int, Participant]:
+        key = self._key_of.pop(actor_id)
+        i = bisect_left(self._keys, key)
+        del self._keys[i]
+        p = self.participants.pop(i)
+        del self._by_id[actor_id]
+        if self._by_name.get(p.name) is p:
+            del self._by_name[p.name]
+        return i, p
+
+    # ---- membership ---------------------------------------------------------------
+
+    def add(self, p: Participant) -> None:
+        self._sync()
+        i = self._insert(p)
+        if i <= self.turn_index and len(self.participants) > 1:
+            self.turn_index += 1   # keep the current participant current
+        self._owned.add(p.actor_id)
+        self._mark()
+
+    def remove(self, actor_id: UUID) -> Participant:
+        self._sync()
+        i, p = self._delete(actor_id)
+        if i < self.turn_index:
+            self.turn_index -= 1
+        elif self.turn_index >= len(self.participants):
+            self.turn_index = 0   # removed the last in order: next in line is the top
+        self._mark()
+        return p
+
+    def update_initiative(self, actor_id: UUID, initiative: int) -> None:
+        self._sync()
+        cur = self.current()
+        p = self.writable(actor_id)
+        self._delete(actor_id)
+        p.initiative = initiative
+        self._insert(p)
+        if cur is not None:
+            self.turn_index = self._position(cur.actor_id)
+        self._mark()
+
+    def writable(self, actor_id: UUID) -> Participant:
+        """The participant, copied first if a fork may still share it."""
+        self._sync()
+        p = self._by_id[actor_id]
+        if not self._forked or actor_id in self._owned:
+            return p
+        mine = copy.copy(p)
+        self.participants[self._position(actor_id)] = mine
+        self._by_id[actor_id] = mine
+        if self._by_name.get(p.name) is p:
+            self._by_name[p.name] = mine
+        self._owned.add(actor_id)
+        return mine
+
+    def fork(self) -> "Scene":
+        """A what-if copy: index structures are copied, participants shared until written."""
+        self._sync()
+        child = copy.copy(self)
+        for f in fields(self):   # every container field, so fields added later are copied too
+            v = getattr(self, f.name)
+            if isinstance(v, (list, dict, set)):
+                setattr(child, f.name, copy.copy(v))
+        child._forked, child._owned = True, set()
+        child._mark()
+        self._forked, self._owned = True, set()
+        return child
+
+    def get(self, actor_id: UUID) -> Optional[Participant]:
+        self._sync()
+        return self._by_id.get(actor_id)
+
+    def by_name(self, name: str) -> Optional[Participant]:
+        self._sync()
+        return self._by_name.get(name)
+
+    # ---- turns --------------------------------------------------------------------
 
     def order(self) -> List[Participant]:
-        return sorted(self.participants, key=lambda p: p.initiative, reverse=True)
+        """Turn order; the scene's own list, so treat it as read-only."""
+        self._sync()
+        return self.participants
 
     def current(self) -> Optional[Participant]:
         o = self.order()
@@ -0,0 +1,215 @@
+"""
+Scene checkpoints and a compact binary snapshot format.
+
+checkpoint(scene, actors) freezes the live state as copy-on-write forks
+(Scene.fork / Actor.fork); each Checkpoint.fork() hands out another cheap
+what-if copy, and the checkpoint itself never changes.
+
+dump_scene / load_scene persist a scene and its actors:
+
+    MAGIC | u16 version | u32 schema length | schema JSON | body
+
+The schema lists the field names of every record type used (Scene,
+Participant, the actor classes, each facet kind) once; the body stores
+records as tagged values in that field order. Loading maps values back by
+name, so adding a defaulted field to a class does not break old snapshots.
+Pending domain events are not saved.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+from uuid import UUID
+import json
+import struct
+
+from baator.kernel import Layer
+from .actor import Actor
+from .character import Character
+from .scene import Participant, Scene
+from .facets import FACET_TYPES, facet_kind
+
+MAGIC = b"BSNP"
+VERSION = 1
+ACTOR_TYPES: Dict[str, type] = {"Actor": Actor, "Character": Character}
+
+_HEAD = struct.Struct("<4sHI")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_COUNT = struct.Struct("<B")
+
+# stored separately (participants, facets, layer) or not state (_events)
+_SKIP = {"participants", "facets", "_events", "layer"}
+
+@lru_cache(maxsize=None)
+def _record_fields(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.init and f.name not in _SKIP)
+
+# ---- encoding ---------------------------------------------------------------
+
+class _Writer:
+    __slots__ = ("out", "schema")
+
+    def __init__(self):
+        self.out: List[bytes] = []
+        self.schema: Dict[str, List[str]] = {}
+
+    def str(self, s: str) -> None:
+        b = s.encode()
+        self.out.append(_U32.pack(len(b)))
+        self.out.append(b)
+
+    def value(self, v: Any) -> None:
+        out = self.out
+        if v is None:
+            out.append(b"n")
+        elif isinstance(v, bool):
+            out.append(b"T" if v else b"F")
+        elif isinstance(v, int):
+            out.append(b"i"); out.append(_I64.pack(v))
+        elif isinstance(v, float):
+            out.append(b"f"); out.append(_F64.pack(v))
+        elif isinstance(v, str):   # includes Layer and other str enums
+            out.append(b"s"); self.str(str(v.value) if isinstance(v, Layer) else v)
+        elif isinstance(v, UUID):
+            out.append(b"u"); out.append(v.bytes)
+        else:
+            out.append(b"j"); self.str(json.dumps(v, separators=(",", ":")))
+
+    def record(self, type_name: str, obj: Any, cls: type) -> None:
+        names = self.schema.get(type_name)
+        if names is None:
+            names = self.schema[type_name] = list(_record_fields(cls))
+        for name in names:
+            self.value(getattr(obj, name))
+
+    def count(self, n: int) -> None:
+        self.out.append(_U32.pack(n))
+
+def dump_scene(scene: Scene, actors: Iterable[Actor] = ()) -> bytes:
+    w = _Writer()
+    w.record("Scene", scene, Scene)
+    order = scene.order()
+    w.count(len(order))
+    for p in order:
+        w.record("Participant", p, Participant)
+    actors = list(actors)
+    w.count(len(actors))
+    for a in actors:
+        kind = type(a).__name__
+        if ACTOR_TYPES.get(kind) is not type(a):
+            raise TypeError(f"Unregistered actor type: {kind}")
+        w.str(kind)
+        w.record(kind, a, type(a))
+        w.out.append(_COUNT.pack(len(a.facets)))
+        for layer, facet in a.facets.items():
+            fk = facet_kind(facet)
+            w.str(fk)
+            w.str(Layer(layer).value)
+            w.record(fk, facet, FACET_TYPES[fk])
+    schema = json.dumps(w.schema, separators=(",", ":")).encode()
+    return b"".join([_HEAD.pack(MAGIC, VERSION, len(schema)), schema, *w.out])
+
+# ---- decoding ---------------------------------------------------------------
+
+class _Reader:
+    __slots__ = ("buf", "off", "schema")
+
+    def __init__(self, data: bytes):
+        self.buf = memoryview(data)
+        magic, version, n = _HEAD.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a scene snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        self.off = _HEAD.size
+        self.schema: Dict[str, List[str]] = json.loads(bytes(self.buf[self.off:self.off + n]))
+        self.off += n
+
+    def u32(self) -> int:
+        (n,) = _U32.unpack_from(self.buf, self.off)
+        self.off += 4
+        return n
+
+    def str(self) -> str:
+        n = self.u32()
+        s = str(self.buf[self.off:self.off + n], "utf-8")
+        self.off += n
+        return s
+
+    def value(self) -> Any:
+        tag = self.buf[self.off]
+        self.off += 1
+        if tag == 0x69:    # i
+            (v,) = _I64.unpack_from(self.buf, self.off); self.off += 8; return v
+        if tag == 0x73:    # s
+            return self.str()
+        if tag == 0x75:    # u
+            v = UUID(bytes=bytes(self.buf[self.off:self.off + 16])); self.off += 16; return v
+        if tag == 0x6E:    # n
+            return None
+        if tag == 0x54:    # T
+            return True
+        if tag == 0x46:    # F
+            return False
+        if tag == 0x66:    # f
+            (v,) = _F64.unpack_from(self.buf, self.off); self.off += 8; return v
+        if tag == 0x6A:    # j
+            return json.loads(self.str())
+        raise ValueError(f"Bad value tag {tag!r} at offset {self.off - 1}")
+
+    def fields(self, type_name: str, cls: type) -> Dict[str, Any]:
+        """One record's values, keeping only fields `cls` still has."""
+        kw = {name: self.value() for name in self.schema[type_name]}
+        known = _record_fields(cls)
+        return {k: v for k, v in kw.items() if k in known}
+
+    def record(self, type_name: str, cls: type, **extra: Any) -> Any:
+        return cls(**self.fields(type_name, cls), **extra)
+
+def load_scene(data: bytes) -> Tuple[Scene, Dict[UUID, Actor]]:
+    r = _Reader(data)
+    head = r.fields("Scene", Scene)
+    participants = [r.record("Participant", Participant) for _ in range(r.u32())]
+    scene = Scene(participants=participants, **head)   # stored in turn order; the sort is stable
+    actors: Dict[UUID, Actor] = {}
+    for _ in range(r.u32()):
+        kind = r.str()
+        cls = ACTOR_TYPES.get(kind)
+        if cls is None:
+            raise ValueError(f"Unknown actor type in snapshot: {kind}")
+        actor = r.record(kind, cls)
+        (n,) = _COUNT.unpack_from(r.buf, r.off)
+        r.off += 1
+        for _ in range(n):
+            fk = r.str()
+            layer = Layer(r.str())
+            fcls = FACET_TYPES.get(fk)
+            if fcls is None:
+                raise ValueError(f"Unknown facet type in snapshot: {fk}")
+            actor.attach_facet(r.record(fk, fcls, layer=layer))
+        actors[actor.id] = actor
+    return scene, actors
+
+# ---- checkpoints --------------------------------------------------------------
+
+@dataclass(slots=True)
+class Checkpoint:
+    scene: Scene
+    actors: Dict[UUID, Actor]
+
+    def fork(self) -> Tuple[Scene, Dict[UUID, Actor]]:
+        """A fresh what-if copy; writes to it never reach the checkpoint."""
+        return self.scene.fork(), {aid: a.fork() for aid, a in self.actors.items()}
+
+    def dump(self) -> bytes:
+        return dump_scene(self.scene, self.actors.values())
+
+    @classmethod
+    def load(cls, data: bytes) -> "Checkpoint":
+        return cls(*load_scene(data))
+
+def checkpoint(scene: Scene, actors: Iterable[Actor] = ()) -> Checkpoint:
+    """Freeze the current state; the live scene and actors carry on independently."""
+    return Checkpoint(scene.fork(), {a.id: a.fork() for a in actors})
@@ -1,4 +1,6 @@
 from .rng_adapter import SocketRNG
 from .rng_python import PythonRNG
+from .repo_memory import InMemoryActorRepo
+from .repo_sqlite import SQLiteActorRepo
 
-__all__ = ["SocketRNG", "PythonRNG"]
+__all__ = ["SocketRNG", "PythonRNG", "InMemoryActorRepo", "SQLiteActorRepo"]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Set
+from uuid import UUID
+import threading
+
+from baator.domain.actor import Actor, Facet
+from baator.kernel.layers import Layer
+from baator.runtime.context_provider import ActorRepo
+
+class InMemoryActorRepo(ActorRepo):
+    """
+    Actors held in process, indexed by id, by name (names need not be unique)
+    and by facet layer: each layer is a column of id -> facet, so "every actor
+    with a cyber facet" does not scan the whole store.
+
+    Actors are returned by reference. Call `reindex(actor)` after renaming an
+    actor or attaching/detaching facets so the name and layer indexes follow.
+    """
+    def __init__(self, actors: Iterable[Actor] = ()):
+        self._by_id: Dict[UUID, Actor] = {}
+        self._by_name: Dict[str, Set[UUID]] = {}
+        self._columns: Dict[Layer, Dict[UUID, Facet]] = {layer: {} for layer in Layer}
+        self._names: Dict[UUID, str] = {}   # name each id is indexed under
+        self._lock = threading.Lock()       # writers only; reads are single dict lookups
+        self.add_many(actors)
+
+    def add(self, actor: Actor) -> None:
+        with self._lock:
+            self._index(actor)
+
+    def add_many(self, actors: Iterable[Actor]) -> None:
+        with self._lock:
+            for actor in actors:
+                self._index(actor)
+
+    def reindex(self, actor: Actor) -> None:
+        self.add(actor)
+
+    def remove(self, actor_id: UUID) -> Actor | None:
+        with self._lock:
+            actor = self._by_id.pop(actor_id, None)
+            if actor is not None:
+                self._unindex(actor_id)
+            return actor
+
+    def _index(self, actor: Actor) -> None:
+        aid = actor.id
+        if aid in self._by_id:
+            self._unindex(aid)
+        self._by_id[aid] = actor
+        self._names[aid] = actor.name
+        self._by_name.setdefault(actor.name, set()).add(aid)
+        for layer, facet in actor.facets.items():
+            self._columns[layer][aid] = facet
+
+    def _unindex(self, actor_id: UUID) -> None:
+        name = self._names.pop(actor_id)
+        ids = self._by_name[name]
+        ids.discard(actor_id)
+        if not ids:
+            del self._by_name[name]
+        for column in self._columns.values():
+            column.pop(actor_id, None)
+
+    # ---- ActorRepo -----------------------------------------------------------
+
+    def get(self, actor_id: UUID) -> Actor | None:
+        return self._by_id.get(actor_id)
+
+    def get_many(self, actor_ids: Iterable[UUID]) -> Dict[UUID, Actor]:
+        by_id = self._by_id
+        return {aid: by_id[aid] for aid in actor_ids if aid in by_id}
+
+    # ---- queries ---------------------------------------------------------------
+
+    def find_by_name(self, name: str) -> List[Actor]:
+        return [self._by_id[aid] for aid in self._by_name.get(name, ())]
+
+    def column(self, layer: Layer) -> Mapping[UUID, Facet]:
+        """Read-only id -> facet view of one layer."""
+        return MappingProxyType(self._columns[Layer(layer)])
+
+    def with_facet(self, layer: Layer) -> Iterator[Actor]:
+        by_id = self._by_id
+        return (by_id[aid] for aid in list(self._columns[Layer(layer)]))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, actor_id: object) -> bool:
+        return actor_id in self._by_id
@@ -0,0 +1,273 @@
+"""
+SQLite-backed ActorRepo.
+
+Two tables: `actors(id, name)` and `facets(actor_id, layer, kind, data)`, with
+ids stored as 16-byte blobs and each facet as the JSON of its dataclass fields.
+`kind` names the facet class (see domain.facets.FACET_TYPES / register_facet_type).
+
+Connections come from a small pool and run in WAL mode with
+synchronous=NORMAL, so readers never wait on the writer. Every statement is
+a constant SQL string; sqlite3 keeps them compiled in each connection's
+statement cache. `get_many` reads in fixed-size IN (...) chunks (the last one
+padded) so it, too, reuses a single prepared statement.
+
+Facet updates are write-behind: `update_facet` only buffers the serialized
+facet, and `flush` (called automatically every `batch_size` updates, and on
+close) writes the batch in one transaction. Reads see buffered updates.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+import json
+import queue
+import sqlite3
+import threading
+
+from baator.domain.actor import Actor, Facet
+from baator.domain.facets import FACET_TYPES, facet_kind, register_facet_type  # noqa: F401 (re-exported)
+from baator.kernel.layers import Layer
+from baator.runtime.context_provider import ActorRepo
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS actors (id BLOB PRIMARY KEY, name TEXT NOT NULL) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS actors_name ON actors(name)",
+    "CREATE TABLE IF NOT EXISTS facets (actor_id BLOB NOT NULL, layer TEXT NOT NULL,"
+    " kind TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (actor_id, layer)) WITHOUT ROWID",
+)
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",   # KiB, per connection
+)
+
+CHUNK = 256   # ids per get_many statement; well under SQLITE_MAX_VARIABLE_NUMBER
+
+_SELECT = ("SELECT a.id, a.name, f.layer, f.kind, f.data FROM actors a"
+           " LEFT JOIN facets f ON f.actor_id = a.id WHERE a.id")
+SQL_GET = _SELECT + " = ?"
+SQL_GET_CHUNK = _SELECT + " IN (" + ",".join("?" * CHUNK) + ")"
+SQL_BY_NAME = ("SELECT a.id, a.name, f.layer, f.kind, f.data FROM actors a"
+               " LEFT JOIN facets f ON f.actor_id = a.id WHERE a.name = ?")
+SQL_COUNT = "SELECT count(*) FROM actors"
+SQL_UPSERT_ACTOR = ("INSERT INTO actors (id, name) VALUES (?, ?)"
+                    " ON CONFLICT(id) DO UPDATE SET name = excluded.name")
+SQL_DELETE_FACETS = "DELETE FROM facets WHERE actor_id = ?"
+SQL_UPSERT_FACET = ("INSERT INTO facets (actor_id, layer, kind, data) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(actor_id, layer) DO UPDATE SET kind = excluded.kind, data = excluded.data")
+SQL_DELETE_ACTOR = "DELETE FROM actors WHERE id = ?"
+
+Row = Tuple[bytes, str, Optional[str], Optional[str], Optional[str]]
+Encoded = Tuple[str, str]   # (kind, json data)
+
+def encode_facet(facet: Facet) -> Encoded:
+    kind = facet_kind(facet)
+    data = {f.name: getattr(facet, f.name) for f in fields(facet) if f.name != "layer"}
+    return kind, json.dumps(data, separators=(",", ":"))
+
+def decode_facet(layer: str, kind: str, data: str) -> Facet:
+    cls = FACET_TYPES.get(kind)
+    if cls is None:
+        raise ValueError(f"Unknown facet type in store: {kind}")
+    return cls(layer=Layer(layer), **json.loads(data))
+
+class _Pool:
+    """Up to `size` connections, created on demand and handed out LIFO."""
+    def __init__(self, connect, size: int):
+        self._connect = connect
+        self._size = max(1, size)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if len(self._all) < self._size:
+                    conn = self._connect()
+                    self._all.append(conn)
+            if conn is None:
+                conn = self._idle.get()   # all in use: wait for one
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+class SQLiteActorRepo(ActorRepo):
+    def __init__(self, path: str = ":memory:", *, pool_size: int = 4, batch_size: int = 512):
+        self.path = str(path)
+        self.batch_size = batch_size
+        # each connection to ":memory:" is its own database
+        self._pool = _Pool(self._connect, 1 if self.path == ":memory:" else pool_size)
+        self._pending: Dict[UUID, Dict[str, Encoded]] = {}    # buffered facet writes
+        self._flushing: Dict[UUID, Dict[str, Encoded]] = {}   # being written; still visible
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.flushes = 0
+        self.flushed_rows = 0
+        with self._pool.connection() as conn:
+            for stmt in SCHEMA:
+                conn.execute(stmt)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    # ---- reads -----------------------------------------------------------------
+
+    def get(self, actor_id: UUID) -> Actor | None:
+        with self._pool.connection() as conn:
+            rows = conn.execute(SQL_GET, (actor_id.bytes,)).fetchall()
+        return self._build(rows).get(actor_id)
+
+    def get_many(self, actor_ids: Iterable[UUID]) -> Dict[UUID, Actor]:
+        keys = list(dict.fromkeys(aid.bytes for aid in actor_ids))
+        rows: List[Row] = []
+        with self._pool.connection() as conn:
+            for i in range(0, len(keys), CHUNK):
+                chunk = keys[i:i + CHUNK]
+                chunk += [chunk[-1]] * (CHUNK - len(chunk))   # same statement every time
+                rows.extend(conn.execute(SQL_GET_CHUNK, chunk))
+        return self._build(rows)
+
+    def find_by_name(self, name: str) -> List[Actor]:
+        with self._pool.connection() as conn:
+            rows = conn.execute(SQL_BY_NAME, (name,)).fetchall()
+        return list(self._build(rows).values())
+
+    def __len__(self) -> int:
+        with self._pool.connection() as conn:
+            return conn.execute(SQL_COUNT).fetchone()[0]
+
+    def _build(self, rows: Iterable[Row]) -> Dict[UUID, Actor]:
+        actors: Dict[UUID, Actor] = {}
+        stored: Dict[UUID, Dict[str, Encoded]] = {}
+        for raw_id, name, layer, kind, data in rows:
+            aid = UUID(bytes=raw_id)
+            if aid not in actors:
+                actors[aid] = Actor(id=aid, name=name)
+                stored[aid] = {}
+            if layer is not None:
+                stored[aid][layer] = (kind, data)
+        with self._lock:
+            for aid, facets in stored.items():
+                for buffered in (self._flushing.get(aid), self._pending.get(aid)):
+                    if buffered:
+                        facets.update(buffered)
+        for aid, facets in stored.items():
+            actor = actors[aid]
+            for layer, (kind, data) in facets.items():
+                actor.attach_facet(decode_facet(layer, kind, data))
+        return actors
+
+    # ---- writes ----------------------------------------------------------------
+
+    def add(self, actor: Actor) -> None:
+        self.add_many((actor,))
+
+    def add_many(self, actors: Iterable[Actor]) -> None:
+        """Insert or fully replace actors (name and facet set) in one transaction."""
+        actor_rows, facet_rows, keys = [], [], []
+        saved = []
+        for actor in actors:
+            key = actor.id.bytes
+            keys.append((key,))
+            actor_rows.append((key, actor.name))
+            for layer, facet in actor.facets.items():
+                facet_rows.append((key, Layer(layer).value, *encode_facet(facet)))
+            saved.append(actor.id)
+        with self._pool.connection() as conn:
+            with _transaction(conn):
+                conn.executemany(SQL_UPSERT_ACTOR, actor_rows)
+                conn.executemany(SQL_DELETE_FACETS, keys)
+                conn.executemany(SQL_UPSERT_FACET, facet_rows)
+        with self._lock:   # the saved state supersedes anything buffered
+            for aid in saved:
+                self._pending.pop(aid, None)
+
+    def remove(self, actor_id: UUID) -> None:
+        with self._lock:
+            self._pending.pop(actor_id, None)
+        with self._pool.connection() as conn:
+            with _transaction(conn):
+                conn.execute(SQL_DELETE_FACETS, (actor_id.bytes,))
+                conn.execute(SQL_DELETE_ACTOR, (actor_id.bytes,))
+
+    def update_facet(self, actor_id: UUID, facet: Facet) -> None:
+        """
+        Buffer the facet's current state (it is serialized now, so later
+        mutations are not picked up); repeated updates of one facet coalesce.
+        The actor must already be stored.
+        """
+        encoded = encode_facet(facet)
+        with self._lock:
+            self._pending.setdefault(actor_id, {})[Layer(facet.layer).value] = encoded
+            full = sum(len(f) for f in self._pending.values()) >= self.batch_size
+        if full:
+            self.flush()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(f) for f in self._pending.values())
+
+    def flush(self) -> int:
+        """Write buffered facet updates in one transaction; returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+            rows = [(aid.bytes, layer, kind, data)
+                    for aid, facets in batch.items() for layer, (kind, data) in facets.items()]
+            try:
+                if rows:
+                    with self._pool.connection() as conn:
+                        with _transaction(conn):
+                            conn.executemany(SQL_UPSERT_FACET, rows)
+            except BaseException:
+                with self._lock:   # put it back under anything newer
+                    for aid, facets in batch.items():
+                        self._pending[aid] = {**facets, **self._pending.get(aid, {})}
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+            if rows:
+                self.flushes += 1
+                self.flushed_rows += len(rows)
+            return len(rows)
+
+    def close(self) -> None:
+        self.flush()
+        self._pool.close()
+
+    def __enter__(self) -> "SQLiteActorRepo":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    conn.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
@@ -1,17 +1,37 @@
 from __future__ import annotations
+import random
 import secrets
 
 class PythonRNG:
+    """
+    With no seed, draws come from the OS (`secrets`). With a seed, from a
+    private random.Random, so a run can be replayed; give each worker or
+    shard its own seed rather than sharing one instance across threads.
+    """
+    def __init__(self, seed: int | None = None):
+        self.seed = seed
+        self._random = None if seed is None else random.Random(seed)
+        self._below = secrets.randbelow if self._random is None else self._random.randrange
+
+    def getstate(self) -> object:
+        """Where a seeded stream is, to continue it elsewhere with setstate(); None if unseeded."""
+        return None if self._random is None else self._random.getstate()
+
+    def setstate(self, state: object) -> None:
+        if self._random is None:
+            raise ValueError("an unseeded PythonRNG has no state to restore")
+        self._random.setstate(state)
+
     def random_int(self, low: int, high: int) -> int:
         if low > high: low, high = high, low
         # inclusive both ends
         span = (high - low) + 1
-        return low + secrets.randbelow(span)
+        return low + self._below(span)
 
     def roll(self, sides: int) -> int:
         if sides < 1:
             raise ValueError("sides must be >= 1")
-        return 1 + secrets.randbelow(sides)
+        return 1 + self._below(sides)
 
     def ping(self) -> bool:
         return True
@@ -8,6 +8,11 @@ from .command_bus import CommandBus
 from .layers import Layer
 from .rolls import eval_safe, roll_expr, expr_adv, expr_dis, RollDetail
 from .rng import RNG
+from .session import EvalSession
+from .context import LayeredContext
+from .paths import PathAccessor, PathError, compile_path
+from .outbox import Outbox
+from .result_cache import ResultCache
 
 __all__ = [
     "Entity", "AggregateRoot",
@@ -19,5 +24,9 @@ __all__ = [
     "Layer",
     "CommandBus",
     "eval_safe", "roll_expr", "expr_adv", "expr_dis", "RollDetail",
-    "RNG"
+    "RNG",
+    "EvalSession", "LayeredContext",
+    "PathAccessor", "PathError", "compile_path",
+    "Outbox",
+    "ResultCache",
 ]
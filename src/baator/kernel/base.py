@@ -2,18 +2,30 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List
 from uuid import UUID
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     id: UUID
 
-@dataclass
+@dataclass(slots=True)
 class AggregateRoot(Entity):
     _events: List[Any] = field(default_factory=list)
 
     def record_event(self, event: Any) -> None:
         self._events.append(event)
 
+    def record_events(self, events: List[Any]) -> None:
+        self._events.extend(events)
+
     def pull_events(self) -> List[Any]:
-        evts = list(self._events)
-        self._events.clear()
+        # hand over the buffer itself and start a new one: no copy
+        evts, self._events = self._events, []
         return evts
+
+    def restore_events(self, events: List[Any]) -> None:
+        """Put back events pulled but not delivered, ahead of any recorded since."""
+        if events:
+            self._events[:0] = events
+
+    @property
+    def has_events(self) -> bool:
+        return bool(self._events)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Mapping
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     name: str
-    payload: Dict[str, Any]
+    payload: Mapping[str, Any]
@@ -1,5 +1,175 @@
 # interface/context.py (or kernel/context.py)
-from typing import Protocol, Mapping, Any
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import lru_cache
+import inspect
+from typing import AbstractSet, Protocol, Mapping, Any, Iterator, Tuple
+from .session import EvalSession
 
 class ContextProvider(Protocol):
-    def resolve(self, meta: Mapping[str, Any] | None) -> Mapping[str, Any] | None : ...
+    # `paths`, when passed, lists the dotted paths the caller will read;
+    # providers may use it to skip fetching unused entities. The keyword is
+    # optional: a provider whose resolve() takes only `meta` is still called.
+    def resolve(self, meta: Mapping[str, Any] | None, *,
+                paths: AbstractSet[str] | None = None) -> Mapping[str, Any] | None : ...
+
+_MISSING = object()
+
+class LayeredContext(Mapping[str, Any]):
+    """
+    Immutable read-through stack of mappings, top layer first: a key comes
+    from the topmost layer that has it, and a nested mapping present in
+    several layers is itself read as a LayeredContext (actor projection
+    under per-call `actor.stats`), so nothing is copied or read eagerly.
+
+    Layers are shared, not copied: a layer must not be changed while a
+    context over it is in use. child() pushes one more layer on top (for a
+    per-effect override) in O(1): the child links to this context rather
+    than copying its layers. Layers can be named (base, scene, extra,
+    provenance, ...) and layer_of() says which layer a key is read from.
+    """
+    __slots__ = ("_layers", "_names", "_parent")
+
+    def __init__(self, *layers: Mapping[str, Any], names: Tuple[str, ...] | None = None,
+                 parent: LayeredContext | None = None):
+        self._layers = layers
+        self._names = names
+        self._parent = parent
+
+    def child(self, layer: Mapping[str, Any], name: str = "") -> LayeredContext:
+        return LayeredContext(layer, names=_one_name(name) if name else None, parent=self)
+
+    @property
+    def layers(self) -> Tuple[Mapping[str, Any], ...]:
+        out, node = (), self
+        while node is not None:
+            out += node._layers
+            node = node._parent
+        return out
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        out, node = (), self
+        while node is not None:
+            out += node._names if node._names is not None else ("",) * len(node._layers)
+            node = node._parent
+        return out
+
+    def layer_of(self, key: str) -> str | None:
+        """Name of the layer `key` is read from ("" if unnamed); None if no layer has it."""
+        for name, layer in zip(self.names, self.layers):
+            if key in layer:
+                return name
+        return None
+
+    def __getitem__(self, key: str) -> Any:
+        found = None
+        node = self
+        while node is not None:
+            for layer in node._layers:
+                v = layer.get(key, _MISSING)
+                if v is _MISSING:
+                    continue
+                if not (type(v) is dict or isinstance(v, Mapping)):
+                    if found is None:
+                        return v
+                    node = None             # a mapping above shadows a plain value below
+                    break
+                if found is None:
+                    found = v
+                elif type(found) is tuple:
+                    found += (v,)
+                else:
+                    found = (found, v)
+            else:
+                node = node._parent
+        if found is None:
+            raise KeyError(key)
+        return LayeredContext(*found) if type(found) is tuple else found
+
+    def __contains__(self, key: object) -> bool:
+        node = self
+        while node is not None:
+            for layer in node._layers:
+                if key in layer:
+                    return True
+            node = node._parent
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for layer in self.layers:
+            for k in layer:
+                if k not in seen:
+                    seen.add(k)
+                    yield k
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        return any(self.layers)
+
+    def __repr__(self) -> str:
+        names = self.names
+        return f"<LayeredContext {list(names) if any(names) else len(names)}>"
+
+def _one_name(name: str, _cache: dict = {}) -> Tuple[str]:
+    # child() names its single layer; the few distinct names share one tuple each
+    t = _cache.get(name)
+    if t is None:
+        t = _cache[name] = (name,)
+    return t
+
+def overlay(under: Mapping[str, Any], over: Mapping[str, Any] | None, name: str = "") -> Mapping[str, Any]:
+    """
+    `over` wins; nested mappings present in both are merged key by key,
+    lazily. Over a LayeredContext this is its child(), so stacks stay flat.
+    """
+    if not over:
+        return under
+    if type(under) is LayeredContext:
+        return under.child(over, name)
+    if not under:
+        return over
+    return LayeredContext(over, under, names=(name, "") if name else None)
+
+@dataclass
+class RequestScope:
+    """
+    One request's context: the provider is asked once and every dice slot,
+    path lookup and resolution of the request reads the same mapping. A
+    RulesEngine.apply shares one scope across its cost, dc, roll and payloads.
+    `base` (the caller's ctx) overlays what the provider returns; `paths`
+    is handed to the provider so it only fetches what will be read.
+    """
+    request_id: str
+    meta: Mapping[str, Any] | None = None
+    base: Mapping[str, Any] | None = None
+    paths: AbstractSet[str] | None = None
+    session: EvalSession = field(default_factory=EvalSession)
+    resolutions: int = 0
+    _ctx: Mapping[str, Any] | None = field(default=None, init=False, repr=False)
+
+    def context(self, provider: ContextProvider) -> Mapping[str, Any]:
+        if self._ctx is None:
+            if self.paths is None or not _takes_paths(type(provider)):
+                resolved = provider.resolve(self.meta)
+            else:
+                resolved = provider.resolve(self.meta, paths=self.paths)
+            self._ctx = overlay(resolved or {}, self.base)
+            self.resolutions += 1
+        return self._ctx
+
+    def invalidate(self) -> None:
+        """State may have changed: re-resolve and drop memoized lookups."""
+        self._ctx = None
+        self.session.invalidate()
+
+@lru_cache(maxsize=None)
+def _takes_paths(provider_type: type) -> bool:
+    try:
+        params = inspect.signature(provider_type.resolve).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "paths" or p.kind is p.VAR_KEYWORD for p in params)
@@ -0,0 +1,129 @@
+"""
+Count-based sampling for large dice pools.
+
+NdS is the same distribution as drawing the face counts (c_1..c_S) from a
+multinomial(N, 1/S each) and summing f * c_f; keep-highest/lowest k takes
+faces from the top/bottom of the counts. The multinomial is drawn as S-1
+conditional binomials, c_f ~ Binomial(remaining, 1/(S-f+1)), each in
+expected O(1) RNG calls (BTRS rejection for large means, inversion for
+small ones), so a pool costs O(S) time and memory whatever N is.
+
+Uniforms come from rng.random_int(0, 2**53 - 1), so any RNG (PythonRNG,
+SocketRNG) can drive it.
+"""
+from __future__ import annotations
+from math import floor, lgamma, log, sqrt
+from typing import Dict, List, Tuple
+
+from .rng import RNG
+
+_U53 = (1 << 53) - 1
+_SCALE = 1.0 / (1 << 53)
+
+def uniform(rng: RNG) -> float:
+    """A float in the open interval (0, 1)."""
+    return (rng.random_int(0, _U53) + 0.5) * _SCALE
+
+def _binomial_inversion(n: int, p: float, rng: RNG) -> int:
+    # expected n*p + 1 iterations; only used while n*p < 10
+    q = 1.0 - p
+    s = p / q
+    a = (n + 1) * s
+    while True:
+        r = q ** n
+        u = uniform(rng)
+        x = 0
+        while u > r:
+            u -= r
+            x += 1
+            if x > n:
+                break      # rounding ran past the support; draw again
+            r *= a / x - s
+        else:
+            return x
+
+def _binomial_btrs(n: int, p: float, rng: RNG) -> int:
+    # Hörmann (1993), "The generation of binomial random variates"; needs n*p >= 10, p <= 0.5
+    q = 1.0 - p
+    spq = sqrt(n * p * q)
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    alpha = (2.83 + 5.1 / b) * spq
+    vr = 0.92 - 4.2 / b
+    lpq = log(p / q)
+    m = floor((n + 1) * p)
+    h = lgamma(m + 1) + lgamma(n - m + 1)
+    while True:
+        u = uniform(rng) - 0.5
+        v = uniform(rng)
+        us = 0.5 - abs(u)
+        k = floor((2 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+        if us >= 0.07 and v <= vr:
+            return k
+        v = log(v * alpha / (a / (us * us) + b))
+        if v <= h - lgamma(k + 1) - lgamma(n - k + 1) + (k - m) * lpq:
+            return k
+
+def binomial(n: int, p: float, rng: RNG) -> int:
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if p > 0.5:
+        return n - binomial(n, 1.0 - p, rng)
+    if n * p < 10:
+        return _binomial_inversion(n, p, rng)
+    return _binomial_btrs(n, p, rng)
+
+def face_counts(n: int, sides: int, rng: RNG) -> List[int]:
+    """counts[f - 1] = how many of n fair S-sided dice showed f."""
+    counts = [0] * sides
+    left = n
+    for f in range(sides - 1):
+        if not left:
+            break
+        c = binomial(left, 1.0 / (sides - f), rng)
+        counts[f] = c
+        left -= c
+    counts[sides - 1] += left
+    return counts
+
+def keep_counts(counts: List[int], keep: int, highest: bool) -> List[int]:
+    """Counts of the `keep` highest (or lowest) dice."""
+    kept = [0] * len(counts)
+    order = range(len(counts) - 1, -1, -1) if highest else range(len(counts))
+    for i in order:
+        if keep <= 0:
+            break
+        take = min(counts[i], keep)
+        kept[i] = take
+        keep -= take
+    return kept
+
+def reroll_counts(counts: List[int], below: int, sides: int, rng: RNG) -> List[int]:
+    """Reroll once every die showing `below` or less."""
+    again = sum(counts[:below])
+    out = [0] * below + counts[below:]
+    if again:
+        for i, c in enumerate(face_counts(again, sides, rng)):
+            out[i] += c
+    return out
+
+def total(counts: List[int]) -> int:
+    return sum((i + 1) * c for i, c in enumerate(counts))
+
+def as_dict(counts: List[int]) -> Dict[int, int]:
+    """{face: count} for faces that came up."""
+    return {i + 1: c for i, c in enumerate(counts) if c}
+
+def roll_pool(n: int, sides: int, rng: RNG, keep: int | None = None,
+              highest: bool = True, reroll: int = 0) -> Tuple[int, List[int], List[int]]:
+    """(sum of kept dice, all face counts, kept face counts)."""
+    counts = face_counts(n, sides, rng)
+    if reroll:
+        counts = reroll_counts(counts, reroll, sides, rng)
+    kept = counts if keep is None else keep_counts(counts, keep, highest)
+    return total(kept), counts, kept
@@ -3,12 +3,13 @@ Lightweight event bus with adapter/plugin points.
 
 Design notes:
 - `EventBus` exposes `publish` and `subscribe`.
-- Adapters implement a simple interface (example RabbitMQ adapter).
+- Adapters implement a simple interface (example RabbitMQ adapter); an
+  adapter may add `publish_batch(events)` to ship many events at once.
 - Also includes a RNG adapter interface (for a socket-based C++ RNG).
 This is intentionally small: the real project should swap adapters via DI/composition.
 """
 
-from typing import Callable, Dict, List, Any, Optional, Protocol, TypeAlias
+from typing import Callable, Dict, List, Any, Optional, Protocol, Sequence, TypeAlias
 import threading
 import queue
 import time
@@ -25,7 +26,7 @@ class TransportAdapter(Protocol):
 class EventBus:
     def __init__(self, transport: Optional[TransportAdapter] = None, *, sync: bool = False):
         self._subs: Dict[str, List[Subscriber]] = {}
-        self._queue: "queue.Queue[Event]" = queue.Queue()
+        self._queue: "queue.Queue[Event | List[Event]]" = queue.Queue()
         self._running = False
         self._transport = transport
         self._sync = sync
@@ -33,6 +34,11 @@ class EventBus:
     def subscribe(self, event_name: str, fn: Subscriber) -> None:
         self._subs.setdefault(event_name, []).append(fn)
 
+    def unsubscribe(self, event_name: str, fn: Subscriber) -> None:
+        subs = self._subs.get(event_name)
+        if subs and fn in subs:
+            subs.remove(fn)
+
     def _dispatch(self, event: Event) -> None:
         for fn in self._subs.get(event.name, []):
             try:
@@ -54,6 +60,27 @@ class EventBus:
                 print(f"[EventBus] transport publish failed, falling back: {e}")
         self._queue.put(event)
 
+    def publish_batch(self, events: Sequence[Event]) -> None:
+        """Publish `events` in order as one unit: one transport call, one queue item."""
+        if not events:
+            return
+        if self._sync:
+            for ev in events:
+                self._dispatch(ev)
+            return
+        if self._transport is not None:
+            try:
+                batch = getattr(self._transport, "publish_batch", None)
+                if batch is not None:
+                    batch(events)
+                else:
+                    for ev in events:
+                        self._transport.publish(ev)
+                return
+            except Exception as e:
+                print(f"[EventBus] transport publish failed, falling back: {e}")
+        self._queue.put(list(events))
+
     def start(self) -> None:
         if self._running:
             return
@@ -64,7 +91,11 @@ class EventBus:
                     ev = self._queue.get(timeout=0.5)
                 except Exception:
                     continue
-                self._dispatch(ev)
+                if isinstance(ev, list):   # from publish_batch
+                    for e in ev:
+                        self._dispatch(e)
+                else:
+                    self._dispatch(ev)
         t = threading.Thread(target=loop, daemon=True)
         t.start()
 
@@ -94,6 +125,12 @@ class RabbitMQAdapter:
         # serialise and push to RabbitMQ -- placeholder
         print(f"[RabbitMQAdapter] would publish: {event}")
 
+    def publish_batch(self, events: Sequence[Event]) -> None:
+        if not self._connected:
+            self.connect()
+        # one channel round trip (publisher confirms per batch) -- placeholder
+        print(f"[RabbitMQAdapter] would publish batch of {len(events)}")
+
     def close(self) -> None:
         self._connected = False
 
@@ -1,11 +1,11 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Mapping
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     name: str
-    payload: Dict[str, Any]
+    payload: Mapping[str, Any]   # a dict, or a LayeredContext over shared layers
     occurred_at: datetime = datetime.now()
 
     def __repr__(self):
@@ -0,0 +1,489 @@
+"""
+Tokenizer and Pratt parser for rule expressions.
+
+One grammar serves conditions, costs, DCs, rolls and effect payloads:
+
+    expr    := sum (("==" | "!=" | "<" | "<=" | ">" | ">=") sum)*
+    sum     := term (("+" | "-") term)*
+    term    := unary (("*" | "//") unary)*
+    unary   := "-" unary | atom
+    atom    := INT | "True" | "False" | path | dice | "(" expr ")"
+             | ("min" | "max") "(" expr ("," expr)* ")"
+    dice    := INT ("d" | "D") INT suffix*
+    suffix  := "!" | "r" INT | "k" ["h" | "l"] INT | "d" ("h" | "l") INT
+
+Dice suffixes: `!` explodes (a die showing its top face is rolled again
+and added), `rN` rerolls once a die showing N or less, `khK` / `klK`
+(`kK` is `khK`) keep the K highest / lowest dice and `dlK` / `dhK` drop
+the K lowest / highest. Any number of dice terms can be mixed with
+arithmetic: `max(1, 2d6!r1 + 1d4 - target.armor)`.
+
+The text is scanned once into tokens and parsed into a tree of slotted
+nodes, which evaluate themselves. compile_expr caches the compiled Expr
+per text, so every evaluator parses each distinct expression once.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import add, eq, floordiv, ge, gt, le, lt, mul, ne, sub
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Mapping, Optional, Tuple
+import re
+
+from .paths import PathAccessor, compile_path
+from .session import EvalSession
+
+class ExprSyntaxError(ValueError):
+    """Expression text that does not parse; `pos` is the offending offset."""
+    def __init__(self, msg: str, text: str, pos: int):
+        self.text = text
+        self.pos = pos
+        super().__init__(f"{msg} at {pos} in {text!r}")
+
+# Explosions per die are capped so a rigged RNG cannot loop forever.
+MAX_EXPLODE = 100
+
+@dataclass(frozen=True, slots=True)
+class DiceSpec:
+    count: int
+    sides: int
+    keep: Optional[int] = None   # dice that count after keep/drop; None: all
+    highest: bool = True         # keep from the top (kh, dl) or the bottom (kl, dh)
+    explode: bool = False
+    reroll: int = 0              # reroll once a die showing this or less
+
+    @property
+    def bounds(self) -> "Bounds":
+        """Lowest and highest possible total (explosions count up to MAX_EXPLODE)."""
+        n = self.count if self.keep is None else self.keep
+        top = self.sides * (MAX_EXPLODE + 1) if self.explode else self.sides
+        return n, n * top
+
+# (lowest, highest) an expression can come to; None where it cannot be bounded
+Bounds = Tuple[int, int]
+
+def _corners(fn: Callable[[int, int], int], a: Bounds, b: Bounds) -> Bounds:
+    vals = [fn(x, y) for x in a for y in b]
+    return min(vals), max(vals)
+
+def _floordiv_bounds(a: Bounds, b: Bounds) -> Optional[Bounds]:
+    # // is monotonic in each argument once the divisor's sign is fixed
+    return None if b[0] <= 0 <= b[1] else _corners(floordiv, a, b)
+
+_INTERVAL: Dict[str, Callable[[Bounds, Bounds], Optional[Bounds]]] = {
+    "+": lambda a, b: (a[0] + b[0], a[1] + b[1]),
+    "-": lambda a, b: (a[0] - b[1], a[1] - b[0]),
+    "*": lambda a, b: _corners(mul, a, b),
+    "//": _floordiv_bounds,
+}
+
+# ---------- Nodes ----------
+
+class Env:
+    """Per-evaluation state threaded through the nodes."""
+    __slots__ = ("ctx", "session", "roll", "source", "memo")
+
+    def __init__(self, ctx: Mapping[str, Any], session: EvalSession | None,
+                 roll: Callable[["Dice"], int] | None, source: str, memo: bool):
+        self.ctx = ctx
+        self.session = session
+        self.roll = roll
+        self.source = source
+        self.memo = memo and session is not None
+
+def _as_int(v: Any) -> int:
+    if isinstance(v, int) and not isinstance(v, bool):
+        return v
+    raise ValueError(f"non-integer value in expression: {v!r}")
+
+class Node:
+    __slots__ = ("start", "end", "pure")
+
+    def __init__(self, start: int, end: int, pure: bool):
+        self.start = start
+        self.end = end
+        self.pure = pure        # no dice anywhere below: safe to memoize
+
+    def num(self, env: Env) -> int:
+        raise NotImplementedError
+
+    def truth(self, env: Env) -> bool:
+        return self.num(env) != 0
+
+    def bounds(self, env: Env) -> Optional[Bounds]:
+        return None
+
+    def children(self) -> Tuple["Node", ...]:
+        return ()
+
+    def walk(self) -> Iterator["Node"]:
+        yield self
+        for c in self.children():
+            yield from c.walk()
+
+class Num(Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value: int, start: int, end: int):
+        self.start, self.end, self.pure = start, end, True
+        self.value = value
+
+    def num(self, env: Env) -> int:
+        return self.value
+
+    def bounds(self, env: Env) -> Optional[Bounds]:
+        return self.value, self.value
+
+class Bool(Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool, start: int, end: int):
+        self.start, self.end, self.pure = start, end, True
+        self.value = value
+
+    def num(self, env: Env) -> int:
+        raise ValueError("booleans not allowed in numbers")
+
+    def truth(self, env: Env) -> bool:
+        return self.value
+
+class Path(Node):
+    __slots__ = ("path", "get")
+
+    def __init__(self, path: str, start: int, end: int):
+        self.start, self.end, self.pure = start, end, True
+        self.path = path
+        self.get: PathAccessor = compile_path(path)
+
+    def num(self, env: Env) -> int:
+        s = env.session
+        return _as_int(self.get(env.ctx) if s is None else s.lookup(env.ctx, self.path))
+
+    def bounds(self, env: Env) -> Optional[Bounds]:
+        try:
+            v = self.num(env)
+        except (LookupError, ValueError):
+            return None        # not in this ctx: leave it to the full resolution
+        return v, v
+
+class Dice(Node):
+    __slots__ = ("spec", "text")
+
+    def __init__(self, spec: DiceSpec, text: str, start: int, end: int):
+        self.start, self.end, self.pure = start, end, False
+        self.spec = spec
+        self.text = text
+
+    def num(self, env: Env) -> int:
+        if env.roll is None:
+            raise ValueError(f"dice not allowed here: {self.text!r}")
+        return env.roll(self)
+
+    def bounds(self, env: Env) -> Optional[Bounds]:
+        return self.spec.bounds
+
+class _Compound(Node):
+    __slots__ = ()
+
+    def num(self, env: Env) -> int:
+        # pure arithmetic is memoized per ctx; dice never are (each term rolls)
+        if env.memo and self.pure:
+            return env.session.value(env.ctx, ("num", env.source, self.start, self.end),
+                                     lambda: self.calc(env))
+        return self.calc(env)
+
+    def calc(self, env: Env) -> int:
+        raise NotImplementedError
+
+class Neg(_Compound):
+    __slots__ = ("operand",)
+
+    def __init__(self, operand: Node, start: int):
+        self.start, self.end, self.pure = start, operand.end, operand.pure
+        self.operand = operand
+
+    def calc(self, env: Env) -> int:
+        return -self.operand.num(env)
+
+    def bounds(self, env: Env) -> Optional[Bounds]:
+        b = self.operand.bounds(env)
+        return None if b is None else (-b[1], -b[0])
+
+    def children(self) -> Tuple[Node, ...]:
+        return (self.operand,)
+
+_ARITH = {"+": add, "-": sub, "*": mul, "//": floordiv}
+
+class BinOp(_Compound):
+    __slots__ = ("op", "fn", "left", "right")
+
+    def __init__(self, op: str, left: Node, right: Node):
+        self.start, self.end, self.pure = left.start, right.end, left.pure and right.pure
+        self.op = op
+        self.fn = _ARITH[op]
+        self.left = left
+        self.right = right
+
+    def calc(self, env: Env) -> int:
+        return self.fn(self.left.num(env), self.right.num(env))
+
+    def bounds(self, env: Env) -> Optional[Bounds]:
+        left = self.left.bounds(env)
+        right = None if left is None else self.right.bounds(env)
+        return None if right is None else _INTERVAL[self.op](left, right)
+
+    def children(self) -> Tuple[Node, ...]:
+        return (self.left, self.right)
+
+_CALLS = {"min": min, "max": max}
+
+class Call(_Compound):
+    __slots__ = ("name", "fn", "args")
+
+    def __init__(self, name: str, args: Tuple[Node, ...], start: int, end: int):
+        self.start, self.end, self.pure = start, end, all(a.pure for a in args)
+        self.name = name
+        self.fn = _CALLS[name]
+        self.args = args
+
+    def calc(self, env: Env) -> int:
+        return self.fn([a.num(env) for a in self.args])
+
+    def bounds(self, env: Env) -> Optional[Bounds]:
+        bs = []
+        for a in self.args:
+            b = a.bounds(env)
+            if b is None:
+                return None
+            bs.append(b)
+        # min/max of intervals, end by end
+        return self.fn(b[0] for b in bs), self.fn(b[1] for b in bs)
+
+    def children(self) -> Tuple[Node, ...]:
+        return self.args
+
+_COMPARE = {"==": eq, "!=": ne, "<": lt, "<=": le, ">": gt, ">=": ge}
+
+class Compare(Node):
+    __slots__ = ("first", "rest")
+
+    def __init__(self, first: Node, rest: Tuple[Tuple[str, Node], ...]):
+        self.start, self.end = first.start, rest[-1][1].end
+        self.pure = first.pure and all(n.pure for _, n in rest)
+        self.first = first
+        self.rest = tuple((op, _COMPARE[op], n) for op, n in rest)
+
+    def num(self, env: Env) -> int:
+        raise ValueError("a comparison is not a number")
+
+    def truth(self, env: Env) -> bool:
+        cur = self.first.num(env)
+        for _, fn, node in self.rest:
+            rv = node.num(env)
+            if not fn(cur, rv):
+                return False
+            cur = rv
+        return True
+
+    def children(self) -> Tuple[Node, ...]:
+        return (self.first, *(n for _, _, n in self.rest))
+
+# ---------- Compiled expression ----------
+
+class Expr:
+    """A parsed expression: the node tree plus what callers ask of it up front."""
+    __slots__ = ("source", "root", "dice", "paths")
+
+    def __init__(self, source: str, root: Node, dice: Tuple[Dice, ...], paths: FrozenSet[str]):
+        self.source = source
+        self.root = root
+        self.dice = dice          # in source order
+        self.paths = paths
+
+    @property
+    def has_dice(self) -> bool:
+        return bool(self.dice)
+
+    def number(self, ctx: Mapping[str, Any], *, session: EvalSession | None = None,
+               roll: Callable[[Dice], int] | None = None, memo: bool = False) -> int:
+        """
+        Evaluate as an int. Dice terms call `roll` (without it they are an
+        error); `memo` caches pure subexpressions in `session`.
+        """
+        return self.root.num(Env(ctx, session, roll, self.source, memo))
+
+    def predicate(self, ctx: Mapping[str, Any], *, session: EvalSession | None = None,
+                  roll: Callable[[Dice], int] | None = None, memo: bool = False) -> bool:
+        """Evaluate as a condition: comparisons, True/False, else numeric truthiness."""
+        return self.root.truth(Env(ctx, session, roll, self.source, memo))
+
+    def bounds(self, ctx: Mapping[str, Any] | None = None, *,
+               session: EvalSession | None = None) -> Optional[Bounds]:
+        """
+        (lowest, highest) the expression can evaluate to, without rolling:
+        dice terms contribute their range, paths their value in `ctx`.
+        None when that cannot be said (a path missing from ctx, a divisor
+        that may be 0, a comparison).
+        """
+        return self.root.bounds(Env(ctx or {}, session, None, self.source, False))
+
+    def __repr__(self) -> str:
+        return f"<Expr {self.source!r}>"
+
+# ---------- Tokenizer ----------
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<dice>(?P<count>\d+)[dD](?P<sides>\d+)(?P<mods>(?:!(?!=)|r\d+|k[hl]?\d+|d[hl]\d+)*))(?![\w.])
+    | (?P<int>\d+)(?![\w.])
+    | (?P<name>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)
+    | (?P<op>//|==|!=|<=|>=|[-+*<>(),])
+    | (?P<bad>\S)
+    )""", re.VERBOSE)
+_MOD = re.compile(r"(!)|r(\d+)|k([hl]?)(\d+)|d([hl])(\d+)")
+
+Token = Tuple[str, Any, int, int]   # (kind, value, start, end)
+
+def tokenize(text: str) -> List[Token]:
+    toks: List[Token] = []
+    append = toks.append
+    for m in _TOKEN.finditer(text):
+        kind = m.lastgroup      # the outermost group that matched
+        start, end = m.span(kind)
+        if kind == "op" or kind == "name":
+            append((kind, text[start:end], start, end))
+        elif kind == "int":
+            append(("int", int(text[start:end]), start, end))
+        elif kind == "dice":
+            append(("dice", _dice_spec(m, text), start, end))
+        else:
+            raise ExprSyntaxError(f"unexpected {m.group(kind)!r}", text, start)
+    append(("end", None, len(text), len(text)))
+    return toks
+
+def _dice_spec(m: "re.Match[str]", text: str) -> DiceSpec:
+    count, sides = int(m.group("count")), int(m.group("sides"))
+    where = m.start("dice")
+    if sides < 1:
+        raise ExprSyntaxError("dice need at least one side", text, where)
+    keep: Optional[int] = None
+    highest, explode, reroll = True, False, 0
+    for mod in _MOD.finditer(m.group("mods")):
+        bang, rr, kmode, k, dmode, d = mod.groups()
+        if bang:
+            if explode or sides < 2:
+                raise ExprSyntaxError("bad '!' (once per term, dice with 2+ sides)", text, where)
+            explode = True
+        elif rr is not None:
+            if reroll or not 1 <= int(rr) < sides:
+                raise ExprSyntaxError(f"bad reroll 'r{rr}' for d{sides}", text, where)
+            reroll = int(rr)
+        else:
+            if keep is not None:
+                raise ExprSyntaxError("one keep/drop per dice term", text, where)
+            if k is not None:
+                keep, highest = min(int(k), count), kmode != "l"
+            else:
+                keep, highest = max(0, count - int(d)), dmode == "l"
+    return DiceSpec(count, sides, keep, highest, explode, reroll)
+
+# ---------- Pratt parser ----------
+
+_CMP_BP = 10
+_INFIX_BP = {"+": 20, "-": 20, "*": 30, "//": 30, **{op: _CMP_BP for op in _COMPARE}}
+_PREFIX_BP = 40
+
+class _Parser:
+    __slots__ = ("text", "toks", "i", "dice", "paths")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.toks = tokenize(text)
+        self.i = 0
+        self.dice: List[Dice] = []
+        self.paths: List[str] = []
+
+    def _next(self) -> Token:
+        tok = self.toks[self.i]
+        self.i += 1
+        return tok
+
+    def _expect(self, op: str) -> Token:
+        tok = self._next()
+        if tok[0] != "op" or tok[1] != op:
+            raise ExprSyntaxError(f"expected {op!r}", self.text, tok[2])
+        return tok
+
+    def parse(self) -> Expr:
+        node = self.expr(0)
+        tok = self.toks[self.i]
+        if tok[0] != "end":
+            raise ExprSyntaxError(f"unexpected {tok[1]!r}", self.text, tok[2])
+        return Expr(self.text, node, tuple(self.dice), frozenset(self.paths))
+
+    def expr(self, rbp: int) -> Node:
+        left = self.prefix()
+        while True:
+            kind, op, _, _ = self.toks[self.i]
+            bp = _INFIX_BP.get(op, 0) if kind == "op" else 0
+            if bp <= rbp:
+                return left
+            self.i += 1
+            if bp == _CMP_BP:
+                left = self.compare(left, op)
+            else:
+                left = BinOp(op, left, self.expr(bp))
+
+    def compare(self, first: Node, op: str) -> Node:
+        # a < b <= c chains, like Python: every link must hold
+        rest = [(op, self.expr(_CMP_BP))]
+        while True:
+            kind, op, _, _ = self.toks[self.i]
+            if kind != "op" or op not in _COMPARE:
+                return Compare(first, tuple(rest))
+            self.i += 1
+            rest.append((op, self.expr(_CMP_BP)))
+
+    def prefix(self) -> Node:
+        kind, val, start, end = self._next()
+        if kind == "int":
+            return Num(val, start, end)
+        if kind == "dice":
+            term = Dice(val, self.text[start:end], start, end)
+            self.dice.append(term)
+            return term
+        if kind == "name":
+            if val in ("True", "False"):
+                return Bool(val == "True", start, end)
+            if val in _CALLS and self.toks[self.i][1] == "(":
+                return self.call(val, start)
+            try:
+                path = Path(val, start, end)
+            except ValueError as e:
+                raise ExprSyntaxError(str(e), self.text, start) from None
+            self.paths.append(val)
+            return path
+        if kind == "op":
+            if val == "-":
+                return Neg(self.expr(_PREFIX_BP), start)
+            if val == "(":
+                node = self.expr(0)
+                self._expect(")")
+                return node
+        what = "end of expression" if kind == "end" else repr(val)
+        raise ExprSyntaxError(f"unexpected {what}", self.text, start)
+
+    def call(self, name: str, start: int) -> Node:
+        self._expect("(")
+        args = [self.expr(0)]
+        while self.toks[self.i][1] == ",":
+            self.i += 1
+            args.append(self.expr(0))
+        end = self._expect(")")[3]
+        return Call(name, tuple(args), start, end)
+
+@lru_cache(maxsize=4096)
+def compile_expr(text: str) -> Expr:
+    """Parse (once per distinct text) into an Expr; raises ExprSyntaxError."""
+    if not isinstance(text, str):
+        raise TypeError(f"expected str expression, got {type(text).__name__}")
+    return _Parser(text.strip()).parse()
@@ -0,0 +1,92 @@
+"""
+Outbox: moves recorded domain events from aggregates to the EventBus.
+
+Aggregates touched during a unit of work are tracked; `flush` swaps out each
+one's event buffer (AggregateRoot.pull_events hands over the list itself)
+and publishes everything as one EventBus.publish_batch. Events keep their
+recording order within an aggregate, and aggregates are flushed in the
+order they were first tracked.
+
+    with outbox.unit_of_work() as uow:
+        uow.track(actor); actor.act(cmd)
+        uow.track(target); target.act(cmd2)
+    # both actors' events published here, as one batch
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import threading
+
+from .base import AggregateRoot
+from .event_bus import EventBus
+
+class Outbox:
+    def __init__(self, bus: EventBus):
+        self.bus = bus
+        self._dirty: Dict[int, AggregateRoot] = {}   # id(aggregate) -> aggregate, insertion-ordered
+        self._lock = threading.Lock()
+        self.flushes = 0
+        self.events = 0
+        self.max_batch = 0
+        self.last_batch = 0
+
+    def track(self, aggregate: AggregateRoot) -> None:
+        with self._lock:
+            self._dirty.setdefault(id(aggregate), aggregate)
+
+    def track_many(self, aggregates: Iterable[AggregateRoot]) -> None:
+        with self._lock:
+            for agg in aggregates:
+                self._dirty.setdefault(id(agg), agg)
+
+    def _take(self) -> List[Tuple[AggregateRoot, List[Any]]]:
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        return [(agg, agg.pull_events()) for agg in dirty.values() if agg.has_events]
+
+    def collect(self) -> List[Any]:
+        """Take every tracked aggregate's events (without publishing) and untrack them."""
+        return [e for _, events in self._take() for e in events]
+
+    def flush(self) -> int:
+        """
+        Publish all pending events as one batch; returns how many. If
+        publishing raises, the events go back on their aggregates (ahead of
+        newer ones) and the aggregates stay tracked for the next flush.
+        """
+        taken = self._take()
+        batch = [e for _, events in taken for e in events]
+        if batch:
+            try:
+                self.bus.publish_batch(batch)
+            except BaseException:
+                for agg, events in taken:
+                    agg.restore_events(events)
+                self.track_many(agg for agg, _ in taken)
+                raise
+        with self._lock:
+            self.flushes += 1
+            self.events += len(batch)
+            self.last_batch = len(batch)
+            self.max_batch = max(self.max_batch, len(batch))
+        return len(batch)
+
+    def discard(self) -> None:
+        """Untrack everything; recorded events stay on their aggregates."""
+        with self._lock:
+            self._dirty = {}
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator["Outbox"]:
+        """Flush on success; on error nothing is published."""
+        try:
+            yield self
+        except BaseException:
+            self.discard()
+            raise
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"flushes": self.flushes, "events": self.events,
+                "events_per_flush": self.events / self.flushes if self.flushes else 0.0,
+                "last_batch": self.last_batch, "max_batch": self.max_batch}
@@ -0,0 +1,73 @@
+# baator/kernel/paths.py
+from __future__ import annotations
+from collections.abc import Mapping
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Tuple
+
+class PathError(LookupError):
+    """A dotted context path could not be resolved; names the missing segment."""
+    def __init__(self, path: str, segment: str, parent: str, obj: Any):
+        self.path = path
+        self.segment = segment
+        where = f"'{parent}'" if parent else "context"
+        super().__init__(f"{path}: no '{segment}' in {where} ({type(obj).__name__})")
+
+# type -> "index it?", classified once per type (Mapping ABC checks are slow).
+# dataclasses, __slots__ objects and everything else are read as attributes.
+_IS_MAPPING: Dict[type, bool] = {dict: True}
+
+def _is_mapping(tp: type) -> bool:
+    m = _IS_MAPPING.get(tp)
+    if m is None:
+        m = _IS_MAPPING[tp] = issubclass(tp, Mapping)
+    return m
+
+class PathAccessor:
+    """
+    Precompiled accessor for a dotted path like `actor.stats.STR`.
+    Each hop indexes dicts/Mappings and reads attributes on dataclasses,
+    __slots__ objects and anything else.
+    """
+    __slots__ = ("path", "parts", "_steps")
+
+    def __init__(self, path: str):
+        parts: Tuple[str, ...] = tuple(path.split("."))
+        for p in parts:
+            if not p:
+                raise ValueError(f"bad path {path!r}")
+            if p.startswith("__"):
+                raise ValueError(f"private segment {p!r} not allowed in path {path!r}")
+        self.path = path
+        self.parts = parts
+        # per hop: C-level (item, attribute) getters bound to the segment
+        self._steps: Tuple[Tuple[Callable[[Any], Any], Callable[[Any], Any]], ...] = tuple(
+            (itemgetter(p), attrgetter(p)) for p in parts)
+
+    def __call__(self, root: Any) -> Any:
+        obj = root
+        try:
+            for item, attr in self._steps:
+                tp = type(obj)
+                obj = item(obj) if (tp is dict or _is_mapping(tp)) else attr(obj)
+        except (KeyError, AttributeError, TypeError):
+            raise self._error(root) from None
+        return obj
+
+    def _error(self, root: Any) -> PathError:
+        # slow path: walk again to name the segment that failed
+        obj = root
+        for i, part in enumerate(self.parts):
+            try:
+                obj = obj[part] if _is_mapping(type(obj)) else getattr(obj, part)
+            except (KeyError, AttributeError, TypeError):
+                return PathError(self.path, part, ".".join(self.parts[:i]), obj)
+        return PathError(self.path, self.parts[-1], ".".join(self.parts[:-1]), obj)
+
+    def __repr__(self) -> str:
+        return f"<PathAccessor {self.path}>"
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str) -> PathAccessor:
+    """Return the (cached) accessor for a dotted path."""
+    return PathAccessor(path)
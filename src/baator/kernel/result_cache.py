@@ -0,0 +1,81 @@
+"""
+Bounded, TTL'd cache of request results, for idempotent command handling.
+
+Entries expire `ttl_s` after they were stored and the oldest are evicted
+once there are more than `max_entries`. Since every entry has the same TTL,
+insertion order is expiry order, so both checks look only at the oldest
+end of one OrderedDict.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+_MISSING = object()
+
+class ResultCache:
+    def __init__(self, max_entries: int = 10_000, ttl_s: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()   # key -> (expires, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0     # dropped for size
+        self.expirations = 0   # dropped for age
+
+    def _expire(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            key, (expires, _) = next(iter(entries.items()))
+            if expires > now:
+                break
+            del entries[key]
+            self.expirations += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            self._expire(self._clock())
+            hit = self._entries.get(key, _MISSING)
+            if hit is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return hit[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl_s, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            self._expire(self._clock())
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(self._clock())
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations,
+                "hit_rate": self.hit_rate}
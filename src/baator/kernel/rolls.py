@@ -1,172 +1,149 @@
 # baator/kernel/rolls.py
 from __future__ import annotations
-import ast, re
-from typing import Any, Mapping, List, Tuple, overload, Literal, TypedDict, Callable
+from typing import Any, Dict, Mapping, List, NotRequired, Tuple, overload, Literal, TypedDict, Callable
 from .rng import RNG
+from . import dice_pool
+from .exprlang import MAX_EXPLODE, Dice, DiceSpec, compile_expr
+from .session import EvalSession
 
 # ---------- Safe arithmetic / predicate evaluator (no dice in here) ----------
 
 Mode = Literal["number", "predicate", "auto"]
 
-def _parse_expr(expr: str) -> ast.AST:
-    if not isinstance(expr, str):
-        raise TypeError(f"expected str expression, got {type(expr).__name__}")
-    s = expr.strip()
-    try:
-        tree = ast.parse(s, mode="eval")
-    except SyntaxError as e:
-        raise ValueError(f"bad expression syntax {expr!r}") from e
-    if not isinstance(tree, ast.Expression):
-        raise ValueError("AST parse did not produce an Expression node")
-    return tree.body
-
-def eval_safe(expr: str, ctx: Mapping[str, Any], *, mode: Mode = "auto") -> int | bool:
+def eval_safe(expr: str, ctx: Mapping[str, Any], *, mode: Mode = "auto",
+              session: EvalSession | None = None) -> int | bool:
     """
-    Safe evaluator for rule expressions (no dice tokens).
-    - number: ints, dotted lookups, + - * //, unary -
+    Safe evaluator for rule expressions (no dice terms); see exprlang.
+    - number: ints, dotted lookups, + - * //, unary -, min/max
     - predicate: comparisons over numeric subexpressions; bare bools/ints truthiness
+    With a session, path lookups and the (pure) result are memoized per ctx.
     """
-    def resolve_path(path: str) -> Any:
-        obj: Any = ctx
-        for part in path.split("."):
-            obj = obj[part] if isinstance(obj, dict) else getattr(obj, part)
-        return obj
-
-    def as_int(val: Any) -> int:
-        if isinstance(val, int) and not isinstance(val, bool):
-            return val
-        raise ValueError(f"non-integer value in expression: {val!r}")
-
-    def num(n: ast.AST) -> int:
-        if isinstance(n, ast.Constant):
-            v = n.value
-            if isinstance(v, int) and not isinstance(v, bool):
-                return v
-            raise ValueError("only integer literals allowed")
-        if isinstance(n, ast.Name):
-            return as_int(resolve_path(n.id))
-        if isinstance(n, ast.Attribute):
-            parts: List[str] = []
-            cur: ast.AST = n
-            while isinstance(cur, ast.Attribute):
-                parts.insert(0, cur.attr)
-                cur = cur.value
-            if isinstance(cur, ast.Name):
-                parts.insert(0, cur.id)
-            return as_int(resolve_path(".".join(parts)))
-        if isinstance(n, ast.UnaryOp) and isinstance(n.op, ast.USub):
-            return -num(n.operand)
-        if isinstance(n, ast.BinOp):
-            if   isinstance(n.op, ast.Add):      return num(n.left) +  num(n.right)
-            elif isinstance(n.op, ast.Sub):      return num(n.left) -  num(n.right)
-            elif isinstance(n.op, ast.Mult):     return num(n.left) *  num(n.right)
-            elif isinstance(n.op, ast.FloorDiv): return num(n.left) // num(n.right)
-        raise ValueError(f"disallowed node in numeric expr: {ast.dump(n)}")
-
-    def pred(n: ast.AST) -> bool:
-        if isinstance(n, ast.Compare):
-            cur = num(n.left)
-            for op_node, rhs in zip(n.ops, n.comparators):
-                rv = num(rhs)
-                if   isinstance(op_node, ast.Eq):    ok = (cur == rv)
-                elif isinstance(op_node, ast.NotEq): ok = (cur != rv)
-                elif isinstance(op_node, ast.Gt):    ok = (cur >  rv)
-                elif isinstance(op_node, ast.Lt):    ok = (cur <  rv)
-                elif isinstance(op_node, ast.GtE):   ok = (cur >= rv)
-                elif isinstance(op_node, ast.LtE):   ok = (cur <= rv)
-                else:
-                    raise ValueError(f"disallowed comparison operator: {type(op_node).__name__}")
-                if not ok: return False
-                cur = rv
-            return True
-        if isinstance(n, ast.Constant) and isinstance(n.value, bool):
-            return bool(n.value)
-        try:
-            return num(n) != 0
-        except Exception:
-            raise ValueError(f"disallowed node in predicate: {ast.dump(n)}")
-
-    s = str(expr)
-    s = s.strip()
-    node = _parse_expr(s)
-    if mode == "number":     return num(node)
-    if mode == "predicate":  return pred(node)
+    if session is not None:
+        return session.value(ctx, ("safe", mode, expr),
+                             lambda: _eval_safe(expr, ctx, mode, session))
+    return _eval_safe(expr, ctx, mode, None)
+
+def _eval_safe(expr: str, ctx: Mapping[str, Any], mode: Mode, session: EvalSession | None) -> int | bool:
+    compiled = compile_expr(expr)
+    if mode == "number":     return compiled.number(ctx, session=session)
+    if mode == "predicate":  return compiled.predicate(ctx, session=session)
     # auto: try numeric, fall back to predicate
-    try: return num(node)
-    except ValueError: return pred(node)
+    try: return compiled.number(ctx, session=session)
+    except ValueError: return compiled.predicate(ctx, session=session)
 
-# ---------- Dice roller (supports kh/kl + ctx-aware modifiers) ----------
+# ---------- Dice roller (exprlang dice terms: keep/drop, explode, reroll) ----------
 
 class RollDetail(TypedDict):
     expr: str
     result: int
-    faces: List[int]     # all dice rolled
-    kept: List[int]      # dice that counted (after kh/kl)
-    modifier: int        # resolved modifier
-
-DICE_REGEX = re.compile(
-    r"""
-    ^\s*
-    (?P<count>\d+)[dD](?P<sides>\d+)
-    (?:k(?P<keep_mode>[hl])?(?P<keep>\d+))?          # kh1 / kl1 / k3 (default high)
-    (?:\s*(?P<sign>[+-])\s*(?P<modifier>(?:\d+|[A-Za-z_][\w.]*)))?
-    \s*$
-    """,
-    re.VERBOSE,
-)
-
-def _resolve_modifier(sign: str | None, modraw: str | None, ctx: Mapping[str, Any] | None) -> int:
-    if not sign or not modraw:
-        return 0
-    m = modraw.strip()
-    if m.isdigit():
-        val = int(m)
+    faces: List[int]     # all dice rolled, every term (empty for count-based pools)
+    kept: List[int]      # dice that counted (after keep/drop; empty for count-based pools)
+    modifier: int        # what the non-dice part of the expression added
+    counts: NotRequired[Dict[int, int]]       # count-based pools: {face: dice showing it}
+    kept_counts: NotRequired[Dict[int, int]]  # ... and of those, the ones that counted
+
+# Pools of at least this many dice (and at least 4 per side, below which
+# per-die rolling is no slower) are sampled as face counts; see dice_pool.
+# Exploding terms are always rolled per die.
+POOL_THRESHOLD = 128
+
+def _use_counts(n: int, sides: int, threshold: int | None) -> bool:
+    limit = POOL_THRESHOLD if threshold is None else threshold
+    return n >= limit and n >= 4 * sides
+
+def _die(sides: int, rng: RNG, reroll: int, explode: bool) -> int:
+    v = rng.roll(sides)
+    if v <= reroll:
+        v = rng.roll(sides)
+    if explode:
+        last, extra = v, 0
+        while last == sides and extra < MAX_EXPLODE:
+            last = rng.roll(sides)
+            v += last
+            extra += 1
+    return v
+
+def _roll_term(spec: DiceSpec, rng: RNG, pool_threshold: int | None,
+               counts: Dict[str, Dict[int, int]] | None) -> Tuple[int, List[int], List[int]]:
+    """(subtotal, faces, kept) for one dice term; an exploded die is one face."""
+    n, sides = spec.count, spec.sides
+    if not spec.explode and _use_counts(n, sides, pool_threshold):
+        subtotal, all_counts, kept_counts = dice_pool.roll_pool(n, sides, rng, spec.keep,
+                                                                spec.highest, spec.reroll)
+        if counts is not None:
+            for key, c in (("counts", all_counts), ("kept_counts", kept_counts)):
+                acc = counts.setdefault(key, {})
+                for face, k in dice_pool.as_dict(c).items():
+                    acc[face] = acc.get(face, 0) + k
+        return subtotal, [], []
+
+    if spec.reroll or spec.explode:
+        faces = [_die(sides, rng, spec.reroll, spec.explode) for _ in range(n)]
     else:
-        if ctx is None:
-            raise ValueError(f"dice modifier '{m}' requires context")
-        val = int(eval_safe(m, ctx, mode="number"))
-    return val if sign == "+" else -val
-
-def _roll_expr_detail(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None
-    ) -> Tuple[int, List[int], List[int], int]:
-    m = DICE_REGEX.match(expr)
-    if not m:
-        raise ValueError(f"bad dice expression: {expr!r}")
-
-    n      = int(m.group("count"))
-    sides  = int(m.group("sides"))
-    keep_s = m.group("keep")
-    keep_m = (m.group("keep_mode") or "h")
-    sign   = m.group("sign")
-    modraw = m.group("modifier")
-
-    faces = [rng.roll(sides) for _ in range(n)]
-    if keep_s is not None:
-        k = max(0, min(int(keep_s), n))
-        kept = sorted(faces, reverse=(keep_m == "h"))[:k] if k else []
+        faces = [rng.roll(sides) for _ in range(n)]
+    if spec.keep is None:
+        kept = faces
     else:
-        kept = list(faces)
+        kept = sorted(faces, reverse=spec.highest)[:spec.keep] if spec.keep else []
+    return sum(kept), faces, list(kept)
 
-    subtotal = sum(kept)
-    mod      = _resolve_modifier(sign, modraw, ctx)
-    return subtotal + mod, faces, kept, mod
-
-from typing import Mapping, Any
+def _roll_expr_detail(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None,
+    session: EvalSession | None = None, pool_threshold: int | None = None,
+    counts: Dict[str, Dict[int, int]] | None = None) -> Tuple[int, List[int], List[int], int]:
+    """
+    (total, faces, kept, modifier) over every dice term of the expression;
+    modifier is what the non-dice part added. Large pools are sampled as
+    face counts (their faces and kept stay empty); pass `counts` to receive
+    them, summed over terms, as {"counts": {...}, "kept_counts": {...}}.
+    """
+    compiled = compile_expr(expr)
+    if ctx is None:
+        if compiled.paths:
+            raise ValueError(f"expression {expr!r} reads {sorted(compiled.paths)} but has no context")
+        ctx = {}
+    faces: List[int] = []
+    kept: List[int] = []
+    rolled = 0
+
+    def roll(term: Dice) -> int:
+        nonlocal rolled
+        subtotal, f, k = _roll_term(term.spec, rng, pool_threshold, counts)
+        faces.extend(f)
+        kept.extend(k)
+        rolled += subtotal
+        return subtotal
+
+    total = compiled.number(ctx, session=session, roll=roll, memo=True)
+    return total, faces, kept, total - rolled
 
 def is_dice_expr(expr: str) -> bool:
-    return bool(DICE_REGEX.match(expr.strip()))  # _R = your dice regex
+    try:
+        return compile_expr(expr).has_dice
+    except ValueError:
+        return False
 
 @overload
-def roll_expr(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None, verbose: Literal[False] = False) -> int: ...
+def roll_expr(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None, verbose: Literal[False] = False, session: EvalSession | None = None, pool_threshold: int | None = None) -> int: ...
 
 @overload
-def roll_expr(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None, verbose: Literal[True]) -> RollDetail: ...
+def roll_expr(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None, verbose: Literal[True], session: EvalSession | None = None, pool_threshold: int | None = None) -> RollDetail: ...
 
-def roll_expr(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None, verbose: bool = False) -> int | RollDetail:
-    total, faces, kept, mod = _roll_expr_detail(expr, rng, ctx=ctx, meta=meta)
+def roll_expr(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, meta: Mapping[str, Any] | None = None, verbose: bool = False,
+              session: EvalSession | None = None, pool_threshold: int | None = None) -> int | RollDetail:
+    """
+    Roll every dice term of `expr` (any exprlang expression) and evaluate it.
+    `pool_threshold` overrides POOL_THRESHOLD for this roll. Count-based
+    pools report `counts` / `kept_counts` in verbose mode instead of faces.
+    """
+    summary: Dict[str, Dict[int, int]] | None = {} if verbose else None
+    total, faces, kept, mod = _roll_expr_detail(expr, rng, ctx=ctx, meta=meta, session=session,
+                                                pool_threshold=pool_threshold, counts=summary)
     if not verbose:
         return total
-    return RollDetail(expr=expr, result=total, faces=faces, kept=kept, modifier=mod)
+    detail = RollDetail(expr=expr, result=total, faces=faces, kept=kept, modifier=mod)
+    if summary:
+        detail.update(summary)
+    return detail
 
 def number_from(expr: str, rng: RNG, *, ctx: Mapping[str, Any] | None = None, verbose: bool = False) -> int:
     """
@@ -0,0 +1,57 @@
+# baator/kernel/session.py
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Mapping, Tuple
+from .paths import compile_path
+
+class EvalSession:
+    """
+    Memo shared by the evaluators for the life of one RulesEngine.apply
+    (or a batch of applies over an unchanged context).
+
+    Caches resolved dotted paths and pure (dice-free) subexpression values,
+    scoped per context mapping so two different contexts never share results.
+    Anything that may mutate state (an emitted effect, a facet command) must be
+    followed by invalidate().
+    """
+    def __init__(self) -> None:
+        # id(ctx) -> (ctx, memo); holding ctx keeps its id from being reused
+        self._scopes: Dict[int, Tuple[Mapping[str, Any], Dict[Hashable, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _memo(self, ctx: Mapping[str, Any]) -> Dict[Hashable, Any]:
+        scope = self._scopes.get(id(ctx))
+        if scope is None or scope[0] is not ctx:
+            scope = (ctx, {})
+            self._scopes[id(ctx)] = scope
+        return scope[1]
+
+    def value(self, ctx: Mapping[str, Any], key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the memoized value for key under ctx, computing it on first use."""
+        memo = self._memo(ctx)
+        try:
+            val = memo[key]
+        except KeyError:
+            self.misses += 1
+            val = memo[key] = compute()   # failures are not cached
+            return val
+        self.hits += 1
+        return val
+
+    def lookup(self, ctx: Mapping[str, Any], path: str) -> Any:
+        return self.value(ctx, ("path", path), lambda: compile_path(path)(ctx))
+
+    def invalidate(self) -> None:
+        """Drop everything; the next evaluation re-reads the context."""
+        if self._scopes:
+            self._scopes.clear()
+        self.invalidations += 1
+
+    @property
+    def saved(self) -> int:
+        """Number of lookups/evaluations served from the memo."""
+        return self.hits
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
@@ -1,11 +1,21 @@
 from .dice_service import DiceService
-from .rules_loader import Rule, Effect, RulePack, RulesRegistry, load_rule_pack
+from .dice_scheduler import DiceScheduler, PriorityClass, DiceOverloaded
+from .rules_loader import (Rule, Effect, RulePack, RulesRegistry, PackDiff, PackFileReport, PackLoadReport,
+                           load_rule_pack, load_rule_packs, parse_rule_pack)
+from .pack_cache import PackCache
+from .pack_watcher import PackWatcher
 from .rules_engine import RulesEngine
-from .simulator import Simulator
+from .simulator import Simulator, EncounterReport
+from .policies import TurnChoice, TurnPolicy, FocusFire, RandomTarget, ByTeam, last_team_standing
+from .actor_router import ActorRouter, MailboxStats
 
 __all__ = [
-    "DiceService",
-    "Rule", "Effect", "RulePack", "RulesRegistry", "load_rule_pack",
+    "DiceService", "DiceScheduler", "PriorityClass", "DiceOverloaded",
+    "Rule", "Effect", "RulePack", "RulesRegistry", "load_rule_pack", "parse_rule_pack",
+    "load_rule_packs", "PackFileReport", "PackLoadReport",
+    "PackDiff", "PackCache", "PackWatcher",
     "RulesEngine",
-    "Simulator"
+    "Simulator", "EncounterReport",
+    "TurnChoice", "TurnPolicy", "FocusFire", "RandomTarget", "ByTeam", "last_team_standing",
+    "ActorRouter", "MailboxStats",
 ]
@@ -0,0 +1,187 @@
+"""
+Per-actor mailboxes for facet commands.
+
+The router is a CommandBus handler for facet commands (physical.take_damage,
+cyber.ice_attack, ...). Each command is routed to the actor it affects, by
+the payload key its handler declares (handles(..., route=)): `target_id`
+unless the command is self-directed (mythic.invocation pays from
+`actor_id`), falling back to `actor_id`. It is appended to that actor's
+mailbox.
+A mailbox with work is scheduled on a thread pool and drained in order by
+one worker at a time. Different actors mutate in parallel, while one actor's
+commands never race each other.
+
+Events each command produces are pulled from the actor and published on
+the bus. A command that fails (unknown actor, missing facet, bad payload)
+publishes `router.command_failed` {actor_id, command, error} and the mailbox
+moves on.
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, Mapping, Optional
+from uuid import UUID
+import threading
+import time
+
+from baator.domain import Actor
+from baator.domain.facets import CyberFacet, MythicFacet, PhysicalFacet
+from baator.kernel import Command, CommandBus, Event, EventBus
+from .context_provider import ActorRepo, _as_uuid
+
+def facet_commands(*facet_classes: type) -> FrozenSet[str]:
+    """Every command name the given facet classes (default: the built-in ones) handle."""
+    classes = facet_classes or (PhysicalFacet, CyberFacet, MythicFacet)
+    return frozenset(name for cls in classes for name in cls._handlers)
+
+def command_routes(*facet_classes: type) -> Dict[str, str]:
+    """Command name -> the payload key naming the actor it applies to, as the handlers declare."""
+    classes = facet_classes or (PhysicalFacet, CyberFacet, MythicFacet)
+    return {name: key for cls in classes for name, key in cls._routes.items()}
+
+def route_command(cmd: Command, routes: Mapping[str, str]) -> UUID | None:
+    """The actor `cmd` applies to: its declared routing key (default target_id), then actor_id."""
+    p = cmd.payload
+    return _as_uuid(p.get(routes.get(cmd.name, "target_id"))) or _as_uuid(p.get("actor_id"))
+
+@dataclass
+class MailboxStats:
+    enqueued: int = 0
+    processed: int = 0
+    failed: int = 0
+    max_depth: int = 0
+    busy_ms: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Commands per second of worker time spent on this mailbox."""
+        return self.processed / (self.busy_ms / 1000.0) if self.busy_ms else 0.0
+
+class _Mailbox:
+    __slots__ = ("actor_id", "queue", "scheduled", "stats")
+
+    def __init__(self, actor_id: UUID):
+        self.actor_id = actor_id
+        self.queue: Deque[Command] = deque()
+        self.scheduled = False          # a worker owns this mailbox
+        self.stats = MailboxStats()
+
+class ActorRouter:
+    def __init__(self, repo: ActorRepo, bus: EventBus, *, workers: int = 4,
+                 executor: Optional[Executor] = None, quantum: int = 64,
+                 save: Optional[Callable[[Actor], None]] = None,
+                 routes: Optional[Mapping[str, str]] = None):
+        """
+        `quantum` bounds how many commands a worker takes from one mailbox
+        before yielding it back to the pool, so a busy actor cannot starve
+        the rest. `save` persists an actor after its batch (for repos that
+        hand out copies, e.g. SQLiteActorRepo.add). `routes` maps command
+        names to routing keys (default: command_routes() of the built-in
+        facets); unlisted commands go by target_id.
+        """
+        self.repo = repo
+        self.routes = dict(routes) if routes is not None else command_routes()
+        self.bus = bus
+        self.quantum = quantum
+        self.save = save
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=workers,
+                                                        thread_name_prefix="actor-mailbox")
+        self._boxes: Dict[UUID, _Mailbox] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+
+    def register(self, cmd_bus: CommandBus, names: Iterable[str] | None = None) -> None:
+        """Make this router the CommandBus handler for facet commands."""
+        for name in sorted(names if names is not None else facet_commands()):
+            cmd_bus.register(name, self.submit)
+
+    def route(self, cmd: Command) -> UUID | None:
+        return route_command(cmd, self.routes)
+
+    def submit(self, cmd: Command) -> None:
+        actor_id = self.route(cmd)
+        if actor_id is None:
+            raise ValueError(f"Cannot route {cmd.name}: no target_id or actor_id in payload")
+        with self._lock:
+            box = self._boxes.get(actor_id)
+            if box is None:
+                box = self._boxes[actor_id] = _Mailbox(actor_id)
+            box.queue.append(cmd)
+            box.stats.enqueued += 1
+            if len(box.queue) > box.stats.max_depth:
+                box.stats.max_depth = len(box.queue)
+            self._outstanding += 1
+            if box.scheduled:
+                return
+            box.scheduled = True
+        self._executor.submit(self._run, box)
+
+    def _run(self, box: _Mailbox) -> None:
+        with self._lock:
+            batch = [box.queue.popleft() for _ in range(min(self.quantum, len(box.queue)))]
+        t0 = time.perf_counter()
+        ok = 0
+        try:
+            ok = self._process(box.actor_id, batch)
+        finally:
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            with self._lock:
+                st = box.stats
+                st.processed += ok
+                st.failed += len(batch) - ok
+                st.busy_ms += elapsed_ms
+                self._outstanding -= len(batch)
+                more = bool(box.queue)
+                if not more:
+                    box.scheduled = False
+                if self._outstanding == 0:
+                    self._idle.notify_all()
+            if more:   # requeue at the back so other mailboxes get a turn
+                self._executor.submit(self._run, box)
+
+    def _process(self, actor_id: UUID, batch: list[Command]) -> int:
+        """Apply `batch` to one actor in order; returns how many succeeded."""
+        ok = 0
+        try:
+            actor = self.repo.get(actor_id)
+            if actor is None:
+                raise LookupError(f"Unknown actor {actor_id}")
+        except Exception as e:
+            for cmd in batch:
+                self._failed(actor_id, cmd, e)
+            return 0
+        for cmd in batch:
+            try:
+                actor.act(cmd)
+                ok += 1
+            except Exception as e:
+                self._failed(actor_id, cmd, e)
+        if ok and self.save is not None:
+            self.save(actor)
+        self.bus.publish_batch(actor.pull_events())
+        return ok
+
+    def _failed(self, actor_id: UUID, cmd: Command, error: Exception) -> None:
+        self.bus.publish(Event(name="router.command_failed", payload={
+            "actor_id": str(actor_id), "command": cmd.name, "error": str(error)}))
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Block until every submitted command has been processed."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._outstanding == 0, timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if wait:
+            self.join()
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-mailbox counters keyed by actor id, plus throughput in commands/s."""
+        with self._lock:
+            return {str(aid): {**asdict(box.stats), "depth": len(box.queue),
+                               "throughput": box.stats.throughput}
+                    for aid, box in self._boxes.items()}
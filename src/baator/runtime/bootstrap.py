@@ -1,10 +1,11 @@
 import os
 from baator.kernel.context import ContextProvider
-from baator.kernel import EventBus, CommandBus
-from baator.runtime import DiceService
+from baator.kernel import EventBus, CommandBus, ResultCache
+from baator.runtime import DiceService, DiceScheduler
 from baator.interface import PythonRNG
 from baator.interface import SocketRNG
-from baator.runtime.context_provider import ActorRepo, SimpleContextProvider
+from baator.interface import InMemoryActorRepo, SQLiteActorRepo
+from baator.runtime.context_provider import ActorRepo, ProjectionCache, SimpleContextProvider
 
 def choose_rng():
     mode = os.getenv("BAATOR_RNG", "python").lower()
@@ -14,13 +15,24 @@ def choose_rng():
         return SocketRNG(host=host, port=port)
     return PythonRNG()
 
+def choose_repo() -> ActorRepo:
+    mode = os.getenv("BAATOR_REPO", "memory").lower()
+    if mode == "sqlite":
+        return SQLiteActorRepo(os.getenv("BAATOR_DB", "baator.db"))
+    return InMemoryActorRepo()
+
 def bootstrap(sync_bus: bool=False):
     event_bus = EventBus(sync=sync_bus)
     cmd_bus = CommandBus()
     rng = choose_rng()
-    ctx_provider = SimpleContextProvider(ActorRepo())
+    projections = ProjectionCache()
+    projections.attach(event_bus)
+    ctx_provider = SimpleContextProvider(choose_repo(), cache=projections)
 
-    dice = DiceService(rng, event_bus, cmd_bus, ctx_provider)
+    # live rolls overtake simulation bursts; shed background rolls use a local RNG;
+    # retried request_ids replay their first result instead of rolling again
+    dice = DiceService(rng, event_bus, cmd_bus, ctx_provider,
+                       scheduler=DiceScheduler(), fallback_rng=PythonRNG(), results=ResultCache())
 
     # register commands
     cmd_bus.register("dice.resolve_number", dice.handle)
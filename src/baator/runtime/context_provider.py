@@ -1,27 +1,145 @@
-from typing import Any, Mapping, MutableMapping
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Tuple
 from uuid import UUID
+import threading
 
 from baator.domain.actor import Actor
-from baator.kernel import Layer
+from baator.kernel import Event, EventBus, Layer
 from baator.kernel.context import ContextProvider
 
 PROVENANCE_KEYS = ("actor_id", "layer", "source", "requester")
 
+# facet events that change what _project would return
+FACET_MUTATION_EVENTS = (
+    "physical.damage_taken", "physical.healed",
+    "cyber.integrity_damaged",
+    "mythic.invoked",
+)
+
 class ActorRepo:
     def get(self, actor_id: UUID) -> Actor | None: ...
 
+    def get_many(self, actor_ids: Iterable[UUID]) -> Dict[UUID, Actor]:
+        """Found actors by id; missing ids are left out. Stores override this with a bulk fetch."""
+        out: Dict[UUID, Actor] = {}
+        for aid in actor_ids:
+            actor = self.get(aid)
+            if actor is not None:
+                out[aid] = actor
+        return out
+
 def _as_uuid(v):
     try:
         return UUID(str(v))
     except (ValueError, TypeError):
         return None
+
+class ProjectionCache:
+    """
+    Bounded LRU of actor projections keyed by actor id and a per-actor version.
+    Facet mutation events bump the version, so an unchanged actor is projected
+    once and the (read-only) projection is shared by every resolve.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[UUID, Tuple[int, Mapping[str, Any]]]" = OrderedDict()
+        self._versions: Dict[UUID, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def version(self, actor_id: UUID) -> int:
+        return self._versions.get(actor_id, 0)
+
+    def bump(self, actor_id: UUID) -> None:
+        with self._lock:
+            self._versions[actor_id] = self._versions.get(actor_id, 0) + 1
+
+    def get(self, actor_id: UUID, build: Callable[[], Mapping[str, Any]]) -> Mapping[str, Any]:
+        return self.get_many((actor_id,), lambda ids: {actor_id: build()})[actor_id]
+
+    def get_many(self, actor_ids: Iterable[UUID],
+                 build_many: Callable[[List[UUID]], Mapping[UUID, Mapping[str, Any]]]) -> Dict[UUID, Mapping[str, Any]]:
+        """
+        Cached projections for `actor_ids`; all misses are built by a single
+        `build_many(missing)` call, so a repo can fetch them in one round trip.
+        """
+        out: Dict[UUID, Mapping[str, Any]] = {}
+        missing: Dict[UUID, int] = {}   # id -> version seen before building
+        with self._lock:
+            for aid in actor_ids:
+                ver = self._versions.get(aid, 0)
+                entry = self._entries.get(aid)
+                if entry is not None and entry[0] == ver:
+                    self._entries.move_to_end(aid)
+                    self.hits += 1
+                    out[aid] = entry[1]
+                elif aid not in missing:
+                    self.misses += 1
+                    missing[aid] = ver
+        if not missing:
+            return out
+        built = build_many(list(missing))   # outside the lock: may hit the repo
+        with self._lock:
+            for aid, ver in missing.items():
+                proj = built[aid]
+                out[aid] = proj
+                if self._versions.get(aid, 0) == ver:   # not bumped meanwhile
+                    self._entries[aid] = (ver, proj)
+                    self._entries.move_to_end(aid)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return out
+
+    def on_event(self, e: Event) -> None:
+        aid = _as_uuid(e.payload.get("actor_id"))
+        if aid is not None:
+            self.bump(aid)
+
+    def attach(self, bus: EventBus, names: Iterable[str] = FACET_MUTATION_EVENTS) -> None:
+        for name in names:
+            bus.subscribe(name, self.on_event)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hit_rate}
+
 class SimpleContextProvider(ContextProvider):
-    def __init__(self, repo: ActorRepo):
+    def __init__(self, repo: ActorRepo, cache: ProjectionCache | None = None):
         self.repo = repo
+        self.cache = cache
+
+    def actors(self, actor_ids: Iterable[UUID]) -> Dict[UUID, Mapping[str, Any]]:
+        """Projections for `actor_ids`, fetching every uncached actor in one repo.get_many."""
+        if self.cache is None:
+            return self._project_many(list(actor_ids))
+        return self.cache.get_many(actor_ids, self._project_many)
 
-    def resolve(self, meta: Mapping[str, Any] | None) -> Mapping[str, Any] | None:
+    def _project_many(self, actor_ids: List[UUID],
+                      fields: Mapping[UUID, AbstractSet[str] | None] | None = None) -> Dict[UUID, Mapping[str, Any]]:
+        found = self.repo.get_many(actor_ids)
+        return {aid: self._project(found.get(aid), None if fields is None else fields[aid])
+                for aid in actor_ids}
+
+    def resolve(self, meta: Mapping[str, Any] | None, *,
+                paths: AbstractSet[str] | None = None) -> Mapping[str, Any] | None:
+        """
+        `paths` (from sexpr.expression_paths) limits what is fetched: with
+        paths that never mention `target.*`, the target is not loaded, and
+        without a cache only the fields the paths name are projected.
+        Projections hold the values read here, not live actor state.
+        """
         if not meta:
             return None
+        roots = None if paths is None else _fields_by_root(paths)
         ctx: MutableMapping[str, Any] = {}
 
         # 1. Flatten prvenance keys
@@ -33,39 +151,75 @@ class SimpleContextProvider(ContextProvider):
         aid = _as_uuid(meta.get("actor_id"))
         tid = _as_uuid(meta.get("target_id"))
 
+        wanted = {}
         if aid:
-            ctx["actor"] = self._project(self.repo.get(UUID(str(aid))))
+            if roots is None or "actor" in roots:
+                wanted["actor"] = aid
             ctx["actor_id"] = str(aid)
         if tid:
-            ctx["target"] = self._project(self.repo.get(UUID(str(tid))))
+            if roots is None or "target" in roots:
+                wanted["target"] = tid
             ctx["target_id"] = str(tid)
+        if wanted:
+            if roots is None or self.cache is not None:
+                projected = self.actors(wanted.values())   # cached projections hold every field
+            else:
+                fields: Dict[UUID, AbstractSet[str] | None] = {}
+                for key, eid in wanted.items():
+                    have, need = fields.get(eid, frozenset()), roots[key]
+                    fields[eid] = None if have is None or need is None else have | need
+                projected = self._project_many(list(fields), fields)
+            for key, eid in wanted.items():
+                ctx[key] = projected[eid]
 
-        return dict(ctx) or None
+        return ctx or None
 
-    def _project(self, actor: Actor | None) -> Mapping[str, Any]:
-        # Map facets to the fields your rules reference
-        # Adjust to your actual facet structure
+    def _project(self, actor: Actor | None, fields: AbstractSet[str] | None = None) -> Mapping[str, Any]:
         if actor is None:
             raise ValueError("Cannot _project null Actor")
-        proj: dict[str, Any] = {"name": actor.name}
-        phys = actor.facets.get(Layer.PHYSICAL)  # e.g., Layer.PHYSICAL
-        cyber = actor.facets.get(Layer.CYBER) # Layer.CYBER
-        myth  = actor.facets.get(Layer.MYTHIC) # Layer.MYTHIC
-
-        if phys:
-            proj.update({
-                "hp": getattr(phys, "hp", 0),
-                "AC": getattr(phys, "ac", 10),
-                "stats": getattr(phys, "stats", {}),  # e.g., {"STR":2,"DEX":1,...}
-            })
-        if cyber:
-            proj.update({
-                "firewall": getattr(cyber, "firewall", 0),
-                "integrity": getattr(cyber, "integrity", 0),
-            })
-        if myth:
-            proj.update({
-                "wards": getattr(myth, "wards", 0),
-                "essence": getattr(myth, "essence", 0),
-            })
-        return proj
+        return project_actor(actor, fields)
+
+def _fields_by_root(paths: AbstractSet[str]) -> Dict[str, AbstractSet[str] | None]:
+    # "target.stats.STR" -> {"target": {"stats"}}; a bare "target" needs every field (None)
+    out: Dict[str, AbstractSet[str] | None] = {}
+    for path in paths:
+        root, _, rest = path.partition(".")
+        if not rest:
+            out[root] = None
+        elif out.get(root, frozenset()) is not None:
+            out[root] = out.get(root, frozenset()) | {rest.split(".", 1)[0]}
+    return out
+
+# projected key -> (facet layer, facet attribute, default); None layer = the actor itself.
+# A key exists only when its facet is attached.
+PROJECTION_FIELDS: Dict[str, Tuple[Layer | None, str, Any]] = {
+    "name":      (None,           "name",      ""),
+    "hp":        (Layer.PHYSICAL, "hp",        0),
+    "AC":        (Layer.PHYSICAL, "ac",        10),
+    "stats":     (Layer.PHYSICAL, "stats",     {}),   # e.g., {"STR":2,"DEX":1,...}
+    "firewall":  (Layer.CYBER,    "firewall",  0),
+    "integrity": (Layer.CYBER,    "integrity", 0),
+    "wards":     (Layer.MYTHIC,   "wards",     0),
+    "essence":   (Layer.MYTHIC,   "essence",   0),
+}
+
+def project_actor(actor: Actor, fields: AbstractSet[str] | None = None) -> Mapping[str, Any]:
+    """
+    Read-only rule view of an actor: the values of `fields` (default: every
+    field whose facet is attached), read now. Later facet writes do not show
+    through, so a projection cached, or carried in an event, keeps the state
+    it was resolved from. A facet no requested field lives on is not touched.
+    """
+    facets = actor.facets
+    out: Dict[str, Any] = {}
+    for key, (layer, attr, default) in PROJECTION_FIELDS.items():
+        if fields is not None and key not in fields:
+            continue
+        src: Any = actor if layer is None else facets.get(layer)
+        if src is None:
+            continue
+        val = getattr(src, attr, default)
+        if isinstance(val, dict):
+            val = MappingProxyType(dict(val))   # shared: keep it read-only
+        out[key] = val
+    return MappingProxyType(out)
@@ -0,0 +1,215 @@
+"""
+Priority scheduling for DiceService requests.
+
+Each request is put in a priority class from its `meta`:
+
+    meta["priority"]     class name ("interactive", "normal", "background")
+    meta["deadline_ms"]  most it may wait for a slot (tightens the class budget)
+
+A request waits until it is at the head of its class queue, its class is
+below `max_concurrency`, the scheduler is below `capacity`, and no
+higher-ranked class has a request that could run. So a DM's roll overtakes
+any backlog of simulation rolls.
+
+A request still waiting when its budget runs out is shed. With
+overload="reject" it fails with DiceOverloaded. With "degrade" it runs at
+once, outside the limits, and DiceService serves it from its fallback RNG
+instead of the shared one. A class queue longer than `max_queue` sheds new
+requests immediately.
+
+Per class, stats() reports counts, queue wait and service time (mean,
+p95, max).
+"""
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional
+import itertools
+import threading
+import time
+
+class DiceOverloaded(RuntimeError):
+    """A request was shed: it could not be scheduled within its wait budget."""
+
+@dataclass(slots=True, frozen=True)
+class PriorityClass:
+    name: str
+    rank: int                                  # lower is served first
+    max_concurrency: int
+    wait_budget_ms: Optional[float] = None     # None: wait as long as it takes
+    max_queue: Optional[int] = None
+    overload: str = "reject"                   # "reject" | "degrade"
+
+DEFAULT_CLASSES = (
+    PriorityClass("interactive", 0, max_concurrency=4),
+    PriorityClass("normal", 1, max_concurrency=4, wait_budget_ms=500.0),
+    PriorityClass("background", 2, max_concurrency=2, wait_budget_ms=100.0,
+                  max_queue=1000, overload="degrade"),
+)
+
+# queue-wait / service-time histogram buckets, upper bounds in ms
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+@dataclass(slots=True)
+class _Timing:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(BUCKETS_MS))
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile."""
+        seen, cut = 0, q * self.count
+        for bound, n in zip(BUCKETS_MS, self.buckets):
+            seen += n
+            if n and seen >= cut:
+                return min(bound, self.max_ms)
+        return 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {"mean_ms": self.total_ms / self.count if self.count else 0.0,
+                "p95_ms": self.quantile(0.95), "max_ms": self.max_ms}
+
+@dataclass(slots=True)
+class ClassStats:
+    submitted: int = 0
+    served: int = 0
+    degraded: int = 0
+    rejected: int = 0
+    running: int = 0
+    wait: _Timing = field(default_factory=_Timing)
+    service: _Timing = field(default_factory=_Timing)
+
+@dataclass(slots=True)
+class Admission:
+    cls: PriorityClass
+    wait_ms: float
+    degraded: bool = False
+
+class _Ticket:
+    __slots__ = ("cls", "seq")
+
+    def __init__(self, cls: PriorityClass, seq: int):
+        self.cls = cls
+        self.seq = seq
+
+class DiceScheduler:
+    def __init__(self, classes: Iterable[PriorityClass] = DEFAULT_CLASSES, *, capacity: int = 4,
+                 default: str = "normal"):
+        """`capacity` bounds requests in service at once across all classes (e.g. rngd connections)."""
+        self.classes: Dict[str, PriorityClass] = {c.name: c for c in classes}
+        if default not in self.classes:
+            raise ValueError(f"Unknown default class {default!r}")
+        self.default = default
+        self.capacity = capacity
+        self._ranked = sorted(self.classes.values(), key=lambda c: c.rank)
+        self._queues: Dict[str, Deque[_Ticket]] = {c: deque() for c in self.classes}
+        self._stats: Dict[str, ClassStats] = {c: ClassStats() for c in self.classes}
+        self._running = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.completed = 0
+
+    def classify(self, meta: Mapping[str, Any] | None) -> PriorityClass:
+        name = (meta or {}).get("priority") or self.default
+        cls = self.classes.get(str(name))
+        if cls is None:
+            raise ValueError(f"Unknown priority class {name!r}")
+        return cls
+
+    def _budget_ms(self, cls: PriorityClass, meta: Mapping[str, Any] | None) -> Optional[float]:
+        deadline = (meta or {}).get("deadline_ms")
+        if deadline is None:
+            return cls.wait_budget_ms
+        if cls.wait_budget_ms is None:
+            return float(deadline)
+        return min(float(deadline), cls.wait_budget_ms)
+
+    def _spare(self, cls: PriorityClass) -> bool:
+        return self._stats[cls.name].running < cls.max_concurrency
+
+    def _may_run(self, t: _Ticket) -> bool:
+        if self._running >= self.capacity:
+            return False
+        for cls in self._ranked:
+            q = self._queues[cls.name]
+            if cls is t.cls:
+                return q[0] is t and self._spare(cls)
+            if q and self._spare(cls):
+                return False      # a higher class can use the free slot
+        return False
+
+    @contextmanager
+    def slot(self, meta: Mapping[str, Any] | None = None) -> Iterator[Admission]:
+        """Hold a service slot for the body, after waiting in `meta`'s class."""
+        cls = self.classify(meta)
+        adm = self._admit(cls, self._budget_ms(cls, meta))
+        t0 = time.perf_counter()
+        try:
+            yield adm
+        finally:
+            service_ms = (time.perf_counter() - t0) * 1000.0
+            with self._cond:
+                st = self._stats[cls.name]
+                st.service.add(service_ms)
+                st.served += 1
+                self.completed += 1
+                if not adm.degraded:
+                    st.running -= 1
+                    self._running -= 1
+                    self._cond.notify_all()
+
+    def _admit(self, cls: PriorityClass, budget_ms: Optional[float]) -> Admission:
+        t0 = time.perf_counter()
+        give_up = None if budget_ms is None else t0 + budget_ms / 1000.0
+        with self._cond:
+            st = self._stats[cls.name]
+            st.submitted += 1
+            q = self._queues[cls.name]
+            if cls.max_queue is not None and len(q) >= cls.max_queue:
+                return self._shed(cls, 0.0)
+            ticket = _Ticket(cls, next(self._seq))
+            q.append(ticket)
+            while not self._may_run(ticket):
+                timeout = None if give_up is None else give_up - time.perf_counter()
+                if timeout is not None and timeout <= 0:
+                    q.remove(ticket)
+                    self._cond.notify_all()   # the head may have changed
+                    return self._shed(cls, (time.perf_counter() - t0) * 1000.0)
+                self._cond.wait(timeout)
+            q.popleft()
+            st.running += 1
+            self._running += 1
+            wait_ms = (time.perf_counter() - t0) * 1000.0
+            st.wait.add(wait_ms)
+            self._cond.notify_all()           # the next in line may be runnable too
+            return Admission(cls, wait_ms)
+
+    def _shed(self, cls: PriorityClass, waited_ms: float) -> Admission:
+        # caller holds self._cond
+        st = self._stats[cls.name]
+        st.wait.add(waited_ms)
+        if cls.overload == "degrade":
+            st.degraded += 1
+            return Admission(cls, waited_ms, degraded=True)
+        st.rejected += 1
+        raise DiceOverloaded(f"{cls.name} request shed after waiting {waited_ms:.1f} ms")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._cond:
+            return {name: {"submitted": st.submitted, "served": st.served,
+                           "degraded": st.degraded, "rejected": st.rejected,
+                           "queued": len(self._queues[name]), "running": st.running,
+                           "queue_wait": st.wait.summary(), "service": st.service.summary()}
+                    for name, st in self._stats.items()}
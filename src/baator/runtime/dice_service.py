@@ -1,13 +1,19 @@
 from __future__ import annotations
-import re
-from typing import Any, Dict, Mapping
+from typing import Any, Dict, Hashable, List, Mapping
 from uuid import uuid4
-from baator.kernel.context import ContextProvider
+import threading
+from baator.kernel.context import ContextProvider, RequestScope, overlay
 from baator.kernel import CommandBus, EventBus, Event, Command
 from baator.runtime import context_provider
 from ..kernel.rng import RNG
 from ..kernel.rolls import roll_expr
-from ..kernel.sexpr import parse_expression, eval_number
+from ..kernel.sexpr import parse_expression
+from ..kernel.session import EvalSession
+from ..kernel.result_cache import ResultCache
+from .dice_scheduler import DiceOverloaded, DiceScheduler
+
+# result events a deduplicated request replays (rng.requested is not: no new RNG work happens)
+REPLAYED_EVENTS = frozenset({"rng.fulfilled", "dice.resolved"})
 
 class DiceService:
     """
@@ -15,29 +21,74 @@ class DiceService:
       - rng.requested {expr|sides,type, request_id, meta}
       - rng.fulfilled {result, rolls?, request_id, meta}
       - rng.failed    {reason, request_id, meta}
+
+    With a `scheduler` (DiceScheduler), `handle` waits for a slot in the
+    request's priority class (meta["priority"], meta["deadline_ms"]) first.
+    Shed requests either fail (rng.failed, reason "overloaded", then
+    DiceOverloaded is raised) or are degraded: served at once from
+    `fallback_rng` (default: `rng`) so they stay off the shared generator.
+    Every `metrics_every` scheduled requests, dice.scheduler.metrics is
+    published with per-class counts, queue wait and service time.
+
+    With `results` (a ResultCache), requests are idempotent by the caller's
+    `request_id`: a retry of a request already served (or in flight)
+    does not roll again; the original rng.fulfilled / dice.resolved events
+    are published again instead. Requests without a request_id are never
+    deduplicated.
     """
-    def __init__(self, rng: RNG, bus: EventBus, cmd_bus: CommandBus, ctx_provider: ContextProvider, service_name: str = "dice") -> None:
+    def __init__(self, rng: RNG, bus: EventBus, cmd_bus: CommandBus, ctx_provider: ContextProvider, service_name: str = "dice",
+                 *, scheduler: DiceScheduler | None = None, fallback_rng: RNG | None = None,
+                 metrics_every: int = 1000, results: ResultCache | None = None) -> None:
         self.rng = rng
         self.bus = bus
         self.cmd = cmd_bus
         self._ctx_provider = ctx_provider
         self.service_name = service_name
+        self.scheduler = scheduler
+        self.fallback_rng = fallback_rng or rng
+        self.metrics_every = metrics_every
+        self.results = results
+        self.replays = 0
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+        self._local = threading.local()   # .events: result events of the request being served
 
-    def _resolver(self, request_id: str, expr: str, meta: Mapping[str, Any] | None = None) -> int:
-        ctx = self._ctx_provider.resolve(meta) or {}
-        self.bus.publish(Event("rng.requested", {"request_id": request_id, "kind": "expr", "expr": expr, **ctx}))
-        detail = roll_expr(expr, self.rng, ctx=ctx, verbose=True)
-        self.bus.publish(Event("rng.fulfilled", {"request_id": request_id, "kind": "expr", "expr": expr, **ctx, **detail}))
+    def _publish(self, event: Event) -> None:
+        rec = getattr(self._local, "events", None)
+        if rec is not None and event.name in REPLAYED_EVENTS:
+            rec.append(event)
+        self.bus.publish(event)
+
+    def _scope(self, request_id: str, meta: Mapping[str, Any] | None, scope: RequestScope | None) -> RequestScope:
+        return scope if scope is not None else RequestScope(request_id, meta)
+
+    def _roll(self, request_id: str, expr: str, ctx: Mapping[str, Any], session: EvalSession | None = None,
+              rng: RNG | None = None) -> int:
+        # payloads are layers over ctx: the context is shared by every event, never spread into it
+        requested = overlay(ctx, {"request_id": request_id, "kind": "expr", "expr": expr}, "request")
+        self._publish(Event("rng.requested", requested))
+        detail = roll_expr(expr, rng or self.rng, ctx=ctx, verbose=True, session=session)
+        self._publish(Event("rng.fulfilled", overlay(requested, detail, "roll")))
         return int(detail["result"])
 
-    def roll_expression(self, request_id: str, expr: str, *, meta: dict | None = None) -> int:
-        return self._resolver(request_id, expr, meta)
+    def roll_expression(self, request_id: str, expr: str, *, meta: dict | None = None,
+                        scope: RequestScope | None = None, rng: RNG | None = None) -> int:
+        scope = self._scope(request_id, meta, scope)
+        return self._roll(request_id, expr, scope.context(self._ctx_provider), scope.session, rng)
 
-    def resolve_number(self, request_id: str, expr: str, *, meta: dict | None = None):
-        ctx = self._ctx_provider.resolve(meta) or {}
+    def resolve_number(self, request_id: str, expr: str, *, meta: dict | None = None,
+                       scope: RequestScope | None = None, rng: RNG | None = None):
+        # context is resolved once here; an expression with dice is one RNG
+        # request however many dice terms it has
+        scope = self._scope(request_id, meta, scope)
+        ctx = scope.context(self._ctx_provider)
         parsed = parse_expression(expr)
-        val = eval_number(request_id, parsed, ctx, resolve_dice=self._resolver)
-        self.bus.publish(Event("dice.resolved", {"request_id": request_id, "expr": expr, "result": val, **(ctx or {})}))
+        if parsed.has_dice:
+            val = self._roll(request_id, expr, ctx, scope.session, rng)
+        else:
+            val = parsed.number(ctx, session=scope.session, memo=True)
+        self._publish(Event("dice.resolved", overlay(ctx, {"request_id": request_id, "expr": expr,
+                                                           "result": val}, "request")))
 
     def handle(self, cmd: Command) -> None:
         """
@@ -45,15 +96,71 @@ class DiceService:
           - dice.roll_expr   payload: {expr, meta?}
           - dice.roll_adv    payload: {sides, meta?}
           - dice.roll_dis    payload: {sides, meta?}
+        An optional `scope` (RequestScope) shares one resolved context across
+        requests; otherwise one is made from `meta` with `ctx` overlaid.
         """
         p = cmd.payload
+        if cmd.name not in ("dice.roll_expression", "dice.resolve_number"):
+            raise KeyError(cmd.name)
+        if self.results is None or not p.get("request_id"):
+            self._handle(cmd.name, p)
+            return
+        key = (cmd.name, str(p["request_id"]), str(p["expr"]))
+        if not self._claim(key):
+            return
+        self._local.events = events = []
+        try:
+            self._handle(cmd.name, p)
+            self.results.put(key, events)   # only once served; failures may be retried
+        finally:
+            self._local.events = None
+            with self._inflight_lock:
+                self._inflight.pop(key).set()
+
+    def _claim(self, key: Hashable) -> bool:
+        """True: serve the request. False: it was served already and has been replayed."""
+        while True:
+            with self._inflight_lock:
+                running = self._inflight.get(key)
+                if running is None:
+                    done: List[Event] | None = self.results.get(key)
+                    if done is None:
+                        self._inflight[key] = threading.Event()
+                        return True
+            if running is None:
+                self.replays += 1
+                self.bus.publish_batch(done)
+                return False
+            running.wait()   # the first attempt is still rolling; then look again
+
+    def _handle(self, name: str, p: Mapping[str, Any]) -> None:
         meta = p.get("meta") or {}
         request_id = p.get("request_id") or str(uuid4())
-        if cmd.name == "dice.roll_expression":
-            expr = str(p["expr"])
-            self.roll_expression(request_id, expr, meta=meta)
-        elif cmd.name == "dice.resolve_number":
-            expr = str(p["expr"])
-            self.resolve_number(request_id, expr, meta=meta)
+        scope = p.get("scope") or RequestScope(request_id, meta, base=p.get("ctx"))
+        if self.scheduler is None:
+            self._serve(name, request_id, str(p["expr"]), scope, None)
+            return
+        try:
+            with self.scheduler.slot(meta) as adm:
+                self._serve(name, request_id, str(p["expr"]), scope,
+                            self.fallback_rng if adm.degraded else None)
+        except DiceOverloaded as e:
+            self.bus.publish(Event("rng.failed", {"request_id": request_id, "reason": "overloaded",
+                                                  "error": str(e), "meta": dict(meta)}))
+            raise
+        if self.metrics_every and self.scheduler.completed % self.metrics_every == 0:
+            self.publish_metrics()
+
+    def _serve(self, name: str, request_id: str, expr: str, scope: RequestScope, rng: RNG | None) -> None:
+        if name == "dice.roll_expression":
+            self.roll_expression(request_id, expr, scope=scope, rng=rng)
         else:
-            raise KeyError(cmd.name)
+            self.resolve_number(request_id, expr, scope=scope, rng=rng)
+
+    def publish_metrics(self) -> None:
+        if self.scheduler is not None:
+            self.bus.publish(Event("dice.scheduler.metrics", {"service": self.service_name,
+                                                              "classes": self.scheduler.stats()}))
+        if self.results is not None:
+            self.bus.publish(Event("dice.dedupe.metrics", {"service": self.service_name,
+                                                           "replays": self.replays, **self.results.stats()}))
@@ -0,0 +1,272 @@
+"""
+Monte Carlo encounter runs across a process pool.
+
+`runs` encounters are cut into fixed-size shards. Shard i plays its fights
+with PythonRNG(shard_seed(seed, i)), so every shard is an independent,
+reproducible stream and the result depends only on (seed, runs,
+shard_size), never on worker count or completion order. Workers send back
+an EncounterStats (counts and histograms, a few KB), not events; the
+parent merges them as they arrive.
+
+    roster = Roster((Combatant("Hero", "party", hp=30, stats={"STR": 3}),
+                     Combatant("Drone", "drones", hp=12, ac=11),
+                     Combatant("Drone 2", "drones", hp=12, ac=11)))
+    stats = run_monte_carlo(roster, FocusFire("physical.attack.basic",
+                                              actor_stats=roster.ctx, target_stats=roster.ctx),
+                            runs=100_000, seed=7)
+    stats.win_rate("party"), stats.win_rate_ci("party")
+
+`setup` and `policy` are pickled to the workers: use module-level
+functions, bound methods or plain objects, not lambdas. `policy` is either
+a TurnPolicy or a callable taking the shard's RNG and returning one.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+import hashlib
+import math
+import os
+
+from baator.domain import Actor, Participant, Scene
+from baator.domain.facets import PhysicalFacet
+from baator.interface import InMemoryActorRepo, PythonRNG
+from baator.kernel import CommandBus, EventBus
+from baator.kernel.rng import RNG
+from .context_provider import SimpleContextProvider
+from .dice_service import DiceService
+from .policies import TurnPolicy
+from .rules_engine import RulesEngine
+from .rules_loader import RulesRegistry, load_rule_packs
+from .simulator import EncounterReport, Simulator
+
+Setup = Callable[[RNG], Tuple[Scene, Iterable[Actor]]]
+
+def shard_seed(seed: int, shard: int) -> int:
+    """64-bit seed for one shard, decorrelated from its neighbours."""
+    h = hashlib.blake2b(f"{seed}:{shard}".encode(), digest_size=8)
+    return int.from_bytes(h.digest(), "little")
+
+# ---- statistics -------------------------------------------------------------------
+
+def _bump(hist: Dict[int, int], key: int, n: int = 1) -> None:
+    hist[key] = hist.get(key, 0) + n
+
+def _merge_hist(into: Dict[int, int], other: Mapping[int, int]) -> None:
+    for k, n in other.items():
+        _bump(into, k, n)
+
+def wilson_interval(k: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for k successes in n trials (z=1.96: 95%)."""
+    if n == 0:
+        return (0.0, 1.0)
+    p = k / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return (max(0.0, centre - half), min(1.0, centre + half))
+
+def _quantile(hist: Mapping[int, int], q: float) -> int:
+    total = sum(hist.values())
+    if not total:
+        return 0
+    seen, cut = 0, q * total
+    for k in sorted(hist):
+        seen += hist[k]
+        if seen >= cut:
+            return k
+    return max(hist)
+
+@dataclass(slots=True)
+class EncounterStats:
+    """Mergeable aggregate of many encounters."""
+    runs: int = 0
+    wins: Dict[str, int] = field(default_factory=dict)      # side -> encounters it won
+    undecided: int = 0                                      # hit max_rounds
+    rounds: Dict[int, int] = field(default_factory=dict)    # rounds -> encounters
+    damage: Dict[str, Dict[int, int]] = field(default_factory=dict)   # side -> damage taken -> encounters
+    turns: int = 0
+    actions: int = 0
+    elapsed_s: float = 0.0                                  # summed worker time
+
+    def add(self, report: EncounterReport, damage_taken: Mapping[str, int]) -> None:
+        self.runs += 1
+        if report.outcome == "decided" and len(report.winners) == 1:
+            side = report.winners[0]
+            self.wins[side] = self.wins.get(side, 0) + 1
+        elif report.outcome == "max_rounds":
+            self.undecided += 1
+        _bump(self.rounds, report.rounds)
+        for side, dmg in damage_taken.items():
+            _bump(self.damage.setdefault(side, {}), dmg)
+        self.turns += report.turns
+        self.actions += report.actions
+        self.elapsed_s += report.elapsed_s
+
+    def merge(self, other: "EncounterStats") -> "EncounterStats":
+        self.runs += other.runs
+        for side, n in other.wins.items():
+            self.wins[side] = self.wins.get(side, 0) + n
+        self.undecided += other.undecided
+        _merge_hist(self.rounds, other.rounds)
+        for side, hist in other.damage.items():
+            _merge_hist(self.damage.setdefault(side, {}), hist)
+        self.turns += other.turns
+        self.actions += other.actions
+        self.elapsed_s += other.elapsed_s
+        return self
+
+    def win_rate(self, side: str) -> float:
+        return self.wins.get(side, 0) / self.runs if self.runs else 0.0
+
+    def win_rate_ci(self, side: str, z: float = 1.96) -> Tuple[float, float]:
+        return wilson_interval(self.wins.get(side, 0), self.runs, z)
+
+    @property
+    def mean_rounds(self) -> float:
+        return sum(k * n for k, n in self.rounds.items()) / self.runs if self.runs else 0.0
+
+    def rounds_quantile(self, q: float) -> int:
+        return _quantile(self.rounds, q)
+
+    def mean_damage(self, side: str) -> float:
+        hist = self.damage.get(side, {})
+        n = sum(hist.values())
+        return sum(k * c for k, c in hist.items()) / n if n else 0.0
+
+    def damage_quantile(self, side: str, q: float) -> int:
+        return _quantile(self.damage.get(side, {}), q)
+
+    @property
+    def turns_per_sec(self) -> float:
+        return self.turns / self.elapsed_s if self.elapsed_s else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {"runs": self.runs, "undecided": self.undecided,
+                "win_rate": {s: self.win_rate(s) for s in sorted(self.wins)},
+                "win_rate_ci95": {s: self.win_rate_ci(s) for s in sorted(self.wins)},
+                "mean_rounds": self.mean_rounds,
+                "rounds_p50_p95": (self.rounds_quantile(0.5), self.rounds_quantile(0.95)),
+                "mean_damage_taken": {s: self.mean_damage(s) for s in sorted(self.damage)},
+                "turns_per_sec": self.turns_per_sec}
+
+# ---- encounter setup ----------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Combatant:
+    name: str
+    team: str
+    hp: int = 10
+    ac: int = 10
+    init_bonus: int = 0
+    stats: Mapping[str, int] = field(default_factory=dict)
+
+@dataclass(frozen=True, slots=True)
+class Roster:
+    """
+    A picklable `setup`: fresh actors each fight, initiative 1d20 + bonus.
+    `ctx` gives policies the AC and stats the physical facet does not carry.
+    """
+    combatants: Tuple[Combatant, ...]
+    scene_id: str = "mc"
+
+    def __call__(self, rng: RNG) -> Tuple[Scene, List[Actor]]:
+        parts, actors = [], []
+        for c in self.combatants:
+            # ids from the shard's stream too, so a replay is identical
+            a = Actor(id=UUID(int=rng.random_int(0, (1 << 128) - 1), version=4), name=c.name)
+            a.attach_facet(PhysicalFacet(hp=c.hp))
+            actors.append(a)
+            parts.append(Participant(a.id, c.name, rng.roll(20) + c.init_bonus, hp=c.hp, team=c.team))
+        return Scene(self.scene_id, parts), actors
+
+    def ctx(self, p: Participant) -> Dict[str, Any]:
+        for c in self.combatants:
+            if c.name == p.name:
+                return {"AC": c.ac, "stats": dict(c.stats)}
+        return {}
+
+# ---- shards -----------------------------------------------------------------------
+
+_REGISTRIES: Dict[str, RulesRegistry] = {}   # per worker process: packs dir -> registry
+
+def _registry(packs: str) -> RulesRegistry:
+    reg = _REGISTRIES.get(packs)
+    if reg is None:
+        reg = _REGISTRIES[packs] = load_rule_packs(packs, workers=1).registry
+    return reg
+
+def _side(p: Participant) -> str:
+    return p.team or p.name
+
+@dataclass(frozen=True, slots=True)
+class _Shard:
+    index: int
+    seed: int
+    runs: int
+    setup: Setup
+    policy: Any
+    packs: str
+    max_rounds: int
+    short_circuit: bool = False
+
+def run_shard(job: _Shard) -> EncounterStats:
+    """Play one shard's encounters on one wiring (buses, dice, repo) and aggregate."""
+    rng = PythonRNG(job.seed)
+    policy: TurnPolicy = job.policy if hasattr(job.policy, "choose") else job.policy(rng)
+    repo = InMemoryActorRepo()
+    bus, cmd = EventBus(sync=True), CommandBus()
+    dice = DiceService(rng, bus, cmd, SimpleContextProvider(repo))
+    cmd.register("dice.resolve_number", dice.handle)
+    cmd.register("dice.roll_expression", dice.handle)
+    sim = Simulator(_registry(job.packs), RulesEngine(cmd, bus, short_circuit=job.short_circuit), cmd, bus,
+                    actors=repo)
+    cmd.register("physical.take_damage", sim.take_damage)
+
+    stats = EncounterStats()
+    previous: List[UUID] = []
+    for _ in range(job.runs):
+        scene, actors = job.setup(rng)
+        for aid in previous:
+            repo.remove(aid)
+        actors = list(actors)
+        repo.add_many(actors)
+        previous = [a.id for a in actors]
+        start = {p.actor_id: p.hp for p in scene.order()}
+        report = sim.run_encounter(scene, policy, max_rounds=job.max_rounds)
+        taken: Dict[str, int] = {}
+        for p in scene.order():
+            taken[_side(p)] = taken.get(_side(p), 0) + start[p.actor_id] - p.hp
+        stats.add(report, taken)
+    return stats
+
+def run_monte_carlo(setup: Setup, policy: Any, runs: int, *, seed: int = 0,
+                    shard_size: int = 500, workers: Optional[int] = None,
+                    packs: str = "packs", max_rounds: int = 100, short_circuit: bool = False,
+                    on_shard: Callable[[EncounterStats], None] | None = None) -> EncounterStats:
+    """
+    Play `runs` encounters and return the merged statistics. `workers`
+    defaults to the CPU count; 0 or 1 runs the shards in this process (same
+    result). `on_shard` sees the running total after each shard lands.
+    `short_circuit` skips rolls whose outcome is already settled (see
+    RulesEngine): same distribution, fewer RNG draws, so a given seed plays
+    out differently than without it.
+    """
+    jobs = [_Shard(i, shard_seed(seed, i), min(shard_size, runs - start), setup, policy,
+                   str(packs), max_rounds, short_circuit)
+            for i, start in enumerate(range(0, runs, shard_size))]
+    total = EncounterStats()
+    n = min(workers if workers is not None else (os.cpu_count() or 1), len(jobs))
+    if n <= 1:
+        for job in jobs:
+            total.merge(run_shard(job))
+            if on_shard is not None:
+                on_shard(total)
+        return total
+    with ProcessPoolExecutor(max_workers=n) as pool:
+        for fut in as_completed([pool.submit(run_shard, job) for job in jobs]):
+            total.merge(fut.result())   # counts only, so merge order does not matter
+            if on_shard is not None:
+                on_shard(total)
+    return total
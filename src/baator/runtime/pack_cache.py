@@ -0,0 +1,125 @@
+"""
+Binary cache of validated rule packs.
+
+Each cache file holds one RulePack, keyed by the SHA-256 of its YAML source
+and the engine version:
+
+    MAGIC | u32 header length | JSON header | pickled RulePack
+
+Files live next to the YAML (`.<name>.rpk`) or in `cache_dir`. A cache file
+whose stored mtime/size still match the source is trusted as-is; otherwise the
+source is hashed and the pack rebuilt if the hash changed. Only point
+`cache_dir` at a directory you control: cache files are unpickled.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import hashlib
+import json
+import os
+import pathlib
+import pickle
+import struct
+import tempfile
+import time
+
+from .rules_loader import ENGINE_VERSION, RulePack, parse_rule_pack
+
+CACHE_FORMAT = 2   # bump when pickled class layouts change
+MAGIC = b"BAATORPK"
+_HDR_LEN = struct.Struct("<I")
+
+@dataclass
+class PackLoad:
+    path: str
+    cached: bool         # served from the cache (warm) vs parsed from YAML (cold)
+    elapsed_ms: float
+
+@dataclass
+class PackCache:
+    cache_dir: pathlib.Path | None = None
+    loads: List[PackLoad] = field(default_factory=list)
+
+    def cache_path(self, src: str | pathlib.Path) -> pathlib.Path:
+        src = pathlib.Path(src)
+        if self.cache_dir is None:
+            return src.with_name(f".{src.name}.rpk")
+        # keep same-named packs from different dirs apart
+        tag = hashlib.sha256(str(src.resolve()).encode()).hexdigest()[:12]
+        return pathlib.Path(self.cache_dir) / f"{src.stem}.{tag}.rpk"
+
+    def load(self, path: str | pathlib.Path) -> RulePack:
+        """Return the pack at `path`, from the cache when still valid."""
+        t0 = time.perf_counter()
+        src = pathlib.Path(path)
+        st = src.stat()
+        cpath = self.cache_path(src)
+
+        hdr, blob = _read(cpath)
+        pack: RulePack | None = None
+        if hdr is not None and hdr.get("mtime_ns") == st.st_mtime_ns and hdr.get("size") == st.st_size:
+            pack = _unpickle(blob)
+        if pack is None:
+            source = src.read_bytes()
+            digest = hashlib.sha256(source).hexdigest()
+            if hdr is not None and hdr.get("sha256") == digest:
+                pack = _unpickle(blob)
+            if pack is None:
+                pack = parse_rule_pack(source)
+                blob = pickle.dumps(pack, protocol=pickle.HIGHEST_PROTOCOL)
+                hdr = None
+            # (re)write: new pack, or unchanged content with a new mtime
+            _write(cpath, _header(digest, st), blob)
+
+        self.loads.append(PackLoad(str(src), hdr is not None, (time.perf_counter() - t0) * 1000.0))
+        return pack
+
+    def report(self) -> Dict[str, Any]:
+        """Cold (parsed) vs warm (cached) load counts and timings in ms."""
+        out: Dict[str, Any] = {}
+        for label, cached in (("cold", False), ("warm", True)):
+            ts = [l.elapsed_ms for l in self.loads if l.cached is cached]
+            out[label] = {"count": len(ts), "total_ms": sum(ts),
+                          "avg_ms": (sum(ts) / len(ts)) if ts else 0.0}
+        return out
+
+def _header(digest: str, st: os.stat_result) -> Dict[str, Any]:
+    return {"format": CACHE_FORMAT, "engine": ENGINE_VERSION, "sha256": digest,
+            "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+def _unpickle(blob: bytes) -> RulePack | None:
+    try:
+        pack = pickle.loads(blob)
+    except Exception:
+        return None   # stale class layout, truncated file, ...
+    return pack if isinstance(pack, RulePack) else None
+
+def _read(cpath: pathlib.Path) -> tuple[Dict[str, Any] | None, bytes]:
+    try:
+        raw = cpath.read_bytes()
+    except OSError:
+        return None, b""
+    if not raw.startswith(MAGIC):
+        return None, b""
+    try:
+        off = len(MAGIC)
+        (n,) = _HDR_LEN.unpack_from(raw, off)
+        off += _HDR_LEN.size
+        hdr = json.loads(raw[off:off + n])
+    except (struct.error, ValueError):
+        return None, b""
+    if not isinstance(hdr, dict) or hdr.get("format") != CACHE_FORMAT or hdr.get("engine") != ENGINE_VERSION:
+        return None, b""
+    return hdr, raw[off + n:]
+
+def _write(cpath: pathlib.Path, hdr: Dict[str, Any], blob: bytes) -> None:
+    head = json.dumps(hdr, sort_keys=True).encode()
+    data = MAGIC + _HDR_LEN.pack(len(head)) + head + blob
+    try:
+        cpath.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cpath.parent, prefix=cpath.name, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, cpath)   # atomic: readers see old or new, never half
+    except OSError:
+        pass  # read-only tree etc.: caching is best-effort
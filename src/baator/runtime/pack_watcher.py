@@ -0,0 +1,152 @@
+"""
+Polling hot-reload of rule packs.
+
+Each poll stats the watched files (and globs the watched directories for new
+ones); only files whose mtime/size changed are reparsed, and the registry
+swaps in the new rules via RulesRegistry.replace_pack, which keeps unchanged
+Rule objects. Publishes:
+  - rules.pack_loaded        first time a file is seen
+  - rules.pack_reloaded      on change or deletion
+        both {path, pack_id, namespace?, added, changed, removed, unchanged, elapsed_ms}
+  - rules.pack_reload_failed {path, error}
+"""
+from __future__ import annotations
+from dataclasses import asdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import pathlib
+import threading
+import time
+
+from baator.kernel import Event, EventBus
+from .rules_loader import PACK_PATTERNS, PackDiff, PackLoadReport, RulePack, RulesRegistry, load_rule_pack
+
+Loader = Callable[[pathlib.Path], RulePack]
+
+class PackWatcher:
+    def __init__(self, registry: RulesRegistry, paths: Iterable[str | pathlib.Path],
+                 bus: Optional[EventBus] = None, *, interval: float = 1.0,
+                 loader: Loader = load_rule_pack, patterns: Tuple[str, ...] = PACK_PATTERNS):
+        self.registry = registry
+        self.bus = bus
+        self.interval = interval
+        self.loader = loader
+        self.patterns = patterns
+        self._roots = [pathlib.Path(p) for p in paths]
+        self._seen: Dict[pathlib.Path, Tuple[int, int]] = {}   # path -> (mtime_ns, size)
+        self._packs: Dict[pathlib.Path, str] = {}              # path -> pack_id
+        self._ignored: Set[pathlib.Path] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _files(self) -> List[pathlib.Path]:
+        out: List[pathlib.Path] = []
+        for root in self._roots:
+            if root.is_dir():
+                out.extend(sorted({p for pat in self.patterns for p in root.rglob(pat)}))
+            else:
+                out.append(root)
+        return [p for p in out if p not in self._ignored]
+
+    def track(self, path: str | pathlib.Path, pack_id: Optional[str] = None) -> None:
+        """
+        Adopt a file already handled elsewhere (e.g. by load_rule_packs) so it
+        is only reparsed once it changes; pass pack_id if it was registered.
+        """
+        path = pathlib.Path(path)
+        st = path.stat()
+        self._seen[path] = (st.st_mtime_ns, st.st_size)
+        if pack_id is not None:
+            self._packs[path] = pack_id
+
+    def ignore(self, path: str | pathlib.Path) -> None:
+        """Never reload `path`, e.g. a file whose pack another file supersedes."""
+        path = pathlib.Path(path)
+        self._ignored.add(path)
+        self._seen.pop(path, None)
+
+    def adopt(self, report: PackLoadReport) -> None:
+        """
+        Track the files of a load_rule_packs report: loaded ones as their
+        pack, failed ones so they are retried once edited. Superseded and
+        collision files are ignored, so editing one cannot override the
+        loader's pick for that pack_id or rule key.
+        """
+        for f in report.files:
+            if f.status in ("superseded", "collision"):
+                self.ignore(f.path)
+            else:
+                self.track(f.path, f.pack_id if f.status == "ok" else None)
+
+    def poll(self) -> List[PackDiff]:
+        """One sweep: reload changed files, drop deleted ones."""
+        diffs: List[PackDiff] = []
+        files = self._files()
+        for path in files:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            sig = (st.st_mtime_ns, st.st_size)
+            if self._seen.get(path) == sig:
+                continue
+            self._seen[path] = sig
+            diff = self._reload(path)
+            if diff is not None:
+                diffs.append(diff)
+
+        for path in [p for p in self._seen if p not in files or not p.exists()]:
+            del self._seen[path]
+            pack_id = self._packs.pop(path, None)
+            if pack_id is not None:
+                diff = self.registry.remove_pack(pack_id)
+                diffs.append(diff)
+                self._publish("rules.pack_reloaded", {"path": str(path), "pack_id": pack_id,
+                                                      **_diff_payload(diff), "elapsed_ms": 0.0})
+        return diffs
+
+    def _reload(self, path: pathlib.Path) -> PackDiff | None:
+        t0 = time.perf_counter()
+        try:
+            pack = self.loader(path)
+            prev = self._packs.get(path)
+            # a file that now holds a different pack drops the old one in the same swap
+            diff = self.registry.replace_pack(pack, replaces=prev if prev != pack.pack_id else None)
+        except Exception as e:
+            # keep serving the previous version of this pack
+            self._publish("rules.pack_reload_failed", {"path": str(path), "error": str(e)})
+            return None
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        first = path not in self._packs
+        self._packs[path] = pack.pack_id
+        self._publish("rules.pack_loaded" if first else "rules.pack_reloaded", {
+            "path": str(path), "pack_id": pack.pack_id, "namespace": pack.namespace,
+            **_diff_payload(diff), "elapsed_ms": elapsed_ms,
+        })
+        return diff
+
+    def _publish(self, name: str, payload: dict) -> None:
+        if self.bus is not None:
+            self.bus.publish(Event(name=name, payload=payload))
+
+    # ---- background polling ------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        def loop():
+            while not self._stop.wait(self.interval):
+                self.poll()
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+def _diff_payload(diff: PackDiff) -> dict:
+    d = asdict(diff)
+    d.pop("pack_id")
+    return d
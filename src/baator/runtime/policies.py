@@ -0,0 +1,91 @@
+"""
+Turn policies for headless encounters (Simulator.run_encounter).
+
+A policy picks what the current participant does: a rule key, a target and
+any extra context the rule reads (stats, AC, ...). Returning None passes the
+turn. Policies only read the scene; damage comes back through the rule's
+effects.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Protocol
+
+from baator.domain import Participant, Scene
+from baator.kernel.rng import RNG
+
+@dataclass(slots=True)
+class TurnChoice:
+    rule: str
+    target: Optional[Participant] = None
+    ctx: Dict[str, Any] = field(default_factory=dict)   # merged over the participant context
+
+class TurnPolicy(Protocol):
+    def choose(self, scene: Scene, actor: Participant) -> Optional[TurnChoice]: ...
+
+def hostile(a: Participant, b: Participant) -> bool:
+    """Different teams, or both unaligned and not the same participant."""
+    if a.team or b.team:
+        return a.team != b.team
+    return a.actor_id != b.actor_id
+
+def enemies(scene: Scene, actor: Participant) -> List[Participant]:
+    """Living opponents of `actor`, in turn order."""
+    return [p for p in scene.order() if p.hp > 0 and hostile(actor, p)]
+
+def standing(scene: Scene) -> List[str]:
+    """Sides with a living member: team names, or names of unaligned participants."""
+    sides = dict.fromkeys(p.team or p.name for p in scene.order() if p.hp > 0)
+    return list(sides)
+
+def last_team_standing(scene: Scene) -> bool:
+    return len(standing(scene)) <= 1
+
+StatsFor = Callable[[Participant], Mapping[str, Any]]
+
+def _no_stats(_: Participant) -> Mapping[str, Any]:
+    return {}
+
+class _Attack(ABC):
+    """Shared shape: one rule, stats looked up per participant."""
+    def __init__(self, rule: str, *, actor_stats: StatsFor = _no_stats,
+                 target_stats: StatsFor = _no_stats):
+        self.rule = rule
+        self.actor_stats = actor_stats
+        self.target_stats = target_stats
+
+    @abstractmethod
+    def pick(self, scene: Scene, actor: Participant, foes: List[Participant]) -> Participant:
+        """The foe to attack; `foes` is never empty."""
+
+    def choose(self, scene: Scene, actor: Participant) -> Optional[TurnChoice]:
+        foes = enemies(scene, actor)
+        if not foes:
+            return None
+        target = self.pick(scene, actor, foes)
+        return TurnChoice(self.rule, target, {"actor": dict(self.actor_stats(actor)),
+                                              "target": dict(self.target_stats(target))})
+
+class FocusFire(_Attack):
+    """Attack the weakest living enemy (lowest hp, then turn order)."""
+    def pick(self, scene: Scene, actor: Participant, foes: List[Participant]) -> Participant:
+        return min(foes, key=lambda p: p.hp)
+
+class RandomTarget(_Attack):
+    """Attack a living enemy chosen with `rng`."""
+    def __init__(self, rule: str, rng: RNG, **kw: Any):
+        super().__init__(rule, **kw)
+        self.rng = rng
+
+    def pick(self, scene: Scene, actor: Participant, foes: List[Participant]) -> Participant:
+        return foes[self.rng.random_int(0, len(foes) - 1)]
+
+class ByTeam:
+    """Delegate to a policy per team, falling back to `default` (or passing)."""
+    def __init__(self, policies: Mapping[str, TurnPolicy], default: TurnPolicy | None = None):
+        self.policies = dict(policies)
+        self.default = default
+
+    def choose(self, scene: Scene, actor: Participant) -> Optional[TurnChoice]:
+        policy = self.policies.get(actor.team, self.default)
+        return policy.choose(scene, actor) if policy is not None else None
@@ -1,20 +1,50 @@
 # baator/runtime/rules_engine.py
 from __future__ import annotations
-from typing import Any, Dict, Mapping
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
 from uuid import uuid4
 
 from baator.kernel import Command, CommandBus, Event, EventBus
 from baator.runtime import Effect, Rule
 from ..kernel.rolls import eval_safe  # predicates only
+from ..kernel.context import LayeredContext, RequestScope
+from ..kernel.exprlang import Bounds, compile_expr
+from ..kernel.session import EvalSession
+from ..kernel.sexpr import expression_paths
+
+def _strings(obj: Any) -> Iterable[str]:
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values(): yield from _strings(v)
+    elif isinstance(obj, list):
+        for v in obj: yield from _strings(v)
+
+def rule_paths(rule: Rule) -> FrozenSet[str]:
+    """Context paths read through DiceService: cost, dc, roll and success payloads."""
+    exprs = [str(x) for x in (rule.cost, rule.dc, rule.roll) if x not in (None, "")]
+    for eff in rule.on_success:
+        exprs.extend(_strings(eff.payload))
+    return frozenset().union(*(expression_paths(e) for e in exprs))
 
 class RulesEngine:
-    def __init__(self, cmd_bus: CommandBus, evt_bus: EventBus):
+    """
+    With `short_circuit`, a roll whose outcome is already settled (the
+    bounds of roll and dc, over the caller's ctx, cannot overlap: 1d20+5
+    against dc 5) is not resolved at all: no dice request, no RNG round
+    trip. Its result and trace carry short_circuit=True, roll None and the
+    bounds instead. Off by default, since a seeded run then draws fewer
+    numbers than one without it.
+    """
+    def __init__(self, cmd_bus: CommandBus, evt_bus: EventBus, *, short_circuit: bool = False):
         self.cmd = cmd_bus
         self.bus = evt_bus
+        self.short_circuit = short_circuit
+        self.short_circuits = 0
 
     # ---- request/response via buses ---------------------------------------
 
-    def _resolve_number(self, expr: str, *, ctx: Mapping[str, Any], provenance: Dict[str, Any]) -> int:
+    def _resolve_number(self, expr: str, *, ctx: Mapping[str, Any], provenance: Dict[str, Any],
+                        scope: RequestScope | None = None) -> int:
         """Resolve either dice (1d20+STR) or numeric/path (target.AC) via DiceService."""
         req_id = str(uuid4())
         box: Dict[str, int] = {}
@@ -28,26 +58,47 @@ class RulesEngine:
         try:
             self.cmd.dispatch(Command(
                 name="dice.resolve_number",
-                payload={"expr": expr, "ctx": ctx, "meta": provenance, "request_id": req_id},
+                payload={"expr": expr, "ctx": ctx, "meta": provenance, "request_id": req_id,
+                         "scope": scope},
             ))
             if "val" not in box:  # sync bus should fill immediately
                 raise RuntimeError(f"dice.resolve_number did not resolve for {expr!r}")
             return box["val"]
         finally:
-            # prefer to clean up if your EventBus implements unsubscribe
-            if hasattr(self.bus, "unsubscribe"):
-                self.bus.unsubscribe("dice.resolved", on_res)  # type: ignore[attr-defined]
+            self.bus.unsubscribe("dice.resolved", on_res)
 
     # ---- helpers -----------------------------------------------------------
 
+    @staticmethod
+    def _bounds(expr: Any, ctx: Mapping[str, Any], session: EvalSession) -> Optional[Bounds]:
+        try:
+            return compile_expr(str(expr)).bounds(ctx, session=session)
+        except ValueError:
+            return None
+
+    def _settled(self, rule: Rule, ctx: Mapping[str, Any],
+                 session: EvalSession) -> Optional[Tuple[bool, Bounds, Bounds]]:
+        """(success, roll bounds, dc bounds) when the roll cannot change the outcome."""
+        dc_b = self._bounds(rule.dc, ctx, session)
+        roll_b = None if dc_b is None else self._bounds(rule.roll, ctx, session)
+        if roll_b is None:
+            return None
+        if roll_b[0] >= dc_b[1]:
+            return True, roll_b, dc_b
+        if roll_b[1] < dc_b[0]:
+            return False, roll_b, dc_b
+        return None
+
     def _emit(self, eff: Effect, provenance: Dict[str, Any]) -> None:
-        payload = {**eff.payload, **provenance}
+        # provenance is read over the effect's payload, not copied into it
+        payload = LayeredContext(provenance, eff.payload, names=("provenance", "effect"))
         if eff.type == "command":
             self.cmd.dispatch(Command(name=eff.name, payload=payload))
         else:
             self.bus.publish(Event(name=eff.name, payload=payload))
 
-    def _materialize(self, obj: Any, ctx: Mapping[str, Any], provenance: Dict[str, Any]) -> Any:
+    def _materialize(self, obj: Any, ctx: Mapping[str, Any], provenance: Dict[str, Any],
+                     scope: RequestScope | None = None) -> Any:
         """
         Convert payload literals into concrete values:
         - dict/list: recurse
@@ -56,54 +107,80 @@ class RulesEngine:
         - anything else: return as-is
         """
         if isinstance(obj, dict):
-            return {k: self._materialize(v, ctx, provenance) for k, v in obj.items()}
+            return {k: self._materialize(v, ctx, provenance, scope) for k, v in obj.items()}
         if isinstance(obj, list):
-            return [self._materialize(v, ctx, provenance) for v in obj]
+            return [self._materialize(v, ctx, provenance, scope) for v in obj]
         if isinstance(obj, str):
             try:
-                return self._resolve_number(obj, ctx=ctx, provenance=provenance)
+                return self._resolve_number(obj, ctx=ctx, provenance=provenance, scope=scope)
             except Exception:
                 return obj
         return obj
 
     # ---- main --------------------------------------------------------------
 
-    def apply(self, rule: Rule, *, ctx: Mapping[str, Any], provenance: Dict[str, Any]) -> Dict[str, Any]:
+    def apply(self, rule: Rule, *, ctx: Mapping[str, Any], provenance: Dict[str, Any],
+              session: EvalSession | None = None) -> Dict[str, Any]:
+        """
+        Pass the same `session` to a batch of applies over an unchanged context
+        to share memoized lookups; by default each apply gets its own.
+        Context is resolved once per apply (one RequestScope), not per die.
+        """
+        if session is None:
+            session = EvalSession()
+        scope = RequestScope(str(uuid4()), provenance, base=ctx, paths=rule_paths(rule), session=session)
+
         # 1) conditions (predicates only!)
         for cond in rule.when:
-            if not eval_safe(cond, ctx, mode="predicate"):
+            if not eval_safe(cond, ctx, mode="predicate", session=session):
                 return {"applied": False, "reason": "condition_failed"}
 
         # 2) cost (compute for side-effects / trace; ignore value)
         if rule.cost not in (None, ""):
-            _ = self._resolve_number(str(rule.cost), ctx=ctx, provenance=provenance)
+            _ = self._resolve_number(str(rule.cost), ctx=ctx, provenance=provenance, scope=scope)
 
-        # 3) DC and Roll (both through DiceService)
+        # 3) DC and Roll (both through DiceService, unless already settled)
         dc_val: int | None = None
-        if rule.dc not in (None, ""):
-            dc_val = self._resolve_number(str(rule.dc), ctx=ctx, provenance=provenance)
-
         roll_total: int | None = None
         success = True
-        if rule.roll and dc_val is not None:
-            roll_total = self._resolve_number(str(rule.roll), ctx=ctx, provenance=provenance)
-            success = (roll_total >= dc_val)
+        settled = None
+        if self.short_circuit and rule.roll and rule.dc not in (None, ""):
+            settled = self._settled(rule, ctx, session)
+        if settled is not None:
+            success, roll_b, dc_b = settled
+            dc_val = dc_b[0] if dc_b[0] == dc_b[1] else None
+            self.short_circuits += 1
+        else:
+            if rule.dc not in (None, ""):
+                dc_val = self._resolve_number(str(rule.dc), ctx=ctx, provenance=provenance, scope=scope)
+            if rule.roll and dc_val is not None:
+                roll_total = self._resolve_number(str(rule.roll), ctx=ctx, provenance=provenance, scope=scope)
+                success = (roll_total >= dc_val)
 
         # 4) effects
         if success and getattr(rule, "on_success", None):
             for eff in rule.on_success:
                 # materialize AFTER success so dice in payload roll now
-                payload = self._materialize(eff.payload, ctx, provenance)
+                payload = self._materialize(eff.payload, ctx, provenance, scope)
                 self._emit(Effect(type=eff.type, name=eff.name, payload=payload), provenance)
+                # handlers may have mutated actors: later effects must re-read
+                scope.invalidate()
 
         # 5) trace (engine-level)
-        self.bus.publish(Event(name="rules.trace", payload={
+        trace = {
             "rule_id": rule.id,
             "layer": rule.layer.value,
             "roll": roll_total,
             "dc": dc_val,
             "success": success,
-        }))
-
-        return {"applied": True, "success": success, "roll": roll_total, "dc": dc_val}
+            "short_circuit": settled is not None,
+            "lookups_saved": session.saved,
+            "context_resolutions": scope.resolutions,
+        }
+        if settled is not None:
+            trace["roll_bounds"], trace["dc_bounds"] = list(roll_b), list(dc_b)
+        self.bus.publish(Event(name="rules.trace", payload=trace))
+
+        return {"applied": True, "success": success, "roll": roll_total, "dc": dc_val,
+                "short_circuit": settled is not None}
 
@@ -1,17 +1,27 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import os
 import pathlib
+import threading
+import time
 import yaml  # add PyYAML to requirements.txt
 from baator.kernel.layers import Layer
 
-@dataclass
+ENGINE_VERSION = "0.4.0"
+
+# libyaml's C loader when PyYAML was built with it; same safe semantics
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@dataclass(slots=True)
 class Effect:
     type: str            # "command" | "event"
     name: str
     payload: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class Rule:
     id: str
     layer: Layer
@@ -22,7 +32,7 @@ class Rule:
     on_success: List[Effect] = field(default_factory=list)
     on_failure: List[Effect] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class RulePack:
     pack_id: str
     version: int
@@ -31,16 +41,85 @@ class RulePack:
     description: str = ""
     rules: List[Rule] = field(default_factory=list)
 
+@dataclass
+class PackDiff:
+    pack_id: str
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
 class RulesRegistry:
+    """
+    Rules keyed by f"{namespace}.{id}".
+
+    Readers see an immutable snapshot; writers build a new one and swap the
+    reference, so a RulesEngine.apply in flight keeps the Rule objects it
+    already fetched without any locking on the read path.
+    """
     def __init__(self):
-        self._rules: Dict[str, Rule] = {}   # key: f"{namespace}.{id}"
+        self._rules: Mapping[str, Rule] = MappingProxyType({})
+        self._owner: Mapping[str, str] = MappingProxyType({})  # key -> pack_id
+        self._write = threading.Lock()                         # writers only
 
     def register_pack(self, pack: RulePack) -> None:
-        for r in pack.rules:
-            key = f"{pack.namespace}.{r.id}"
-            if key in self._rules:
-                raise ValueError(f"Duplicate rule id: {key}")
-            self._rules[key] = r
+        with self._write:
+            rules = dict(self._rules)
+            owner = dict(self._owner)
+            for r in pack.rules:
+                key = f"{pack.namespace}.{r.id}"
+                if key in rules:
+                    raise ValueError(f"Duplicate rule id: {key}")
+                rules[key] = r
+                owner[key] = pack.pack_id
+            self._publish(rules, owner)
+
+    def replace_pack(self, pack: RulePack, *, replaces: Optional[str] = None) -> PackDiff:
+        """
+        Register `pack`, replacing whatever an earlier version of the same
+        pack_id contributed. Unchanged rules keep their existing Rule objects.
+        `replaces` names another pack dropped in the same swap (a file that
+        now holds a different pack). On error nothing changes.
+        """
+        with self._write:
+            old = {k: r for k, r in self._rules.items() if self._owner.get(k) == pack.pack_id}
+            dropped = {k for k, o in self._owner.items() if replaces is not None and o == replaces}
+            rules = {k: r for k, r in self._rules.items() if k not in old and k not in dropped}
+            owner = {k: o for k, o in self._owner.items() if k not in old and k not in dropped}
+            diff = PackDiff(pack.pack_id)
+            for r in pack.rules:
+                key = f"{pack.namespace}.{r.id}"
+                if key in rules:
+                    raise ValueError(f"Duplicate rule id: {key}")
+                prev = old.get(key)
+                if prev is None:
+                    diff.added.append(key)
+                elif prev == r:
+                    r = prev
+                    diff.unchanged.append(key)
+                else:
+                    diff.changed.append(key)
+                rules[key] = r
+                owner[key] = pack.pack_id
+            diff.removed = [k for k in old if k not in rules]
+            self._publish(rules, owner)
+            return diff
+
+    def remove_pack(self, pack_id: str) -> PackDiff:
+        with self._write:
+            gone = [k for k, o in self._owner.items() if o == pack_id]
+            self._publish({k: r for k, r in self._rules.items() if k not in gone},
+                          {k: o for k, o in self._owner.items() if o != pack_id})
+            return PackDiff(pack_id, removed=gone)
+
+    def _publish(self, rules: Dict[str, Rule], owner: Dict[str, str]) -> None:
+        # owner first: a reader never sees a rule without its owner entry
+        self._owner = MappingProxyType(owner)
+        self._rules = MappingProxyType(rules)
+
+    def snapshot(self) -> Mapping[str, Rule]:
+        """The current immutable view; stays valid across later reloads."""
+        return self._rules
 
     def get(self, key: str) -> Rule:
         return self._rules[key]
@@ -52,7 +131,12 @@ def _ensure(cond: bool, msg: str):
     if not cond: raise ValueError(msg)
 
 def load_rule_pack(path: str | pathlib.Path) -> RulePack:
-    data = yaml.safe_load(pathlib.Path(path).read_text())
+    return parse_rule_pack(pathlib.Path(path).read_bytes())
+
+def parse_rule_pack(source: str | bytes) -> RulePack:
+    """Parse and validate pack YAML text."""
+    data = yaml.load(source, Loader=_YamlLoader)
+    _ensure(isinstance(data, dict), "Rule pack must be a mapping")
     for k in ("pack_id","version","engine_min","namespace","rules"):
         _ensure(k in data, f"Missing pack field: {k}")
 
@@ -82,3 +166,115 @@ def load_rule_pack(path: str | pathlib.Path) -> RulePack:
         engine_min=str(data["engine_min"]), namespace=data["namespace"],
         description=data.get("description",""), rules=rules
     )
+
+# ---- directory loading -------------------------------------------------------
+
+def _version_tuple(v: str) -> Tuple[int, ...]:
+    return tuple(int(x) for x in str(v).split("."))
+
+def engine_compatible(engine_min: str, engine: str = ENGINE_VERSION) -> bool:
+    try:
+        need, have = _version_tuple(engine_min), _version_tuple(engine)
+    except ValueError:
+        return False
+    width = max(len(need), len(have))
+    return have + (0,) * (width - len(have)) >= need + (0,) * (width - len(need))
+
+@dataclass
+class PackFileReport:
+    path: str
+    status: str = "ok"      # ok | error | incompatible | superseded | collision
+    pack_id: Optional[str] = None
+    rules: int = 0
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+@dataclass
+class PackLoadReport:
+    registry: RulesRegistry
+    files: List[PackFileReport] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def errors(self) -> List[PackFileReport]:
+        return [f for f in self.files if f.status != "ok"]
+
+def _load_one(job: Tuple[str, bool, Optional[str]]) -> Tuple[str, Optional[RulePack], Optional[str], float]:
+    # runs in a worker process: must stay top-level and return picklable data
+    path, use_cache, cache_dir = job
+    t0 = time.perf_counter()
+    try:
+        if use_cache:
+            from .pack_cache import PackCache
+            pack = PackCache(None if cache_dir is None else pathlib.Path(cache_dir)).load(path)
+        else:
+            pack = load_rule_pack(path)
+        return path, pack, None, (time.perf_counter() - t0) * 1000.0
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}", (time.perf_counter() - t0) * 1000.0
+
+PACK_PATTERNS = ("*.yaml", "*.yml")   # rule pack files, for the loader and PackWatcher
+
+def load_rule_packs(directory: str | pathlib.Path, *, registry: Optional[RulesRegistry] = None,
+                    workers: Optional[int] = None, min_parallel: int = 8,
+                    use_cache: bool = False, cache_dir: str | pathlib.Path | None = None,
+                    patterns: Tuple[str, ...] = PACK_PATTERNS) -> PackLoadReport:
+    """
+    Parse and validate every pack under `directory` (recursively), across a
+    process pool once there are at least `min_parallel` files, then merge into
+    one registry in path order. With `use_cache`, files go through PackCache.
+    Bad files are reported, never raised:
+      - incompatible: engine_min newer than ENGINE_VERSION
+      - superseded:   same pack_id in several files; highest version wins and
+                      merges at the position of the first such file
+      - collision:    an earlier pack already owns one of its rule keys
+    """
+    t0 = time.perf_counter()
+    root = pathlib.Path(directory)
+    paths = sorted({str(p) for pat in patterns for p in root.rglob(pat)})
+    jobs = [(p, use_cache, None if cache_dir is None else str(cache_dir)) for p in paths]
+
+    if len(jobs) >= max(min_parallel, 2) and workers != 1:
+        n = min(workers or os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            results = list(pool.map(_load_one, jobs, chunksize=max(1, len(jobs) // (n * 4))))
+    else:
+        results = [_load_one(j) for j in jobs]
+
+    report = PackLoadReport(registry if registry is not None else RulesRegistry())
+    loaded: List[Tuple[PackFileReport, RulePack]] = []
+    for path, pack, err, ms in results:           # already in path order
+        fr = PackFileReport(path, elapsed_ms=ms)
+        report.files.append(fr)
+        if pack is None:
+            fr.status, fr.error = "error", err
+            continue
+        fr.pack_id, fr.rules = pack.pack_id, len(pack.rules)
+        if not engine_compatible(pack.engine_min):
+            fr.status = "incompatible"
+            fr.error = f"requires engine {pack.engine_min}, have {ENGINE_VERSION}"
+            continue
+        loaded.append((fr, pack))
+
+    # one file per pack_id: highest version, earliest path on ties
+    best: Dict[str, Tuple[PackFileReport, RulePack]] = {}
+    for fr, pack in loaded:
+        cur = best.get(pack.pack_id)
+        if cur is None or pack.version > cur[1].version:
+            best[pack.pack_id] = (fr, pack)
+    # merge in path order; a pack_id takes the slot of its first file
+    merged = set()
+    for fr, pack in loaded:
+        winner, wpack = best[pack.pack_id]
+        if winner is not fr:
+            fr.status, fr.error = "superseded", f"pack {pack.pack_id} loaded from {winner.path}"
+        if pack.pack_id in merged:
+            continue
+        merged.add(pack.pack_id)
+        try:
+            report.registry.register_pack(wpack)
+        except ValueError as e:
+            winner.status, winner.error = "collision", str(e)
+
+    report.elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    return report
@@ -0,0 +1,420 @@
+"""
+Many scenes across worker processes.
+
+SceneHost places each scene on one worker process, chosen by a consistent-
+hash ring over scene ids. The worker owns everything the scene needs: its
+EventBus, CommandBus, DiceService, actor repo and Simulator. Nothing is
+shared between scenes, so separate tables run on separate cores.
+
+Requests for a scene (dispatch, apply_rule, run_encounter, ...) go to its
+worker's inbox and run there in submission order; each call returns a
+Future. Events named in `forward` that the scene publishes while serving a
+request are shipped back with the reply and re-published on the host's bus
+before the future resolves.
+
+Scenes move between workers as snapshots (domain.snapshot): `migrate`
+moves one, `add_worker` / `remove_worker` re-hash and move only the scenes
+whose owner changed. A seeded host gives each scene its own RNG stream
+keyed by scene id; a migrating scene takes its stream's position along, so
+it never replays dice it already rolled.
+"""
+from __future__ import annotations
+from bisect import bisect
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import itertools
+import multiprocessing
+import pickle
+import queue
+import threading
+
+from baator.domain import Actor, Scene
+from baator.domain.snapshot import dump_scene, load_scene
+from baator.interface import InMemoryActorRepo, PythonRNG
+from baator.kernel import Command, CommandBus, Event, EventBus
+from .actor_router import command_routes, facet_commands, route_command
+from .context_provider import FACET_MUTATION_EVENTS, SimpleContextProvider
+from .dice_service import DiceService
+from .montecarlo import shard_seed
+from .rules_engine import RulesEngine
+from .rules_loader import RulesRegistry, load_rule_packs
+from .simulator import Simulator
+
+FORWARD_EVENTS = ("rules.trace", "sim.trace.end", "mythic.invocation_failed", *FACET_MUTATION_EVENTS)
+
+def _point(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    """Consistent hashing with `vnodes` points per node: adding or removing a
+    node moves only about 1/N of the keys."""
+    def __init__(self, nodes: Iterable[str] = (), *, vnodes: int = 64):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        for i in range(self.vnodes):
+            p = _point(f"{node}#{i}")
+            j = bisect(self._points, p)
+            self._points.insert(j, p)
+            self._owners.insert(j, node)
+
+    def remove(self, node: str) -> None:
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def owner(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        return self._owners[bisect(self._points, _point(key)) % len(self._points)]
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(set(self._owners))
+
+# ---- worker side ------------------------------------------------------------------
+
+class _SceneRuntime:
+    """One scene's private wiring inside a worker process."""
+    def __init__(self, scene: Scene, actors: Dict[Any, Actor], registry: RulesRegistry,
+                 rng: Any, forward: Iterable[str]):
+        self.scene = scene
+        self.actors = actors
+        self.rng = rng
+        self.repo = InMemoryActorRepo(actors.values())
+        self.bus, self.cmd = EventBus(sync=True), CommandBus()
+        dice = DiceService(rng, self.bus, self.cmd, SimpleContextProvider(self.repo))
+        self.cmd.register("dice.resolve_number", dice.handle)
+        self.cmd.register("dice.roll_expression", dice.handle)
+        # actors' PhysicalFacets are the hp authority; participants mirror them
+        self.sim = Simulator(registry, RulesEngine(self.cmd, self.bus), self.cmd, self.bus, actors=self.repo)
+        self.sim.attach(scene)
+        self.cmd.register("physical.take_damage", self.sim.take_damage)
+        self.routes = command_routes()
+        for name in sorted(facet_commands() - {"physical.take_damage"}):
+            self.cmd.register(name, self._act)
+        self.outbox: List[Event] = []
+        for name in forward:
+            self.bus.subscribe(name, self._collect)
+
+    def _collect(self, event: Event) -> None:
+        self.outbox.append(event)
+
+    def _act(self, cmd: Command) -> None:
+        actor = self.repo.get(route_command(cmd, self.routes))
+        if actor is None:
+            raise LookupError(f"Unknown actor for {cmd.name} in scene {self.scene.scene_id!r}")
+        actor.act(cmd)
+        self.sim.sync_hp(self.scene, actor)
+        self.bus.publish_batch(actor.pull_events())
+
+    def drain(self) -> List[Event]:
+        events, self.outbox = self.outbox, []
+        return events
+
+    def snapshot(self) -> bytes:
+        return dump_scene(self.scene, self.actors.values())
+
+    # ---- ops ----
+
+    def dispatch(self, name: str, payload: Dict[str, Any]) -> None:
+        self.cmd.dispatch(Command(name, {**payload, "scene_id": self.scene.scene_id}))
+
+    def apply_rule(self, rule_key: str, actor: str, target: Optional[str],
+                   ctx_extra: Optional[Dict[str, Any]], trace: bool) -> Dict[str, Any]:
+        a = self.scene.by_name(actor)
+        t = self.scene.by_name(target) if target is not None else None
+        if a is None or (target is not None and t is None):
+            raise LookupError(f"Unknown participant in scene {self.scene.scene_id!r}")
+        return self.sim.apply_rule(self.scene, rule_key, actor=a, target=t,
+                                   ctx_extra=ctx_extra, trace=trace)
+
+    def run_encounter(self, policy: Any, kwargs: Dict[str, Any]) -> Any:
+        return self.sim.run_encounter(self.scene, policy, **kwargs)
+
+def _worker_main(name: str, inbox: Any, replies: Any, packs: str, seed: Optional[int],
+                 forward: Tuple[str, ...]) -> None:
+    registry = load_rule_packs(packs, workers=1).registry
+    shared_rng = PythonRNG()
+    scenes: Dict[str, _SceneRuntime] = {}
+    served = 0
+    while True:
+        msg = inbox.get()
+        if msg is None:
+            break
+        req_id, op, scene_id, args = msg
+        rt = scenes.get(scene_id)
+        try:
+            if op == "open":
+                if rt is not None:
+                    raise ValueError(f"Scene {scene_id!r} is already open on {name}")
+                data, rng_state = args
+                scene, actors = load_scene(data)
+                rng = shared_rng if seed is None else PythonRNG(shard_seed(seed, _point(scene_id)))
+                if rng_state is not None:
+                    rng.setstate(rng_state)       # migrated: continue the scene's stream
+                scenes[scene_id] = _SceneRuntime(scene, actors, registry, rng, forward)
+                result: Any = None
+            elif op == "stats":
+                result = {"worker": name, "scenes": sorted(scenes), "served": served}
+            elif rt is None:
+                raise LookupError(f"Scene {scene_id!r} is not open on {name}")
+            elif op == "close":
+                result = (rt.snapshot(), None if rt.rng is shared_rng else rt.rng.getstate())
+                del scenes[scene_id]
+            elif op == "snapshot":
+                result = rt.snapshot()
+            else:
+                result = getattr(rt, op)(*args)
+            events = rt.drain() if rt is not None else []
+            replies.put((req_id, True, result, events))
+        except Exception as e:
+            events = rt.drain() if rt is not None else []
+            replies.put((req_id, False, _portable(e), events))
+        served += 1
+
+def _portable(e: Exception) -> Exception:
+    """The exception itself if it survives pickling, else a RuntimeError with its text."""
+    try:
+        pickle.loads(pickle.dumps(e))
+        return e
+    except Exception:
+        return RuntimeError(f"{type(e).__name__}: {e}")
+
+# ---- host side --------------------------------------------------------------------
+
+class WorkerLost(RuntimeError):
+    """The worker process a request was sent to exited before replying."""
+
+class _Worker:
+    __slots__ = ("name", "process", "inbox")
+
+    def __init__(self, name: str, process: Any, inbox: Any):
+        self.name = name
+        self.process = process
+        self.inbox = inbox
+
+class SceneHost:
+    def __init__(self, workers: Optional[int] = None, *, packs: str = "packs",
+                 seed: Optional[int] = None, vnodes: int = 64, bus: Optional[EventBus] = None,
+                 forward: Iterable[str] = FORWARD_EVENTS, start_method: str = "spawn",
+                 liveness_interval: float = 0.5):
+        """
+        `bus` receives forwarded scene events (a sync EventBus by default).
+        Workers are started with `start_method` ("spawn" by default: the
+        host runs a reply thread, and forking a threaded process is unsafe).
+        Whenever no reply has come for `liveness_interval` seconds, the reply
+        thread checks the workers: requests outstanding on one that died
+        fail with WorkerLost, as do later requests for its scenes.
+        """
+        self.packs = str(packs)
+        self.seed = seed
+        self.bus = bus or EventBus(sync=True)
+        self.forward = tuple(forward)
+        self.liveness_interval = liveness_interval
+        self._mp = multiprocessing.get_context(start_method)
+        self._replies = self._mp.Queue()
+        self._ring = HashRing(vnodes=vnodes)
+        self._workers: Dict[str, _Worker] = {}
+        self._placement: Dict[str, str] = {}     # scene_id -> worker name
+        self._futures: Dict[int, Tuple[Future, str]] = {}   # req_id -> (future, worker)
+        self._ids = itertools.count()
+        self._names = itertools.count()
+        self._lock = threading.RLock()           # placement; held across a migration
+        self._flock = threading.Lock()           # futures table
+        self.migrations = 0
+        for _ in range(workers or multiprocessing.cpu_count()):
+            self._start_worker()
+        self._reader = threading.Thread(target=self._read_replies, name="scene-host-replies", daemon=True)
+        self._reader.start()
+
+    # ---- workers ----
+
+    def _start_worker(self) -> str:
+        name = f"w{next(self._names)}"
+        inbox = self._mp.Queue()
+        proc = self._mp.Process(target=_worker_main, name=f"scene-{name}", daemon=True,
+                                args=(name, inbox, self._replies, self.packs, self.seed, self.forward))
+        proc.start()
+        self._workers[name] = _Worker(name, proc, inbox)
+        self._ring.add(name)
+        return name
+
+    def add_worker(self) -> int:
+        """Start a worker and move the scenes the ring now assigns to it; returns scenes moved."""
+        with self._lock:
+            self._start_worker()
+            return self.rebalance()
+
+    def remove_worker(self, name: str) -> int:
+        """Move the worker's scenes to their new owners, then stop it; returns scenes moved."""
+        with self._lock:
+            if name not in self._workers:
+                raise KeyError(name)
+            if len(self._workers) == 1:
+                raise ValueError("Cannot remove the last worker")
+            self._ring.remove(name)
+            moved = self.rebalance()
+            w = self._workers.pop(name)
+            w.inbox.put(None)
+            w.process.join()
+            return moved
+
+    @property
+    def workers(self) -> List[str]:
+        return sorted(self._workers)
+
+    # ---- requests ----
+
+    def _send(self, worker: str, op: str, scene_id: str, *args: Any) -> Future:
+        fut: Future = Future()
+        w = self._workers[worker]
+        if not w.process.is_alive():
+            fut.set_exception(WorkerLost(f"Worker {worker} exited (code {w.process.exitcode})"))
+            return fut
+        req_id = next(self._ids)
+        with self._flock:
+            self._futures[req_id] = (fut, worker)
+        w.inbox.put((req_id, op, scene_id, args))
+        return fut
+
+    def _read_replies(self) -> None:
+        while True:
+            try:
+                msg = self._replies.get(timeout=self.liveness_interval)
+            except queue.Empty:
+                self._fail_lost()
+                continue
+            if msg is None:
+                return
+            req_id, ok, result, events = msg
+            if events:
+                self.bus.publish_batch(events)
+            with self._flock:
+                entry = self._futures.pop(req_id, None)
+            if entry is None:          # already failed as lost
+                continue
+            if ok:
+                entry[0].set_result(result)
+            else:
+                entry[0].set_exception(result)
+
+    def _fail_lost(self) -> None:
+        dead = {w.name: w.process.exitcode for w in list(self._workers.values()) if not w.process.is_alive()}
+        if not dead:
+            return
+        with self._flock:
+            lost = [(rid, fut, worker) for rid, (fut, worker) in self._futures.items() if worker in dead]
+            for rid, _, _ in lost:
+                del self._futures[rid]
+        for _, fut, worker in lost:
+            fut.set_exception(WorkerLost(f"Worker {worker} exited (code {dead[worker]}) before replying"))
+
+    def _owner(self, scene_id: str) -> str:
+        with self._lock:
+            worker = self._placement.get(scene_id)
+            if worker is None:
+                raise LookupError(f"Scene {scene_id!r} is not open")
+            return worker
+
+    def owner(self, scene_id: str) -> str:
+        return self._owner(scene_id)
+
+    def open_scene(self, scene: Scene, actors: Iterable[Actor] = ()) -> Future:
+        """Ship the scene (as a snapshot) to the worker the ring picks."""
+        with self._lock:
+            if scene.scene_id in self._placement:
+                raise ValueError(f"Scene {scene.scene_id!r} is already open")
+            worker = self._ring.owner(scene.scene_id)
+            self._placement[scene.scene_id] = worker
+            fut = self._send(worker, "open", scene.scene_id, dump_scene(scene, actors), None)
+        fut.add_done_callback(lambda f: f.exception() and self._forget(scene.scene_id, worker))
+        return fut
+
+    def _forget(self, scene_id: str, worker: str) -> None:
+        with self._lock:
+            if self._placement.get(scene_id) == worker:
+                del self._placement[scene_id]
+
+    def close_scene(self, scene_id: str) -> Tuple[Scene, Dict[Any, Actor]]:
+        """Stop hosting the scene; returns its final state."""
+        with self._lock:
+            data, _ = self._send(self._owner(scene_id), "close", scene_id).result()
+            del self._placement[scene_id]
+        return load_scene(data)
+
+    def snapshot(self, scene_id: str) -> Future:
+        return self._send(self._owner(scene_id), "snapshot", scene_id)
+
+    def dispatch(self, scene_id: str, cmd: Command) -> Future:
+        """Dispatch `cmd` on the scene's own CommandBus."""
+        return self._send(self._owner(scene_id), "dispatch", scene_id, cmd.name, cmd.payload)
+
+    def apply_rule(self, scene_id: str, rule_key: str, *, actor: str, target: Optional[str] = None,
+                   ctx_extra: Optional[Dict[str, Any]] = None, trace: bool = True) -> Future:
+        """Simulator.apply_rule in the scene's worker; participants are given by name."""
+        return self._send(self._owner(scene_id), "apply_rule", scene_id, rule_key, actor, target,
+                          ctx_extra, trace)
+
+    def run_encounter(self, scene_id: str, policy: Any, **kwargs: Any) -> Future:
+        """Simulator.run_encounter in the scene's worker; `policy` must pickle."""
+        return self._send(self._owner(scene_id), "run_encounter", scene_id, policy, kwargs)
+
+    # ---- placement ----
+
+    def migrate(self, scene_id: str, worker: str) -> None:
+        """
+        Move a scene: close it on its worker (after everything already queued
+        for it), reopen the snapshot on `worker` with its RNG where it left off. Requests made meanwhile wait
+        on the placement lock and go to the new worker.
+        """
+        with self._lock:
+            src = self._owner(scene_id)
+            if src == worker:
+                return
+            if worker not in self._workers:
+                raise KeyError(worker)
+            data, rng_state = self._send(src, "close", scene_id).result()
+            self._placement[scene_id] = worker
+            self._send(worker, "open", scene_id, data, rng_state).result()
+            self.migrations += 1
+
+    def rebalance(self) -> int:
+        """Move every scene not on its ring owner; returns how many moved."""
+        with self._lock:
+            moves = [(sid, self._ring.owner(sid)) for sid, w in self._placement.items()
+                     if self._ring.owner(sid) != w]
+            for sid, dst in moves:
+                self.migrate(sid, dst)
+            return len(moves)
+
+    def placement(self) -> Dict[str, List[str]]:
+        """Worker name -> scene ids it hosts."""
+        with self._lock:
+            out: Dict[str, List[str]] = {w: [] for w in self._workers}
+            for sid, w in self._placement.items():
+                out[w].append(sid)
+            return {w: sorted(s) for w, s in out.items()}
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [self._send(w, "stats", "").result() for w in self.workers]
+
+    def close(self) -> None:
+        for w in self._workers.values():
+            w.inbox.put(None)
+        for w in self._workers.values():
+            w.process.join()
+        self._workers.clear()
+        self._replies.put(None)
+        self._reader.join()
+
+    def __enter__(self) -> "SceneHost":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
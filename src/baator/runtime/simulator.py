@@ -1,47 +1,83 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, List
 from uuid import UUID
-from baator.kernel import CommandBus, EventBus, Event
+import time
+from baator.kernel import Command, CommandBus, EventBus, Event, Layer, LayeredContext
+from baator.kernel.context import overlay
 from baator.runtime import RulesRegistry, RulesEngine
-from baator.domain import Scene, Participant
+from baator.domain import Actor, Scene, Participant
+from .context_provider import ActorRepo
+from .policies import TurnPolicy, last_team_standing, standing
+
+@dataclass(slots=True)
+class EncounterReport:
+    scene_id: str
+    outcome: str = "running"        # "decided" | "max_rounds" | "empty"
+    winners: List[str] = field(default_factory=list)   # sides still standing
+    turns: int = 0
+    rounds: int = 0
+    actions: int = 0                # turns where a rule was applied
+    successes: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def turns_per_sec(self) -> float:
+        return self.turns / self.elapsed_s if self.elapsed_s else 0.0
 
 class Simulator:
     """
     Small orchestration layer: chooses whose turn it is, applies a rule by id,
     and emits trace events for diagnostics.
+
+    run_encounter plays a scene out headlessly with a TurnPolicy. Register
+    `take_damage` as the `physical.take_damage` handler so hits land on the
+    participants of attached scenes (run_encounter attaches its scene for
+    the duration; attach() keeps one attached).
+
+    With `actors` (the repo the DiceService's context provider reads), an
+    actor's PhysicalFacet is the hp authority: damage goes through
+    actor.act and its participant's hp mirrors the facet (on attach too).
+    Participants without such an actor only change on the scene. Either
+    way `physical.damage_taken` is published.
     """
     def __init__(self, rules: RulesRegistry, eng: RulesEngine,
-                 cmd: CommandBus, bus: EventBus):
+                 cmd: CommandBus, bus: EventBus, *, actors: ActorRepo | None = None):
         self.rules = rules
         self.engine = eng
         self.cmd = cmd
         self.bus = bus
+        self.actors = actors
+        self._scenes: Dict[str, Scene] = {}   # scene_id -> attached scene
 
     def apply_rule(self, scene: Scene, rule_key: str,
                    *, actor: Participant, target: Participant | None,
-                   ctx_extra: Dict[str, Any] | None = None) -> Dict[str, Any]:
+                   ctx_extra: Dict[str, Any] | None = None, trace: bool = True) -> Dict[str, Any]:
         rule = self.rules.get(rule_key)
-        ctx: Dict[str, Any] = {
-            "actor": {"name": actor.name},   # extend with stats in your store
-            "target": {"name": target.name} if target else {},
+        scene_layer = {
+            "actor": {"name": actor.name, "hp": actor.hp},   # extend with stats in your store
+            "target": {"name": target.name, "hp": target.hp} if target else {},
         }
-        if ctx_extra:
-            # merge extra context (stats, AC, etc.)
-            for k, v in ctx_extra.items():
-                ctx[k] = v
-
-        prov = {"actor_id": str(actor.actor_id), "source": "sim", "layer": rule.layer.value}
-        self.bus.publish(Event(name="sim.trace.begin", payload={
-            "scene_id": scene.scene_id, "rule": rule_key, "actor": actor.name, "ctx": ctx,
-            "target": getattr(target, "name", None), "round": scene.round
-        }))
+        # extra context (stats, AC, etc.) is read over the scene's, key by key; nothing is copied
+        ctx = LayeredContext(ctx_extra or {}, scene_layer, names=("extra", "scene"))
+
+        prov = {"actor_id": str(actor.actor_id), "source": "sim", "layer": rule.layer.value,
+                "scene_id": scene.scene_id}
+        if target is not None:
+            prov["target_id"] = str(target.actor_id)   # lets effect commands reach the target
+        if trace:
+            self.bus.publish(Event(name="sim.trace.begin", payload={
+                "scene_id": scene.scene_id, "rule": rule_key, "actor": actor.name, "ctx": ctx,
+                "target": getattr(target, "name", None), "round": scene.round
+            }))
 
         result = self.engine.apply(rule, ctx=ctx, provenance=prov)
 
-        self.bus.publish(Event(name="sim.trace.end", payload={
-            "scene_id": scene.scene_id, "rule": rule_key, "actor": actor.name,
-            "target": getattr(target, "name", None), "round": scene.round, **result
-        }))
+        if trace:
+            self.bus.publish(Event(name="sim.trace.end", payload={
+                "scene_id": scene.scene_id, "rule": rule_key, "actor": actor.name,
+                "target": getattr(target, "name", None), "round": scene.round, **result
+            }))
         return result
 
     def step(self, scene: Scene) -> None:
@@ -52,3 +88,93 @@ class Simulator:
             "scene_id": scene.scene_id, "round": scene.round,
             "actor": cur.name, "actor_id": str(cur.actor_id)
         }))
+
+    # ---- headless encounters -------------------------------------------------
+
+    def attach(self, scene: Scene) -> None:
+        cur = self._scenes.get(scene.scene_id)
+        if cur is not None and cur is not scene:
+            raise ValueError(f"Another scene is attached as {scene.scene_id!r}")
+        self._scenes[scene.scene_id] = scene
+        if self.actors is not None:
+            found = self.actors.get_many([p.actor_id for p in scene.order()])
+            for actor in found.values():
+                self.sync_hp(scene, actor)
+
+    def sync_hp(self, scene: Scene, actor: Actor) -> None:
+        """Copy the actor's PhysicalFacet hp onto its participant in `scene`, if both exist."""
+        facet = actor.facets.get(Layer.PHYSICAL)
+        p = scene.get(actor.id)
+        if facet is not None and p is not None and p.hp != facet.hp:
+            scene.writable(actor.id).hp = facet.hp
+
+    def detach(self, scene_id: str) -> None:
+        self._scenes.pop(scene_id, None)
+
+    def take_damage(self, cmd: Command) -> None:
+        """`physical.take_damage` handler for attached scenes."""
+        p = cmd.payload
+        scene = self._scenes.get(p.get("scene_id"))
+        if scene is None:
+            raise LookupError(f"No scene attached as {p.get('scene_id')!r}")
+        target_id = UUID(str(p["target_id"]))
+        actor = self.actors.get(target_id) if self.actors is not None else None
+        if actor is not None and Layer.PHYSICAL in actor.facets:
+            actor.act(Command(cmd.name, overlay(p, {"layer": Layer.PHYSICAL.value})))
+            events = actor.pull_events()
+            self.sync_hp(scene, actor)
+        else:
+            target = scene.writable(target_id)
+            amount = int(p.get("amount", 0))
+            target.hp = max(0, target.hp - amount)
+            events = [Event(name="physical.damage_taken", payload={
+                "amount": amount, "hp": target.hp, "actor_id": target_id, "layer": Layer.PHYSICAL.value})]
+        self.bus.publish_batch(events)
+
+    def run_encounter(self, scene: Scene, policy: TurnPolicy, *, max_rounds: int = 100,
+                      terminate: Callable[[Scene], bool] = last_team_standing,
+                      trace: bool = False) -> EncounterReport:
+        """
+        Take turns (Scene.next_turn) until `terminate(scene)` holds or
+        `max_rounds` rounds have passed. Downed participants (hp 0) and turns
+        the policy passes on still count as turns. With `trace`, each turn
+        publishes sim.turn and sim.trace.begin/end as in interactive play.
+        Participants' actor_ids go out as provenance, so the DiceService's
+        context provider must know them; the policy's ctx and the scene's hp
+        override what it projects.
+        """
+        report = EncounterReport(scene.scene_id)
+        attached = scene.scene_id in self._scenes
+        self.attach(scene)
+        first_round = last_round = scene.round
+        t0 = time.perf_counter()
+        try:
+            while not terminate(scene) and scene.round - first_round < max_rounds:
+                cur = scene.current()
+                if cur is None:
+                    break
+                last_round = scene.round
+                if trace:
+                    self.step(scene)
+                choice = policy.choose(scene, cur) if cur.hp > 0 else None
+                if choice is not None:
+                    res = self.apply_rule(scene, choice.rule, actor=cur, target=choice.target,
+                                          ctx_extra=choice.ctx,
+                                          trace=trace)
+                    report.actions += 1
+                    report.successes += bool(res.get("success"))
+                report.turns += 1
+                scene.next_turn()
+        finally:
+            if not attached:
+                self.detach(scene.scene_id)
+        report.elapsed_s = time.perf_counter() - t0
+        report.rounds = last_round - first_round + 1 if report.turns else 0
+        report.winners = standing(scene)
+        if not scene.order():
+            report.outcome = "empty"
+        elif terminate(scene):
+            report.outcome = "decided"
+        else:
+            report.outcome = "max_rounds"
+        return report
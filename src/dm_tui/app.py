@@ -3,7 +3,7 @@ from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, DataTable, Input, RichLog
 from rich.pretty import pretty_repr
 from baator.runtime.bootstrap import bootstrap, choose_rng
-from baator.runtime import RulesEngine, RulesRegistry, Simulator, load_rule_pack
+from baator.runtime import PackCache, PackWatcher, RulesEngine, Simulator, load_rule_packs
 from .command_api import CommandRegistry, CommandContext
 from .command_loader import load_commands
 
@@ -41,19 +41,24 @@ class DMApp(App):
             # expect payload like {'amount': X, 'target': 'Drone'}
             name = e.payload.get("target")
             amt  = e.payload.get("amount", 0)
-            p = self.cmdreg.get_state("scene").get(name)
+            sc = self.cmdreg.get_state("scene").get("scene")
+            p = sc.by_name(name) if sc else None
             if p:
-                p.initiative = getattr(p, "initiative", 0)  # keep existing fields
-                # if you’re storing hp in the scene participant, decrement here
-                p.hp = max(0, getattr(p, "hp", 10) - amt)
+                p.hp = max(0, p.hp - amt)
                 self.event_log.write(f"[red]-{amt}[/] to {name}  HP={p.hp}\n")        # Runtime
 
         self.bus, self.cbus = bootstrap(sync_bus=True)   # ensure sync EB for UI
         rng = choose_rng()
         self.engine = RulesEngine(self.cbus, self.bus, rng)
-        self.registry = RulesRegistry()
-        for pack in ["packs/physical_core.yaml", "packs/cyber_core.yaml", "packs/mythic_core.yaml"]:
-            self.registry.register_pack(load_rule_pack(pack))
+        report = load_rule_packs("packs", use_cache=True)
+        self.registry = report.registry
+        for f in report.errors:
+            self.event_log.write(f"[red]pack {f.status}[/]: {f.path}: {f.error}\n")
+        self.event_log.write(f"[dim]packs: {len(report.files)} files in {report.elapsed_ms:.1f} ms[/]\n")
+        self.pack_watcher = PackWatcher(self.registry, ["packs"], self.bus, loader=PackCache().load)
+        self.pack_watcher.adopt(report)
+        # poll on the UI loop so reload events can write to the log safely
+        self.set_interval(1.0, self.pack_watcher.poll)
         self.sim = Simulator(self.registry, self.engine, self.cbus, self.bus)
         self.cmdreg = CommandRegistry()
         self.cbus.register("physical.take_damage", on_damage)
@@ -61,7 +66,8 @@ class DMApp(App):
         load_commands(self.cmdreg)
 
         # Subscriptions
-        for name in ("rules.trace","sim.trace.begin","sim.trace.end", "dice.resolved", "rng.fulfilled"):
+        for name in ("rules.trace","sim.trace.begin","sim.trace.end", "dice.resolved", "rng.fulfilled",
+                     "rules.pack_reloaded", "rules.pack_reload_failed"):
             self.bus.subscribe(name, log_event)
 
     async def on_input_submitted(self, msg: Input.Submitted) -> None:
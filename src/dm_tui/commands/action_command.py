@@ -28,8 +28,7 @@ class ActionCommand:
         # 🔎 read the *scene* plugin's state
         scene_state = ctx.get_state("scene", a["slot"])
         sc   = scene_state.get("scene")
-        idx  = scene_state.get("index", {})
-        A, B = idx.get(a["actor"]), idx.get(a["target"])
+        A, B = (sc.by_name(a["actor"]), sc.by_name(a["target"])) if sc else (None, None)
         if not (sc and A and B):
             return "Need a scene and known actor/target (/scene help)"
 
@@ -52,7 +52,7 @@ class SceneCommand:
 
     def run(self, ctx: CommandContext, args: dict, state: dict) -> str | None:
         # state is namespaced for this handler+state_id
-        # shape: {"scene": Scene, "index": {name: Participant}}
+        # shape: {"scene": Scene}; participants are looked up via Scene.by_name
         bus = ctx.bus
         op = args.get("op")
 
@@ -62,17 +62,15 @@ class SceneCommand:
         if op == "new":
             sc = Scene(args["name"])
             state["scene"] = sc
-            state["index"] = {}
             bus.publish(Event("sim.trace.begin", {"scene_id": sc.scene_id, "rule": "scene.new"}))
             return f"Scene created: {sc.scene_id}"
 
         if op == "start":
-            sc = state.get("scene") or Scene(args["mode"])
-            state["scene"] = sc
             p1 = Participant(actor_id=uuid4(), name=args["actor"], initiative=0)
             p2 = Participant(actor_id=uuid4(), name=args["target"], initiative=0)
-            sc.participants = [p1, p2]
-            state["index"] = {p1.name: p1, p2.name: p2}
+            prev = state.get("scene")
+            sc = Scene(prev.scene_id if prev else args["mode"], [p1, p2])
+            state["scene"] = sc
             bus.publish(Event("sim.trace.step", {"scene_id": sc.scene_id, "round": sc.round}))
             return f"Scene started ({args['mode']}): {p1.name} vs {p2.name}"
 
@@ -80,17 +78,15 @@ class SceneCommand:
             sc = state.get("scene")
             if not sc: return "No active scene: use /scene new <name>"
             p = Participant(actor_id=uuid4(), name=args["name"], initiative=0)
-            sc.participants.append(p)
-            state.setdefault("index", {})[p.name] = p
+            sc.add(p)
             return f"Added {p.name}"
 
         if op == "rm":
             sc = state.get("scene")
             if not sc: return "No active scene"
-            idx = state.get("index", {})
-            p = idx.pop(args["name"], None)
+            p = sc.by_name(args["name"])
             if not p: return f"Unknown participant: {args['name']}"
-            sc.participants = [x for x in sc.participants if x.name != args["name"]]
+            sc.remove(p.actor_id)
             return f"Removed {args['name']}"
 
         if op == "next":
@@ -0,0 +1,72 @@
+from uuid import uuid4
+from baator.domain import Actor
+from baator.domain.facets import CyberFacet, PhysicalFacet
+from baator.interface import InMemoryActorRepo, SQLiteActorRepo
+from baator.interface import repo_sqlite
+from baator.kernel import Layer
+from baator.runtime.context_provider import ProjectionCache, SimpleContextProvider
+
+def mk(name, hp=10, cyber=False):
+    a = Actor(id=uuid4(), name=name)
+    a.attach_facet(PhysicalFacet(hp=hp))
+    if cyber:
+        a.attach_facet(CyberFacet(integrity=5))
+    return a
+
+def test_memory_repo_indexes_by_name_and_layer():
+    hero, drone, other = mk("hero"), mk("drone", cyber=True), mk("drone")
+    repo = InMemoryActorRepo([hero, drone, other])
+    assert repo.get(hero.id) is hero and len(repo) == 3
+    assert {a.id for a in repo.find_by_name("drone")} == {drone.id, other.id}
+    assert [a.id for a in repo.with_facet(Layer.CYBER)] == [drone.id]
+    assert repo.get_many([hero.id, uuid4()]) == {hero.id: hero}
+
+    drone.name = "rogue"; repo.reindex(drone)
+    assert [a.id for a in repo.find_by_name("drone")] == [other.id]
+    repo.remove(drone.id)
+    assert drone.id not in repo and not list(repo.with_facet(Layer.CYBER))
+
+def test_sqlite_repo_round_trips_and_bulk_fetches(tmp_path):
+    actors = [mk(f"a{i}", hp=i, cyber=i % 2 == 0) for i in range(repo_sqlite.CHUNK + 10)]
+    with SQLiteActorRepo(tmp_path / "actors.db") as repo:
+        repo.add_many(actors)
+        assert len(repo) == len(actors)
+        got = repo.get_many([a.id for a in actors] + [uuid4()])
+        assert set(got) == {a.id for a in actors}
+        a7 = got[actors[7].id]
+        assert a7.name == "a7" and a7.facets[Layer.PHYSICAL].hp == 7 and Layer.CYBER not in a7.facets
+        assert repo.get(actors[8].id).facets[Layer.CYBER].integrity == 5
+        assert [a.id for a in repo.find_by_name("a3")] == [actors[3].id]
+        assert repo.get(uuid4()) is None
+
+def test_sqlite_write_behind_is_visible_then_persisted(tmp_path):
+    db = tmp_path / "actors.db"
+    hero, drone = mk("hero"), mk("drone")
+    repo = SQLiteActorRepo(db, batch_size=3)
+    repo.add_many([hero, drone])
+    for hp in (9, 8):
+        repo.update_facet(hero.id, PhysicalFacet(hp=hp))
+    assert repo.pending == 1 and repo.flushes == 0          # coalesced, still buffered
+    assert repo.get(hero.id).facets[Layer.PHYSICAL].hp == 8
+    repo.update_facet(hero.id, CyberFacet(integrity=2))
+    repo.update_facet(drone.id, PhysicalFacet(hp=1))         # third pending row: flushes
+    assert repo.pending == 0 and repo.flushes == 1
+    repo.close()
+
+    again = SQLiteActorRepo(db)
+    stored = again.get(hero.id)
+    assert stored.facets[Layer.PHYSICAL].hp == 8 and stored.facets[Layer.CYBER].integrity == 2
+    again.close()
+
+def test_provider_fetches_actor_and_target_in_one_bulk_call():
+    hero, drone = mk("hero"), mk("drone", hp=4)
+    repo = InMemoryActorRepo([hero, drone])
+    calls = []
+    get_many = repo.get_many
+    repo.get_many = lambda ids: calls.append(list(ids)) or get_many(ids)
+    prov = SimpleContextProvider(repo, cache=ProjectionCache())
+    meta = {"actor_id": str(hero.id), "target_id": str(drone.id)}
+    ctx = prov.resolve(meta)
+    assert ctx["target"]["hp"] == 4 and ctx["actor"]["name"] == "hero"
+    prov.resolve(meta)
+    assert calls == [[hero.id, drone.id]]
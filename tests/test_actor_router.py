@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from uuid import uuid4
+import threading
+import time
+
+from baator.domain import Actor, Facet, handles
+from baator.domain.facets import PhysicalFacet
+from baator.interface import InMemoryActorRepo
+from baator.kernel import Command, CommandBus, Event, EventBus, Layer
+from baator.runtime import ActorRouter
+
+def mk(hp=10):
+    a = Actor(id=uuid4(), name="unit")
+    a.attach_facet(PhysicalFacet(hp=hp))
+    return a
+
+def hit(target, n, attacker=None):
+    return Command("physical.take_damage", {"layer": "physical", "amount": n,
+                                            "actor_id": str(attacker or uuid4()), "target_id": str(target.id)})
+
+def heal(target, n):
+    return Command("physical.heal", {"layer": "physical", "amount": n, "actor_id": str(target.id)})
+
+def test_routes_to_target_and_keeps_per_actor_order():
+    a, b = mk(hp=2), mk(hp=50)
+    bus, cmd = EventBus(sync=True), CommandBus()
+    seen = []
+    bus.subscribe("physical.damage_taken", seen.append)
+    router = ActorRouter(InMemoryActorRepo([a, b]), bus, workers=4)
+    router.register(cmd)
+    cmd.dispatch(hit(a, 5, attacker=b.id))      # routed to the target, not the attacker
+    cmd.dispatch(heal(a, 3))                   # order matters: clamp at 0 then +3
+    for _ in range(40):
+        cmd.dispatch(hit(b, 1))
+    assert router.join(timeout=5)
+    router.shutdown()
+    assert a.facets[Layer.PHYSICAL].hp == 3 and b.facets[Layer.PHYSICAL].hp == 10
+    assert len(seen) == 41
+    st = router.stats()
+    assert st[str(b.id)]["processed"] == 40 and st[str(a.id)]["enqueued"] == 2
+
+def test_self_directed_commands_route_to_the_issuer():
+    from baator.domain.facets import MythicFacet
+    caster, foe = mk(), mk()
+    for a in (caster, foe):
+        a.attach_facet(MythicFacet(essence=6))
+    router = ActorRouter(InMemoryActorRepo([caster, foe]), EventBus(sync=True), workers=1)
+    router.submit(Command("mythic.invocation", {"layer": "mythic", "cost": 4,
+                                                "actor_id": str(caster.id), "target_id": str(foe.id)}))
+    assert router.join(timeout=5)
+    router.shutdown()
+    assert caster.facets[Layer.MYTHIC].essence == 2 and foe.facets[Layer.MYTHIC].essence == 6
+
+@dataclass(slots=True)
+class SlowFacet(Facet):
+    layer: Layer = Layer.MYTHIC
+    active: int = 0
+    peak: int = 0
+    calls: int = 0
+
+    @handles("mythic.slow")
+    def slow(self, cmd):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        time.sleep(0.001)
+        self.calls += 1
+        self.active -= 1
+        return [Event("mythic.slowed", {})]
+
+def test_one_actor_never_runs_on_two_workers_but_actors_run_in_parallel():
+    actors = []
+    for _ in range(4):
+        a = Actor(id=uuid4()); a.attach_facet(SlowFacet()); actors.append(a)
+    router = ActorRouter(InMemoryActorRepo(actors), EventBus(sync=True), workers=4, quantum=3)
+    def feed():
+        for _ in range(10):
+            for a in actors:
+                router.submit(Command("mythic.slow", {"layer": "mythic", "actor_id": str(a.id)}))
+    threads = [threading.Thread(target=feed) for _ in range(3)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert router.join(timeout=10)
+    router.shutdown()
+    for a in actors:
+        f = a.facets[Layer.MYTHIC]
+        assert f.calls == 30 and f.peak == 1
+
+def test_failures_are_reported_and_do_not_stall_the_mailbox():
+    a = mk()
+    bus = EventBus(sync=True)
+    failed = []
+    bus.subscribe("router.command_failed", failed.append)
+    router = ActorRouter(InMemoryActorRepo([a]), bus, workers=2)
+    router.submit(Command("cyber.ice_attack", {"layer": "cyber", "damage": 1, "actor_id": str(a.id)}))
+    router.submit(hit(a, 1))
+    ghost = mk()
+    router.submit(hit(ghost, 1))
+    assert router.join(timeout=5)
+    router.shutdown()
+    assert a.facets[Layer.PHYSICAL].hp == 9
+    assert sorted(e.payload["command"] for e in failed) == ["cyber.ice_attack", "physical.take_damage"]
+    assert router.stats()[str(a.id)]["failed"] == 1
@@ -0,0 +1,88 @@
+from uuid import uuid4
+from baator.domain import Actor
+from baator.domain.facets import PhysicalFacet
+from baator.kernel import Command, Event, EventBus, Layer
+from baator.runtime.context_provider import ActorRepo, ProjectionCache, SimpleContextProvider
+
+class DictRepo(ActorRepo):
+    def __init__(self, *actors):
+        self.by_id = {a.id: a for a in actors}
+        self.gets = 0
+    def get(self, actor_id):
+        self.gets += 1
+        return self.by_id.get(actor_id)
+
+def mk(name, hp=10):
+    a = Actor(id=uuid4(), name=name)
+    a.attach_facet(PhysicalFacet(hp=hp))
+    return a
+
+def test_projection_cache_shares_until_facet_event_bumps_version():
+    hero, drone = mk("hero"), mk("drone", hp=4)
+    repo = DictRepo(hero, drone)
+    bus = EventBus(sync=True)
+    cache = ProjectionCache(maxsize=8); cache.attach(bus)
+    prov = SimpleContextProvider(repo, cache=cache)
+    meta = {"actor_id": str(hero.id), "target_id": str(drone.id)}
+
+    c1, c2 = prov.resolve(meta), prov.resolve(meta)
+    assert c1["target"] is c2["target"] and c1["target"]["hp"] == 4
+    assert repo.gets == 2 and cache.hits == 2
+
+    drone.act(Command("physical.take_damage", {"layer": Layer.PHYSICAL.value, "amount": 3}))
+    for ev in drone.pull_events():
+        bus.publish(ev)
+    c3 = prov.resolve(meta)
+    assert c3["target"]["hp"] == 1 and c3["actor"] is c1["actor"]
+    assert cache.version(drone.id) == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+def test_projection_cache_is_bounded():
+    actors = [mk(f"a{i}") for i in range(3)]
+    cache = ProjectionCache(maxsize=2)
+    prov = SimpleContextProvider(DictRepo(*actors), cache=cache)
+    for a in actors:
+        prov.resolve({"actor_id": str(a.id)})
+    assert cache.stats()["size"] == 2 and cache.evictions == 1
+
+def test_expression_paths_include_dice_modifiers():
+    from baator.kernel.sexpr import expression_paths
+    assert expression_paths("1d20+actor.stats.STR") == {"actor.stats.STR"}
+    assert expression_paths("10 + target.firewall") == {"target.firewall"}
+    assert expression_paths("4") == frozenset()
+
+def test_projection_fetches_only_what_paths_need():
+    from baator.domain import Facet
+
+    class Untouchable(Facet):
+        def __getattribute__(self, name):
+            if name == "layer":
+                return Layer.CYBER
+            raise AssertionError(f"cyber facet touched: {name}")
+
+    hero, drone = mk("hero"), mk("drone", hp=4)
+    drone.attach_facet(Untouchable())
+    repo = DictRepo(hero, drone)
+    prov = SimpleContextProvider(repo)
+    ctx = prov.resolve({"actor_id": str(hero.id), "target_id": str(drone.id)},
+                       paths={"target.AC", "target.hp"})
+    assert "actor" not in ctx and repo.gets == 1          # actor never fetched
+    assert ctx["target"]["AC"] == 10 and ctx["target"]["hp"] == 4
+    assert "integrity" not in ctx["target"]               # only the named fields are projected
+
+def test_projection_keeps_the_state_it_was_resolved_from():
+    drone = mk("drone", hp=4)
+    prov = SimpleContextProvider(DictRepo(drone))
+    ctx = prov.resolve({"target_id": str(drone.id)}, paths={"target.hp"})
+    drone.act(Command("physical.take_damage", {"layer": Layer.PHYSICAL.value, "amount": 3}))
+    assert ctx["target"]["hp"] == 4
+    assert prov.resolve({"target_id": str(drone.id)})["target"]["hp"] == 1
+
+def test_scope_calls_providers_that_do_not_take_paths():
+    from baator.kernel.context import RequestScope
+
+    class Legacy:
+        def resolve(self, meta): return {"target": {"AC": 12}}
+
+    scope = RequestScope("r1", {"source": "test"}, paths=frozenset({"target.AC"}))
+    assert scope.context(Legacy())["target"]["AC"] == 12
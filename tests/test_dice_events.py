@@ -69,3 +69,36 @@ def test_meta_is_flattened():
 
     # No 'meta' blob
     assert "meta" not in seen
+
+class CountingProvider:
+    def __init__(self, ctx): self.ctx, self.calls = ctx, 0
+    def resolve(self, meta, paths=None):
+        self.calls += 1
+        return self.ctx
+
+def test_resolve_number_resolves_context_once_per_request():
+    bus = EventBus(sync=True)
+    prov = CountingProvider({"actor": {"stats": {"STR": 2}}})
+    svc = DiceService(FixedRNG(), bus, CommandBus(), prov)
+    seen = []
+    bus.subscribe("dice.resolved", lambda e: seen.append(e.payload["result"]))
+    svc.resolve_number(str(uuid4()), "1d20+actor.stats.STR", meta={"source": "test"})
+    assert seen == [6] and prov.calls == 1
+
+def test_rules_engine_shares_one_context_across_dc_roll_and_payload():
+    from baator.kernel import Layer
+    from baator.runtime import Effect, Rule, RulesEngine
+    bus = EventBus(sync=True); cbus = CommandBus()
+    prov = CountingProvider({"target": {"AC": 3}})
+    svc = DiceService(FixedRNG(), bus, cbus, prov)
+    cbus.register("dice.resolve_number", svc.handle)
+    dmg = []
+    cbus.register("physical.take_damage", lambda c: dmg.append(c.payload["amount"]))
+    rule = Rule(id="atk", layer=Layer.PHYSICAL, roll="1d20+actor.stats.STR", dc="target.AC",
+                on_success=[Effect("command", "physical.take_damage", {"amount": "1d4+actor.stats.STR"})])
+    eng = RulesEngine(cbus, bus)
+    res = eng.apply(rule, ctx={"actor": {"stats": {"STR": 1}}}, provenance={"source": "test"})
+    assert res["success"] and res["roll"] == 5 and dmg == [5]
+    assert prov.calls == 1          # caller ctx overlays the provider's, resolved once
+    eng.apply(rule, ctx={"actor": {"stats": {"STR": 1}}}, provenance={"source": "test"})
+    assert len(bus._subs["dice.resolved"]) == 0     # per-request listeners are removed
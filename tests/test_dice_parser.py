@@ -0,0 +1,85 @@
+import pytest
+
+from baator.kernel import eval_safe, roll_expr
+from baator.kernel.exprlang import DiceSpec, ExprSyntaxError, compile_expr
+from baator.kernel.sexpr import eval_number, expression_paths, parse_expression
+
+class SeqRNG:
+    def __init__(self, *seq): self.seq = list(seq)
+    def roll(self, sides): return self.seq.pop(0)
+    def random_int(self, low, high): return low
+    def ping(self): return True
+
+def spec(text):
+    (term,) = compile_expr(text).dice
+    return term.spec
+
+def test_dice_suffixes():
+    assert spec("4d6dl1") == DiceSpec(4, 6, keep=3, highest=True)
+    assert spec("2d20kl1") == DiceSpec(2, 20, keep=1, highest=False)
+    assert spec("3d8k2") == DiceSpec(3, 8, keep=2, highest=True)
+    assert spec("5d10dh2") == DiceSpec(5, 10, keep=3, highest=False)
+    assert spec("2d6!r1") == DiceSpec(2, 6, explode=True, reroll=1)
+
+def test_precedence_chains_and_calls():
+    ctx = {"a": {"b": 4}}
+    assert eval_safe("-2 * 3 + a.b // 3", ctx, mode="number") == -5
+    assert eval_safe("(1 + 2) * 3 - 7 - 1", ctx, mode="number") == 1
+    assert eval_safe("max(1, a.b - 10) + min(a.b, 2, 3)", ctx, mode="number") == 3
+    assert eval_safe("1 < a.b <= 4", ctx, mode="predicate") is True
+    assert eval_safe("3 > a.b > 1", ctx, mode="predicate") is False
+    assert eval_safe("a.b > 1", ctx) is True              # auto falls back to predicate
+
+def test_rolls_every_term():
+    # 2d6r1: 1 rerolled to 5, then 2; 1d6!: 6 explodes into 2; 1d4: 3
+    d = roll_expr("max(1, 2d6r1 - 1) + 1d6! + 1d4 + 1", SeqRNG(1, 5, 2, 6, 2, 3), verbose=True)
+    assert d["result"] == (5 + 2 - 1) + 8 + 3 + 1
+    assert d["faces"] == [5, 2, 8, 3]       # an exploded die counts as one face
+    assert d["modifier"] == 0               # max(1, 7 - 1) + 11 + 1 - 18
+    assert roll_expr("4d6dl1", SeqRNG(1, 4, 3, 6)) == 13
+    assert roll_expr("2d20kl1+a.b", SeqRNG(15, 4), ctx={"a": {"b": 2}}) == 6
+
+def test_exploding_is_capped():
+    class Max:
+        def roll(self, sides): return sides
+    assert roll_expr("1d6!", Max()) == 6 * 101
+
+def test_dice_terms_reach_the_resolver_separately():
+    seen = []
+    def resolve(rid, text, ctx):
+        seen.append(text)
+        return 10
+    parsed = parse_expression("2d6! + 1d4 + actor.STR")
+    assert eval_number("r", parsed, {"actor": {"STR": 3}}, resolve_dice=resolve) == 23
+    assert seen == ["2d6!", "1d4"]
+    assert expression_paths("max(1d8, target.hp) - actor.STR") == {"target.hp", "actor.STR"}
+
+def test_parse_is_cached_and_errors_point_at_the_text():
+    assert compile_expr("1d20 + x") is compile_expr("1d20 + x")
+    for bad in ("2 +", "1 / 2", "a.__class__", "1d6kh1kl1", "1d1!", "1d6r6", "min(1,", "5 5"):
+        with pytest.raises(ExprSyntaxError):
+            compile_expr(bad)
+    with pytest.raises(ExprSyntaxError) as ei:
+        compile_expr("1 + % 2")
+    assert ei.value.pos == 4
+    with pytest.raises(ValueError):
+        eval_safe("1d20 + 1", {}, mode="number")   # no dice outside the roller
+    assert expression_paths("not an expression!") == frozenset()
+
+def test_large_pool_rerolls_as_counts():
+    from baator.interface import PythonRNG
+    d = roll_expr("20000d6r2", PythonRNG(7), verbose=True)
+    assert d["faces"] == [] and sum(d["counts"].values()) == 20000
+    assert abs(d["result"] - 20000 * 25 / 6) < 1000     # E[die] = 1/3 * 3.5 + 2/3 * 4.5, ~5 sd
+
+def test_bounds():
+    ctx = {"a": {"b": 4}}
+    b = lambda text: compile_expr(text).bounds(ctx)
+    assert b("1d20+5") == (6, 25)
+    assert b("4d6dl1") == (3, 18) and b("0d6") == (0, 0)
+    assert b("-1d6 * a.b") == (-24, -4)
+    assert b("max(1, 1d6 - 3)") == (1, 3) and b("min(1d4, 1d8)") == (1, 4)
+    assert b("10 // 1d4") == (2, 10)
+    assert b("1d6 // (1d4 - 2)") is None            # the divisor may be 0
+    assert b("a.missing + 1") is None and b("a.b > 1") is None
+    assert compile_expr("1d6!").bounds()[1] == 6 * 101
@@ -0,0 +1,42 @@
+from math import sqrt
+
+from baator.interface import PythonRNG
+from baator.kernel import roll_expr
+from baator.kernel.dice_pool import binomial, face_counts, keep_counts
+
+def mean_var(xs):
+    m = sum(xs) / len(xs)
+    return m, sum((x - m) ** 2 for x in xs) / (len(xs) - 1)
+
+def test_binomial_moments_both_samplers():
+    rng = PythonRNG(11)
+    for n, p in ((40, 0.1), (1000, 0.3), (5000, 0.5), (200, 0.9)):
+        xs = [binomial(n, p, rng) for _ in range(4000)]
+        m, v = mean_var(xs)
+        assert all(0 <= x <= n for x in xs)
+        assert abs(m - n * p) < 5 * sqrt(n * p * (1 - p) / len(xs))
+        assert abs(v / (n * p * (1 - p)) - 1) < 0.1
+
+def test_face_counts_and_keep():
+    rng = PythonRNG(3)
+    counts = face_counts(100_000, 10, rng)
+    assert sum(counts) == 100_000 and all(abs(c - 10_000) < 600 for c in counts)
+    assert keep_counts([3, 0, 2, 5], 6, highest=True) == [0, 0, 1, 5]
+    assert keep_counts([3, 0, 2, 5], 4, highest=False) == [3, 0, 1, 0]
+
+def test_count_mode_matches_per_die_distribution():
+    a, b = PythonRNG(1), PythonRNG(2)
+    for expr, n in (("300d6+4", 300), ("120d20kh30", 120), ("40d4kl20", 40)):
+        per_die = [roll_expr(expr, a, pool_threshold=10**9) for _ in range(1500)]
+        counted = [roll_expr(expr, b, pool_threshold=1) for _ in range(1500)]
+        (m1, v1), (m2, v2) = mean_var(per_die), mean_var(counted)
+        assert abs(m1 - m2) < 5 * sqrt((v1 + v2) / 1500)
+        assert 0.8 < v1 / v2 < 1.25
+
+def test_count_mode_verbose_summarizes_faces():
+    d = roll_expr("100000d10kh10", PythonRNG(5), verbose=True)
+    assert d["faces"] == [] and d["kept"] == []
+    assert sum(d["counts"].values()) == 100_000
+    assert d["kept_counts"] == {10: 10} and d["result"] == 100
+    small = roll_expr("3d6", PythonRNG(5), verbose=True)
+    assert len(small["faces"]) == 3 and "counts" not in small
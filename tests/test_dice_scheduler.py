@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from baator.kernel import Command, CommandBus, EventBus
+from baator.runtime import DiceOverloaded, DiceScheduler, DiceService, PriorityClass
+from baator.runtime.context_provider import ActorRepo, SimpleContextProvider
+
+CLASSES = (PriorityClass("interactive", 0, max_concurrency=1),
+           PriorityClass("normal", 1, max_concurrency=1, wait_budget_ms=2000),
+           PriorityClass("background", 2, max_concurrency=1, wait_budget_ms=50, overload="degrade"))
+
+def hold(sched, meta, started, release, order, tag):
+    with sched.slot(meta):
+        order.append(tag)
+        started.set()
+        release.wait(5)
+
+def test_higher_class_overtakes_queued_work():
+    sched = DiceScheduler(CLASSES, capacity=1)
+    order, release, started = [], threading.Event(), threading.Event()
+    first = threading.Thread(target=hold, args=(sched, {"priority": "normal"}, started, release, order, "n0"))
+    first.start(); started.wait(5)
+    waiters = []
+    for tag, pri in (("n1", "normal"), ("n2", "normal"), ("i1", "interactive")):
+        t = threading.Thread(target=hold, args=(sched, {"priority": pri}, threading.Event(),
+                                                 release, order, tag))
+        t.start(); waiters.append(t)
+        time.sleep(0.05)   # queue them in this order
+    release.set(); first.join()   # also lets each waiter finish as soon as it runs
+    for t in waiters:
+        t.join(5)
+    assert order == ["n0", "i1", "n1", "n2"]
+    st = sched.stats()
+    assert st["normal"]["served"] == 3 and st["interactive"]["served"] == 1
+    assert st["normal"]["queue_wait"]["max_ms"] > 0
+
+def test_deadline_rejects_and_background_degrades():
+    sched = DiceScheduler(CLASSES, capacity=1)
+    release, started = threading.Event(), threading.Event()
+    t = threading.Thread(target=hold, args=(sched, {"priority": "interactive"}, started, release, [], "i"))
+    t.start(); started.wait(5)
+    with pytest.raises(DiceOverloaded):
+        with sched.slot({"priority": "normal", "deadline_ms": 20}):
+            pass
+    with sched.slot({"priority": "background"}) as adm:
+        assert adm.degraded and adm.wait_ms >= 40
+    release.set(); t.join()
+    st = sched.stats()
+    assert st["normal"]["rejected"] == 1 and st["background"]["degraded"] == 1
+    assert st["normal"]["queued"] == 0 and st["interactive"]["running"] == 0
+
+def test_max_queue_sheds_immediately():
+    sched = DiceScheduler((PriorityClass("normal", 0, 1, max_queue=0),), capacity=1)
+    with pytest.raises(DiceOverloaded):
+        with sched.slot():
+            pass
+    with pytest.raises(ValueError):
+        sched.classify({"priority": "nope"})
+
+class CountingRNG:
+    def __init__(self, face): self.face, self.calls = face, 0
+    def roll(self, sides): self.calls += 1; return self.face
+    def random_int(self, low, high): self.calls += 1; return low
+    def ping(self): return True
+
+def test_dice_service_uses_scheduler_and_fallback():
+    bus, cmd = EventBus(sync=True), CommandBus()
+    shared, local = CountingRNG(6), CountingRNG(1)
+    sched = DiceScheduler(CLASSES, capacity=1)
+    svc = DiceService(shared, bus, cmd, SimpleContextProvider(ActorRepo()), scheduler=sched,
+                      fallback_rng=local, metrics_every=2)
+    cmd.register("dice.resolve_number", svc.handle)
+    seen = {"resolved": [], "failed": [], "metrics": []}
+    bus.subscribe("dice.resolved", lambda e: seen["resolved"].append(e.payload["result"]))
+    bus.subscribe("rng.failed", lambda e: seen["failed"].append(e.payload))
+    bus.subscribe("dice.scheduler.metrics", lambda e: seen["metrics"].append(e.payload))
+
+    cmd.dispatch(Command("dice.resolve_number", {"expr": "1d20", "meta": {"priority": "interactive"}}))
+    assert seen["resolved"] == [6] and shared.calls == 1
+
+    release, started = threading.Event(), threading.Event()
+    t = threading.Thread(target=hold, args=(sched, {"priority": "interactive"}, started, release, [], "i"))
+    t.start(); started.wait(5)
+    cmd.dispatch(Command("dice.resolve_number", {"expr": "1d20", "meta": {"priority": "background"}}))
+    assert seen["resolved"][-1] == 1 and local.calls == 1 and shared.calls == 1
+    with pytest.raises(DiceOverloaded):
+        cmd.dispatch(Command("dice.resolve_number", {"expr": "1d20",
+                                                     "meta": {"priority": "normal", "deadline_ms": 10}}))
+    release.set(); t.join()
+    assert seen["failed"][0]["reason"] == "overloaded"
+    assert seen["metrics"] and set(seen["metrics"][0]["classes"]) == {"interactive", "normal", "background"}
@@ -0,0 +1,112 @@
+from uuid import uuid4
+
+from baator.domain import Actor, Participant, Scene
+from baator.interface import InMemoryActorRepo
+from baator.kernel import CommandBus, EventBus
+from baator.runtime import (DiceService, FocusFire, RandomTarget, RulesEngine, RulesRegistry,
+                            Simulator, load_rule_packs)
+from baator.runtime.context_provider import SimpleContextProvider
+
+class FixedRNG:
+    def roll(self, sides: int) -> int: return 6
+    def random_int(self, low: int, high: int) -> int: return low
+    def ping(self) -> bool: return True
+
+STATS = {"actor_stats": lambda p: {"stats": {"STR": 2}}, "target_stats": lambda p: {"AC": 5}}
+
+def make_sim(scene):
+    # the DiceService resolves provenance actor_ids through the repo
+    repo = InMemoryActorRepo(Actor(id=p.actor_id, name=p.name) for p in scene.order())
+    bus, cmd = EventBus(sync=True), CommandBus()
+    svc = DiceService(FixedRNG(), bus, cmd, SimpleContextProvider(repo))
+    cmd.register("dice.resolve_number", svc.handle)
+    reg = load_rule_packs("packs").registry
+    sim = Simulator(reg, RulesEngine(cmd, bus), cmd, bus)
+    cmd.register("physical.take_damage", sim.take_damage)
+    return sim, bus
+
+def duel():
+    return Scene("s1", [Participant(uuid4(), "Hero", 15, hp=20, team="pc"),
+                        Participant(uuid4(), "Orc", 10, hp=14, team="npc"),
+                        Participant(uuid4(), "Goblin", 5, hp=7, team="npc")])
+
+def test_run_encounter_until_one_side_stands():
+    scene = duel()
+    sim, bus = make_sim(scene)
+    seen = []
+    bus.subscribe("sim.trace.begin", seen.append)
+    rep = sim.run_encounter(scene, FocusFire("physical.attack.basic", **STATS))
+    # FixedRNG: every hit lands for 6+2; the heroes' side always goes first
+    assert rep.outcome == "decided"
+    assert rep.winners == ["pc"]
+    assert scene.by_name("Goblin").hp == 0 and scene.by_name("Orc").hp == 0
+    assert scene.by_name("Hero").hp == 20 - 8 * 2   # the orc swings twice
+    assert rep.actions == rep.successes and rep.turns >= rep.actions
+    assert rep.rounds == 3 and rep.turns_per_sec > 0
+    assert seen == []   # tracing is off by default
+
+def test_focus_fire_picks_weakest_and_trace_publishes():
+    scene = duel()
+    sim, bus = make_sim(scene)
+    begins = []
+    bus.subscribe("sim.trace.begin", begins.append)
+    sim.run_encounter(scene, FocusFire("physical.attack.basic", **STATS), max_rounds=1, trace=True)
+    assert begins[0].payload["target"] == "Goblin"
+    assert begins[0].payload["ctx"]["target"]["hp"] == 7
+
+def test_max_rounds_and_passing_policy():
+    class Pass:
+        def choose(self, scene, actor): return None
+    scene = duel()
+    sim, _ = make_sim(scene)
+    rep = sim.run_encounter(scene, Pass(), max_rounds=3)
+    assert rep.outcome == "max_rounds" and rep.rounds == 3 and rep.turns == 9
+    assert rep.actions == 0 and sorted(rep.winners) == ["npc", "pc"]
+
+def test_random_target_and_unaligned_free_for_all():
+    scene = Scene("ffa", [Participant(uuid4(), n, i, hp=8) for i, n in enumerate("abcd")])
+    sim, _ = make_sim(scene)
+    rep = sim.run_encounter(scene, RandomTarget("physical.attack.basic", FixedRNG(), **STATS))
+    assert rep.outcome == "decided" and len(rep.winners) == 1
+
+def test_take_damage_needs_running_encounter():
+    import pytest
+    from baator.kernel import Command
+    sim, _ = make_sim(duel())
+    with pytest.raises(LookupError):
+        sim.take_damage(Command("physical.take_damage", {"scene_id": "nope", "target_id": str(uuid4()), "amount": 1}))
+
+def test_damage_goes_through_the_actor_facet():
+    from baator.domain.facets import PhysicalFacet
+    from baator.kernel import Layer
+    from baator.runtime.context_provider import ProjectionCache
+    scene = duel()
+    actors = [Actor(id=p.actor_id, name=p.name) for p in scene.order()]
+    for a in actors:
+        a.attach_facet(PhysicalFacet(hp=30))
+    repo = InMemoryActorRepo(actors)
+    bus, cmd = EventBus(sync=True), CommandBus()
+    cache = ProjectionCache(); cache.attach(bus)
+    cmd.register("dice.resolve_number", DiceService(FixedRNG(), bus, cmd, SimpleContextProvider(repo, cache)).handle)
+    sim = Simulator(load_rule_packs("packs").registry, RulesEngine(cmd, bus), cmd, bus, actors=repo)
+    cmd.register("physical.take_damage", sim.take_damage)
+    taken = []
+    bus.subscribe("physical.damage_taken", lambda e: taken.append(e.payload["hp"]))
+    sim.attach(scene)
+    orc = scene.by_name("Orc")
+    assert orc.hp == 30                                  # the facet is the hp authority
+    sim.apply_rule(scene, "physical.attack.basic", actor=scene.by_name("Hero"), target=orc,
+                   ctx_extra={"actor": {"stats": {"STR": 2}}, "target": {"AC": 5}})
+    assert scene.by_name("Orc").hp == repo.get(orc.actor_id).facets[Layer.PHYSICAL].hp == 22
+    assert taken == [22] and cache.version(orc.actor_id) == 1
+
+def test_damage_without_an_actor_facet_still_publishes():
+    from baator.kernel import Command
+    scene = duel()
+    sim, bus = make_sim(scene)
+    taken = []
+    bus.subscribe("physical.damage_taken", lambda e: taken.append(e.payload))
+    sim.attach(scene)
+    orc = scene.by_name("Orc")
+    sim.take_damage(Command("physical.take_damage", {"scene_id": "s1", "target_id": str(orc.actor_id), "amount": 4}))
+    assert scene.by_name("Orc").hp == 10 and taken[0]["hp"] == 10 and taken[0]["actor_id"] == orc.actor_id
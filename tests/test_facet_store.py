@@ -0,0 +1,53 @@
+from uuid import uuid4
+import pytest
+
+from baator.domain import Actor
+from baator.domain.facets import CyberFacet, FacetStore, PhysicalFacet
+from baator.kernel import Command, Layer
+
+def mk(name, hp=10, cyber=False):
+    a = Actor(id=uuid4(), name=name)
+    a.attach_facet(PhysicalFacet(hp=hp, stamina=3))
+    if cyber:
+        a.attach_facet(CyberFacet(integrity=4))
+    return a
+
+def test_views_keep_the_facet_api():
+    store = FacetStore()
+    a = mk("hero", hp=10, cyber=True)
+    slot = store.adopt(a)
+    phys = a.facets[Layer.PHYSICAL]
+    assert isinstance(phys, PhysicalFacet) and phys.layer is Layer.PHYSICAL
+    assert (phys.hp, phys.stamina, a.facets[Layer.CYBER].integrity) == (10, 3, 4)
+
+    a.act(Command("physical.take_damage", {"layer": "physical", "amount": 3}))
+    assert store.column("hp")[slot] == 7 and phys.hp == 7
+    assert a.pull_events()[0].payload["hp"] == 7
+
+def test_bulk_damage_matches_act_and_records_events():
+    store = FacetStore()
+    actors = [mk(f"u{i}", hp=5 + i) for i in range(4)]
+    slots = store.adopt_many(actors)
+    assert store.take_damage(slots, 6) == [0, 0, 1, 2]
+    assert store.heal(slots[:2], [1, 2], record=False) == [1, 2]
+    ev = actors[3].pull_events()
+    assert [e.name for e in ev] == ["physical.damage_taken"]
+    assert ev[0].payload == {"amount": 6, "hp": 2, "actor_id": actors[3].id, "layer": "physical"}
+    assert store.where("hp", lambda v: v > 1) == [1, 3]
+
+def test_missing_layer_rejects_the_whole_batch():
+    store = FacetStore()
+    a, b = mk("a", cyber=True), mk("b")
+    slots = store.adopt_many([a, b])
+    with pytest.raises(ValueError):
+        store.ice_attack(slots, 2)
+    assert a.facets[Layer.CYBER].integrity == 4
+
+def test_release_restores_plain_facets_and_reuses_slot():
+    store = FacetStore()
+    a = mk("a", hp=8)
+    slot = store.adopt(a)
+    store.take_damage([slot], 5)
+    store.release(a)
+    assert type(a.facets[Layer.PHYSICAL]) is PhysicalFacet and a.facets[Layer.PHYSICAL].hp == 3
+    assert store.adopt(mk("b")) == slot and len(store) == 1
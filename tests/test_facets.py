@@ -132,3 +132,65 @@ def test_unknown_command_on_facet_is_noop_eventwise_but_does_not_crash():
     evts = a.pull_events()
     assert evts == []          # no events emitted
     assert phys.hp == 9        # no state change
+
+
+# ---------- handler tables & batched dispatch ----------
+
+def test_handler_table_is_built_per_class():
+    assert set(PhysicalFacet._handlers) == {"physical.take_damage", "physical.heal"}
+    assert PhysicalFacet._handlers["physical.heal"] is PhysicalFacet.heal
+    assert set(CyberFacet._handlers) == {"cyber.ice_attack"}
+
+
+def test_act_many_matches_sequential_act():
+    cmds = [
+        Command(name="physical.take_damage", payload={"layer": Layer.PHYSICAL.value, "amount": 4}),
+        Command(name="mythic.invocation", payload={"layer": Layer.MYTHIC.value, "cost": 5}),
+        Command(name="physical.heal", payload={"layer": Layer.PHYSICAL.value, "amount": 1}),
+        Command(name="mythic.invocation", payload={"layer": Layer.MYTHIC.value, "cost": 5}),
+    ]
+    seq, bulk = mk_actor(), mk_actor()
+    for a in (seq, bulk):
+        a.attach_facet(PhysicalFacet(hp=10, stamina=5))
+        a.attach_facet(MythicFacet(essence=6, wards=2))
+    for c in cmds:
+        seq.act(Command(c.name, dict(c.payload)))
+    events = bulk.act_many(Command(c.name, dict(c.payload)) for c in cmds)
+
+    assert [e.name for e in events] == [e.name for e in seq.pull_events()]
+    assert events == bulk.pull_events()
+    assert bulk.facets[Layer.PHYSICAL].hp == 7 and bulk.facets[Layer.MYTHIC].essence == 1
+    assert events[-1].name == "mythic.invocation_failed"
+
+
+def test_act_many_rejects_batch_with_missing_facet_before_applying():
+    a = mk_actor()
+    a.attach_facet(PhysicalFacet(hp=10, stamina=5))
+    with pytest.raises(ValueError):
+        a.act_many([
+            Command(name="physical.take_damage", payload={"layer": Layer.PHYSICAL.value, "amount": 4}),
+            Command(name="cyber.ice_attack", payload={"layer": Layer.CYBER.value, "damage": 1}),
+        ])
+    assert a.facets[Layer.PHYSICAL].hp == 10 and a.pull_events() == []
+
+
+def test_act_many_keeps_events_of_commands_applied_before_a_failure():
+    a = mk_actor()
+    a.attach_facet(PhysicalFacet(hp=10, stamina=5))
+    with pytest.raises(KeyError):
+        a.act_many([
+            Command(name="physical.take_damage", payload={"layer": Layer.PHYSICAL.value, "amount": 4}),
+            Command(name="physical.heal", payload={"layer": Layer.PHYSICAL.value}),   # no amount
+        ])
+    assert a.facets[Layer.PHYSICAL].hp == 6
+    assert [e.name for e in a.pull_events()] == ["physical.damage_taken"]
+
+
+def test_act_batch_spans_actors_in_per_actor_order():
+    from baator.domain import act_batch
+    a, b = mk_actor("a"), mk_actor("b")
+    a.attach_facet(PhysicalFacet(hp=10, stamina=5))
+    b.attach_facet(PhysicalFacet(hp=10, stamina=5))
+    hit = lambda n: Command(name="physical.take_damage", payload={"layer": Layer.PHYSICAL.value, "amount": n})
+    events = act_batch([(a, hit(1)), (b, hit(2)), (a, hit(3))])
+    assert [(e.payload["actor_id"], e.payload["hp"]) for e in events] == [(a.id, 9), (a.id, 6), (b.id, 8)]
@@ -0,0 +1,66 @@
+from uuid import uuid4
+
+from baator.domain import Participant, Scene
+from baator.kernel import CommandBus, EventBus, LayeredContext
+from baator.kernel.context import overlay
+from baator.runtime import DiceService, RulesEngine, Simulator, load_rule_packs
+
+class FixedRNG:
+    def roll(self, sides: int) -> int: return 10
+    def random_int(self, low: int, high: int) -> int: return low
+    def ping(self) -> bool: return True
+
+class StaticProvider:
+    def __init__(self, ctx): self.ctx = ctx
+    def resolve(self, meta, paths=None): return self.ctx
+
+def test_top_layer_wins_and_nested_mappings_merge():
+    base = {"actor": {"hp": 9, "stats": {"STR": 1, "DEX": 3}}, "round": 1}
+    extra = {"actor": {"stats": {"STR": 4}}, "round": 2}
+    ctx = LayeredContext(extra, base, names=("extra", "base"))
+    assert ctx["round"] == 2 and ctx["actor"]["hp"] == 9
+    assert dict(ctx["actor"]["stats"]) == {"STR": 4, "DEX": 3}
+    assert ctx.layer_of("round") == "extra" and ctx.layer_of("nope") is None
+    assert sorted(ctx) == ["actor", "round"] and len(ctx) == 2
+    # a plain value above a mapping hides it whole
+    assert LayeredContext({"actor": None}, base)["actor"] is None
+
+def test_child_shares_layers_and_leaves_the_parent_alone():
+    scene = {"target": {"AC": 12}}
+    ctx = LayeredContext(scene, names=("scene",))
+    cover = ctx.child({"target": {"AC": 14}}, "effect")
+    assert cover["target"]["AC"] == 14 and ctx["target"]["AC"] == 12
+    assert cover.names == ("effect", "scene") and cover.layers[1] is scene
+    scene["target"]["hp"] = 3                       # layers are read through, not copied
+    assert cover["target"]["hp"] == 3
+    assert overlay(ctx, None) is ctx and overlay({}, scene) is scene
+    assert type(overlay(ctx, {"x": 1})) is LayeredContext
+
+def test_dice_events_read_the_request_context_without_copying_it():
+    actor = {"stats": {"STR": 2}}
+    bus = EventBus(sync=True)
+    svc = DiceService(FixedRNG(), bus, CommandBus(), StaticProvider({"actor": actor}))
+    seen = {}
+    for name in ("rng.requested", "rng.fulfilled", "dice.resolved"):
+        bus.subscribe(name, lambda e: seen.setdefault(e.name, e.payload))
+    svc.resolve_number("r1", "1d20+actor.stats.STR")
+    assert seen["dice.resolved"]["result"] == 12 and seen["rng.fulfilled"]["result"] == 12
+    assert seen["rng.fulfilled"]["kind"] == "expr"              # request layer under the roll
+    assert all(p["actor"] is actor and p["request_id"] == "r1" for p in seen.values())
+
+def test_simulator_extras_merge_over_the_scene_layer():
+    hero, ogre = Participant(uuid4(), "Hero", 15, hp=20), Participant(uuid4(), "Ogre", 10, hp=30)
+    scene = Scene("s1", [hero, ogre])
+    bus, cmd = EventBus(sync=True), CommandBus()
+    cmd.register("dice.resolve_number", DiceService(FixedRNG(), bus, cmd, StaticProvider(None)).handle)
+    sim = Simulator(load_rule_packs("packs").registry, RulesEngine(cmd, bus), cmd, bus)
+    sim.attach(scene)
+    cmd.register("physical.take_damage", sim.take_damage)
+    begun = []
+    bus.subscribe("sim.trace.begin", lambda e: begun.append(e.payload["ctx"]))
+    sim.apply_rule(scene, "physical.attack.basic", actor=hero, target=ogre,
+                   ctx_extra={"actor": {"stats": {"STR": 2}}, "target": {"AC": 5}})
+    ctx = begun[0]
+    assert ctx["actor"]["hp"] == 20 and ctx["actor"]["stats"]["STR"] == 2
+    assert ctx["target"]["name"] == "Ogre" and ctx.names == ("extra", "scene")
+    assert ogre.hp < 30
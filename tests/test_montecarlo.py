@@ -0,0 +1,50 @@
+from baator.interface import PythonRNG
+from baator.runtime import FocusFire
+from baator.runtime.montecarlo import (Combatant, EncounterStats, Roster, run_monte_carlo, shard_seed,
+                                       wilson_interval)
+
+ROSTER = Roster((Combatant("Hero", "party", hp=24, ac=13, stats={"STR": 3}),
+                 Combatant("Drone", "drones", hp=8, ac=10, stats={"STR": 1}),
+                 Combatant("Drone 2", "drones", hp=8, ac=10, stats={"STR": 1})))
+POLICY = FocusFire("physical.attack.basic", actor_stats=ROSTER.ctx, target_stats=ROSTER.ctx)
+
+def test_seeded_python_rng_replays():
+    a, b = PythonRNG(42), PythonRNG(42)
+    assert [a.roll(20) for _ in range(50)] == [b.roll(20) for _ in range(50)]
+    assert all(1 <= PythonRNG(1).random_int(3, 5) <= 5 for _ in range(20))
+
+def test_shard_seeds_differ_and_are_stable():
+    seeds = {shard_seed(7, i) for i in range(1000)}
+    assert len(seeds) == 1000
+    assert shard_seed(7, 3) == shard_seed(7, 3) != shard_seed(8, 3)
+
+def test_same_seed_same_stats_regardless_of_sharding_workers():
+    one = run_monte_carlo(ROSTER, POLICY, 60, seed=5, shard_size=20, workers=1)
+    two = run_monte_carlo(ROSTER, POLICY, 60, seed=5, shard_size=20, workers=2)
+    assert one.runs == two.runs == 60
+    assert (one.wins, one.rounds, one.damage) == (two.wins, two.rounds, two.damage)
+    assert sum(one.wins.values()) + one.undecided == 60
+    assert sum(one.rounds.values()) == 60 and set(one.damage) == {"party", "drones"}
+
+def test_merge_and_confidence_interval():
+    s = run_monte_carlo(ROSTER, POLICY, 40, seed=1, shard_size=10, workers=0)
+    lo, hi = s.win_rate_ci("party")
+    assert 0.0 <= lo <= s.win_rate("party") <= hi <= 1.0
+    merged = EncounterStats().merge(s).merge(s)
+    assert merged.runs == 80 and merged.win_rate("party") == s.win_rate("party")
+    assert merged.mean_rounds == s.mean_rounds
+    assert s.rounds_quantile(0.5) <= s.rounds_quantile(0.95)
+    streamed = []
+    run_monte_carlo(ROSTER, POLICY, 25, seed=1, shard_size=10, workers=0,
+                    on_shard=lambda st: streamed.append(st.runs))
+    assert streamed == [10, 20, 25]
+
+def test_wilson_interval():
+    lo, hi = wilson_interval(50, 100)
+    assert round(lo, 3) == 0.404 and round(hi, 3) == 0.596
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    assert wilson_interval(10, 10)[1] == 1.0
+
+def test_short_circuit_runs_the_same_encounters():
+    s = run_monte_carlo(ROSTER, POLICY, 20, seed=3, shard_size=10, workers=0, short_circuit=True)
+    assert s.runs == 20 and sum(s.wins.values()) + s.undecided == 20
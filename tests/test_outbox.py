@@ -0,0 +1,77 @@
+from uuid import uuid4
+import pytest
+
+from baator.domain import Actor
+from baator.domain.facets import PhysicalFacet
+from baator.kernel import Command, EventBus, Outbox
+
+def mk():
+    a = Actor(id=uuid4(), name="unit")
+    a.attach_facet(PhysicalFacet(hp=10))
+    return a
+
+def hit(n):
+    return Command("physical.take_damage", {"layer": "physical", "amount": n})
+
+class BatchTransport:
+    def __init__(self): self.batches, self.singles = [], []
+    def publish(self, e): self.singles.append(e)
+    def publish_batch(self, events): self.batches.append(list(events))
+    def close(self): pass
+
+def test_pull_events_swaps_the_buffer():
+    a = mk(); a.act(hit(1))
+    buf = a._events
+    assert a.pull_events() is buf and a._events == [] and a._events is not buf
+
+def test_unit_of_work_publishes_one_ordered_batch():
+    t = BatchTransport()
+    outbox = Outbox(EventBus(t))
+    a, b = mk(), mk()
+    with outbox.unit_of_work() as uow:
+        uow.track(a); a.act(hit(1))
+        uow.track(b); b.act(hit(2))
+        uow.track(a); a.act(hit(3))
+    assert t.singles == [] and len(t.batches) == 1
+    assert [(e.payload["actor_id"], e.payload["hp"]) for e in t.batches[0]] == [(a.id, 9), (a.id, 6), (b.id, 8)]
+    assert outbox.stats()["events_per_flush"] == 3 and not a.has_events
+
+def test_failed_unit_of_work_publishes_nothing():
+    bus = EventBus(sync=True)
+    seen = []
+    bus.subscribe("physical.damage_taken", seen.append)
+    outbox = Outbox(bus)
+    a = mk()
+    with pytest.raises(RuntimeError):
+        with outbox.unit_of_work() as uow:
+            uow.track(a); a.act(hit(1))
+            raise RuntimeError("abort")
+    assert seen == [] and a.has_events and outbox.flush() == 0
+
+def test_sync_bus_batch_dispatches_in_order():
+    bus = EventBus(sync=True)
+    seen = []
+    bus.subscribe("physical.damage_taken", lambda e: seen.append(e.payload["hp"]))
+    a = mk()
+    for n in (1, 2, 3):
+        a.act(hit(n))
+    bus.publish_batch(a.pull_events())
+    assert seen == [9, 7, 4]
+
+def test_failed_publish_requeues_the_batch():
+    class FlakyBus:
+        def __init__(self): self.batches, self.down = [], True
+        def publish_batch(self, events):
+            if self.down:
+                raise ConnectionError("broker down")
+            self.batches.append(list(events))
+    bus = FlakyBus()
+    outbox = Outbox(bus)
+    a = mk()
+    outbox.track(a); a.act(hit(1))
+    with pytest.raises(ConnectionError):
+        outbox.flush()
+    a.act(hit(2))                               # recorded while the batch was out
+    bus.down = False
+    assert outbox.flush() == 2
+    assert [e.payload["hp"] for e in bus.batches[0]] == [9, 7]
@@ -0,0 +1,46 @@
+import os
+from baator.runtime import PackCache
+
+PACK = """
+pack_id: t.pack
+version: {v}
+engine_min: 0.4
+namespace: t
+rules:
+  - id: r1
+    layer: physical
+    roll: "1d20"
+    dc: {dc}
+"""
+
+def test_warm_load_hits_cache_and_source_change_rebuilds(tmp_path):
+    src = tmp_path / "p.yaml"
+    src.write_text(PACK.format(v=1, dc=5))
+    cache = PackCache(cache_dir=tmp_path / "cache")
+
+    assert cache.load(src).rules[0].dc == 5
+    assert cache.load(src).rules[0].dc == 5
+    assert [l.cached for l in cache.loads] == [False, True]
+
+    src.write_text(PACK.format(v=2, dc=7))
+    os.utime(src, ns=(1, 1))                 # new content, arbitrary mtime
+    pack = cache.load(src)
+    assert (pack.version, pack.rules[0].dc) == (2, 7)
+    assert cache.loads[-1].cached is False
+
+    # same content, touched: revalidated by hash, still warm
+    os.utime(src, ns=(2, 2))
+    assert cache.load(src).version == 2
+    assert cache.loads[-1].cached is True
+
+    r = cache.report()
+    assert r["cold"]["count"] == 2 and r["warm"]["count"] == 2
+
+def test_corrupt_cache_file_is_rebuilt(tmp_path):
+    src = tmp_path / "p.yaml"
+    src.write_text(PACK.format(v=1, dc=5))
+    cache = PackCache()
+    cache.load(src)
+    cache.cache_path(src).write_bytes(b"garbage")
+    assert cache.load(src).pack_id == "t.pack"
+    assert cache.loads[-1].cached is False
@@ -0,0 +1,40 @@
+from baator.runtime import load_rule_packs
+
+def pack(pack_id, ns, rid, version=1, engine="0.4"):
+    return f"""
+pack_id: {pack_id}
+version: {version}
+engine_min: {engine}
+namespace: {ns}
+rules:
+  - id: {rid}
+    layer: physical
+    roll: "1d20"
+    dc: 5
+"""
+
+def make_tree(root):
+    (root / "sub").mkdir()
+    (root / "a.yaml").write_text(pack("p.a", "phys", "hit"))
+    (root / "b.yaml").write_text(pack("p.b", "phys", "kick"))          # shares namespace, no clash
+    (root / "c.yaml").write_text(pack("p.c", "phys", "hit"))           # key clash with p.a
+    (root / "sub" / "d.yml").write_text(pack("p.a", "phys", "hit", version=2))
+    (root / "e.yaml").write_text(pack("p.e", "cyber", "x", engine="9.0"))
+    (root / "f.yaml").write_text("pack_id: broken\n")
+
+def test_directory_load_reports_instead_of_failing(tmp_path):
+    make_tree(tmp_path)
+    report = load_rule_packs(tmp_path, workers=1)
+    status = {f.path.rsplit("/", 1)[1]: f.status for f in report.files}
+    assert status == {"a.yaml": "superseded", "b.yaml": "ok", "c.yaml": "collision",
+                      "d.yml": "ok", "e.yaml": "incompatible", "f.yaml": "error"}
+    assert sorted(report.registry.all()) == ["phys.hit", "phys.kick"]
+    assert "Missing pack field" in next(f.error for f in report.files if f.status == "error")
+    assert all(f.elapsed_ms >= 0 for f in report.files)
+
+def test_process_pool_merge_matches_serial(tmp_path):
+    make_tree(tmp_path)
+    serial = load_rule_packs(tmp_path, workers=1)
+    pooled = load_rule_packs(tmp_path, workers=2, min_parallel=2)
+    assert [(f.path, f.status) for f in pooled.files] == [(f.path, f.status) for f in serial.files]
+    assert pooled.registry.all() == serial.registry.all()
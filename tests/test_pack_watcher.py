@@ -0,0 +1,89 @@
+import os
+from baator.kernel import EventBus
+from baator.runtime import PackWatcher, RulesRegistry, load_rule_packs
+
+PACK = """
+pack_id: t.pack
+version: 1
+engine_min: 0.4
+namespace: t
+rules:
+  - id: stays
+    layer: physical
+    roll: "1d20"
+    dc: 5
+  - id: edited
+    layer: physical
+    roll: "1d20"
+    dc: {dc}
+"""
+
+def write(path, text, tick):
+    path.write_text(text)
+    os.utime(path, ns=(tick, tick))   # deterministic mtime change
+
+def test_reload_swaps_snapshot_and_keeps_unchanged_rules(tmp_path):
+    src = tmp_path / "p.yaml"
+    write(src, PACK.format(dc=5), 1)
+    bus = EventBus(sync=True)
+    seen = []
+    for name in ("rules.pack_loaded", "rules.pack_reloaded", "rules.pack_reload_failed"):
+        bus.subscribe(name, lambda e: seen.append((e.name, e.payload)))
+    reg = RulesRegistry()
+    w = PackWatcher(reg, [tmp_path], bus)
+
+    w.poll()
+    assert sorted(reg.all()) == ["t.edited", "t.stays"]
+    before = reg.snapshot()
+    stays = reg.get("t.stays")
+    assert w.poll() == []                     # nothing changed, nothing reparsed
+
+    write(src, PACK.format(dc=9), 2)
+    [diff] = w.poll()
+    assert diff.changed == ["t.edited"] and diff.unchanged == ["t.stays"]
+    assert reg.get("t.stays") is stays
+    assert reg.get("t.edited").dc == 9
+    assert before["t.edited"].dc == 5         # in-flight readers keep the old plan
+    name, payload = seen[-1]
+    assert name == "rules.pack_reloaded" and payload["elapsed_ms"] >= 0
+
+    write(src, "rules: [", 3)
+    assert w.poll() == []
+    assert seen[-1][0] == "rules.pack_reload_failed"
+    assert reg.get("t.edited").dc == 9        # previous version still served
+
+    src.unlink()
+    [diff] = w.poll()
+    assert sorted(diff.removed) == ["t.edited", "t.stays"]
+    assert reg.all() == {}
+
+def test_failed_swap_to_another_pack_keeps_the_old_one(tmp_path):
+    one = "pack_id: {pid}\nversion: 1\nengine_min: 0.4\nnamespace: {ns}\nrules:\n  - id: r\n    layer: physical\n    dc: 5\n"
+    a, b = tmp_path / "a.yaml", tmp_path / "b.yaml"
+    write(a, one.format(pid="a", ns="t"), 1)
+    write(b, one.format(pid="b", ns="u"), 1)
+    reg = RulesRegistry()
+    w = PackWatcher(reg, [tmp_path])
+    w.poll()
+    write(a, one.format(pid="c", ns="u"), 2)  # now a different pack, colliding with b's u.r
+    assert w.poll() == []
+    assert sorted(reg.all()) == ["t.r", "u.r"]
+    write(a, one.format(pid="c", ns="v"), 3)
+    w.poll()
+    assert sorted(reg.all()) == ["u.r", "v.r"]
+
+def test_adopt_watches_yml_and_leaves_superseded_files_alone(tmp_path):
+    one = "pack_id: p\nversion: {v}\nengine_min: 0.4\nnamespace: t\nrules:\n  - id: r\n    layer: physical\n    dc: {dc}\n"
+    new, old = tmp_path / "a.yml", tmp_path / "b.yaml"
+    write(new, one.format(v=2, dc=5), 1)
+    write(old, one.format(v=1, dc=7), 1)
+    report = load_rule_packs(tmp_path, workers=1)
+    assert [f.status for f in report.files] == ["ok", "superseded"]
+    w = PackWatcher(report.registry, [tmp_path])
+    w.adopt(report)
+    assert w.poll() == []
+    write(old, one.format(v=1, dc=8), 2)      # the loser is not reloaded over the winner
+    assert w.poll() == []
+    write(new, one.format(v=2, dc=9), 2)
+    [diff] = w.poll()
+    assert diff.changed == ["t.r"] and report.registry.get("t.r").dc == 9
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+import pytest
+
+from baator.kernel import PathError, compile_path, eval_safe
+from baator.kernel.sexpr import parse_expression, eval_number
+
+@dataclass
+class Stats:
+    STR: int = 3
+
+class Slotted:
+    __slots__ = ("stats",)
+    def __init__(self): self.stats = Stats()
+
+def test_accessor_walks_dict_mapping_dataclass_and_slots():
+    acc = compile_path("actor.body.stats.STR")
+    assert acc is compile_path("actor.body.stats.STR")       # compiled once
+    ctx = MappingProxyType({"actor": {"body": Slotted()}})
+    assert acc(ctx) == 3
+
+def test_missing_segment_is_named():
+    with pytest.raises(PathError) as ei:
+        compile_path("actor.stats.DEX")({"actor": {"stats": {"STR": 1}}})
+    assert ei.value.segment == "DEX"
+    assert "'actor.stats'" in str(ei.value)
+    with pytest.raises(ValueError):
+        compile_path("actor.__class__")
+
+def test_both_evaluators_share_accessors():
+    ctx = {"actor": Slotted()}
+    assert eval_safe("actor.stats.STR * 2", ctx, mode="number") == 6
+    parsed = parse_expression("actor.stats.STR + 1")
+    assert eval_number("r", parsed, ctx, resolve_dice=lambda *a: 0) == 4
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from baator.kernel import Command, CommandBus, EventBus, ResultCache
+from baator.runtime import DiceService
+from baator.runtime.context_provider import ActorRepo, SimpleContextProvider
+
+class Clock:
+    def __init__(self): self.t = 0.0
+    def __call__(self): return self.t
+
+def test_ttl_and_size_eviction():
+    clock = Clock()
+    c = ResultCache(max_entries=2, ttl_s=10, clock=clock)
+    c.put("a", 1); c.put("b", 2); c.put("c", 3)
+    assert "a" not in c and c.get("b") == 2 and c.evictions == 1
+    clock.t = 10.5
+    assert c.get("c") is None and len(c) == 0 and c.expirations == 2
+    assert c.stats()["hits"] == 1 and c.stats()["misses"] == 1
+
+class CountingRNG:
+    def __init__(self): self.calls = 0
+    def roll(self, sides): self.calls += 1; return 1 + self.calls % sides
+    def random_int(self, low, high): self.calls += 1; return low
+    def ping(self): return True
+
+def service(**kw):
+    bus, cmd = EventBus(sync=True), CommandBus()
+    rng = CountingRNG()
+    svc = DiceService(rng, bus, cmd, SimpleContextProvider(ActorRepo()), results=ResultCache(), **kw)
+    cmd.register("dice.resolve_number", svc.handle)
+    cmd.register("dice.roll_expression", svc.handle)
+    return svc, bus, cmd, rng
+
+def test_retry_replays_original_events_without_rolling():
+    svc, bus, cmd, rng = service()
+    seen = []
+    for name in ("rng.requested", "rng.fulfilled", "dice.resolved"):
+        bus.subscribe(name, seen.append)
+    req = Command("dice.resolve_number", {"expr": "2d6+1", "request_id": "r-1"})
+    cmd.dispatch(req)
+    first = list(seen)
+    assert [e.name for e in first] == ["rng.requested", "rng.fulfilled", "dice.resolved"]
+    rolls = rng.calls
+    seen.clear()
+    cmd.dispatch(req)
+    assert rng.calls == rolls
+    assert seen == [first[1], first[2]]          # the very same events, no new rng.requested
+    assert svc.replays == 1 and svc.results.hits == 1
+
+    # a different expr or command under the same id is a different request
+    cmd.dispatch(Command("dice.roll_expression", {"expr": "2d6+1", "request_id": "r-1"}))
+    assert rng.calls > rolls
+
+def test_no_request_id_is_never_deduplicated():
+    svc, bus, cmd, rng = service()
+    cmd.dispatch(Command("dice.resolve_number", {"expr": "1d20"}))
+    cmd.dispatch(Command("dice.resolve_number", {"expr": "1d20"}))
+    assert rng.calls == 2 and len(svc.results) == 0
+
+def test_concurrent_retry_waits_for_first_attempt():
+    svc, bus, cmd, rng = service()
+    gate, entered = threading.Event(), threading.Event()
+    slow_roll = rng.roll
+    def roll(sides):
+        entered.set(); gate.wait(5)
+        return slow_roll(sides)
+    rng.roll = roll
+    results = []
+    bus.subscribe("dice.resolved", lambda e: results.append(e.payload["result"]))
+    req = Command("dice.resolve_number", {"expr": "1d20", "request_id": "r-2"})
+    t1 = threading.Thread(target=cmd.dispatch, args=(req,)); t1.start()
+    entered.wait(5)
+    t2 = threading.Thread(target=cmd.dispatch, args=(req,)); t2.start()
+    time.sleep(0.05)
+    gate.set(); t1.join(); t2.join()
+    assert rng.calls == 1 and len(results) == 2 and results[0] == results[1]
+
+def test_dedupe_metrics_published():
+    svc, bus, cmd, _ = service()
+    got = []
+    bus.subscribe("dice.dedupe.metrics", got.append)
+    req = Command("dice.resolve_number", {"expr": "1d4", "request_id": "r-3"})
+    cmd.dispatch(req); cmd.dispatch(req)
+    svc.publish_metrics()
+    assert got[0].payload["replays"] == 1 and got[0].payload["hits"] == 1
@@ -48,3 +48,37 @@ rules:
     assert seen["cmds"][0]["layer"] == "physical"
     # with FixedRNG 1d20=6 >= dc 5 → success path taken
     assert seen["evts"] == []
+
+class CountingRNG(FixedRNG):
+    def __init__(self): self.calls = 0
+    def roll(self, sides: int) -> int:
+        self.calls += 1
+        return 6
+
+def test_short_circuit_skips_settled_rolls():
+    from baator.kernel import Layer
+    from baator.runtime import Effect, Rule
+    bus, cmd, rng = EventBus(sync=True), CommandBus(), CountingRNG()
+    svc = DiceService(rng, bus, cmd, SimpleContextProvider(ActorRepo()))
+    cmd.register("dice.resolve_number", svc.handle)
+    hits, traces = [], []
+    cmd.register("physical.take_damage", lambda c: hits.append(c.payload["amount"]))
+    bus.subscribe("rules.trace", lambda e: traces.append(e.payload))
+    rule = Rule(id="atk", layer=Layer.PHYSICAL, roll="1d20+actor.STR", dc="target.AC",
+                on_success=[Effect("command", "physical.take_damage", {"amount": "1d4"})])
+    eng = RulesEngine(cmd, bus, short_circuit=True)
+    prov = {"source": "test"}
+
+    res = eng.apply(rule, ctx={"actor": {"STR": 5}, "target": {"AC": 6}}, provenance=prov)
+    assert res == {"applied": True, "success": True, "roll": None, "dc": 6, "short_circuit": True}
+    assert rng.calls == 1 and hits == [6]            # only the damage die rolled
+    assert traces[-1]["short_circuit"] and traces[-1]["roll_bounds"] == [6, 25]
+
+    res = eng.apply(rule, ctx={"actor": {"STR": 0}, "target": {"AC": 21}}, provenance=prov)
+    assert not res["success"] and res["short_circuit"] and rng.calls == 1
+    res = eng.apply(rule, ctx={"actor": {"STR": 0}, "target": {"AC": 10}}, provenance=prov)
+    assert not res["short_circuit"] and res["roll"] == 6 and rng.calls == 2
+    assert eng.short_circuits == 2
+    # off by default
+    res = RulesEngine(cmd, bus).apply(rule, ctx={"actor": {"STR": 5}, "target": {"AC": 6}}, provenance=prov)
+    assert res["roll"] == 11 and not res["short_circuit"]
@@ -0,0 +1,48 @@
+import random
+from uuid import uuid4
+
+from baator.domain import Participant, Scene
+
+def mk(name, init):
+    return Participant(actor_id=uuid4(), name=name, initiative=init)
+
+def reference(members):
+    return sorted(members, key=lambda p: p.initiative, reverse=True)
+
+def test_incremental_order_matches_a_full_sort():
+    rng = random.Random(7)
+    sc, members = Scene("s"), []
+    for i in range(300):
+        op = rng.random()
+        if op < 0.6 or not members:
+            p = mk(f"p{i}", rng.randint(0, 20)); sc.add(p); members.append(p)
+        elif op < 0.8:
+            p = members.pop(rng.randrange(len(members))); sc.remove(p.actor_id)
+        else:
+            p = rng.choice(members); v = rng.randint(0, 20)
+            sc.update_initiative(p.actor_id, v)
+            members.remove(p); members.append(p)   # re-ranked like a new arrival among ties
+        assert sc.order() == reference(members)
+    assert sc.by_name(members[0].name) is members[0] and sc.get(members[-1].actor_id) is members[-1]
+
+def test_current_participant_survives_changes_around_it():
+    a, b, c = mk("a", 15), mk("b", 10), mk("c", 5)
+    sc = Scene("s", [c, a, b])
+    assert [p.name for p in sc.order()] == ["a", "b", "c"]
+    sc.next_turn()
+    assert sc.current() is b
+    sc.add(mk("fast", 20))
+    assert sc.current() is b
+    sc.remove(a.actor_id)
+    assert sc.current() is b
+    sc.update_initiative(b.actor_id, 1)
+    assert sc.current() is b and sc.order()[-1] is b
+    sc.remove(b.actor_id)                      # last in order: wraps to the top
+    assert sc.current().name == "fast"
+
+def test_direct_list_assignment_is_resorted():
+    sc = Scene("s")
+    sc.participants = [mk("slow", 1), mk("quick", 9)]
+    assert sc.current().name == "quick"
+    sc.participants.append(mk("quickest", 12))
+    assert [p.name for p in sc.order()] == ["quickest", "quick", "slow"]
@@ -0,0 +1,151 @@
+from uuid import uuid4
+
+import pytest
+
+from baator.domain import Actor, Participant, Scene
+from baator.domain.facets import CyberFacet, PhysicalFacet
+from baator.kernel import Command, Layer
+from baator.runtime import FocusFire
+from baator.runtime.montecarlo import Combatant, Roster
+from baator.runtime.scene_host import HashRing, SceneHost, WorkerLost
+
+def test_hash_ring_moves_few_keys():
+    keys = [f"scene-{i}" for i in range(2000)]
+    ring = HashRing(["w0", "w1", "w2"])
+    before = {k: ring.owner(k) for k in keys}
+    assert set(before.values()) == {"w0", "w1", "w2"}
+    ring.add("w3")
+    moved = [k for k in keys if ring.owner(k) != before[k]]
+    assert all(ring.owner(k) == "w3" for k in moved)   # only onto the new node
+    assert 0.1 < len(moved) / len(keys) < 0.45
+    ring.remove("w3")
+    assert {k: ring.owner(k) for k in keys} == before
+
+def table(sid):
+    roster = Roster((Combatant("Hero", "party", hp=20, ac=12, stats={"STR": 3}),
+                     Combatant("Drone", "drones", hp=9, ac=10, stats={"STR": 1})), scene_id=sid)
+    return roster
+
+@pytest.fixture(scope="module")
+def host():
+    with SceneHost(2, seed=3) as h:
+        yield h
+
+def test_scenes_route_run_and_migrate(host):
+    from baator.interface import PythonRNG
+    rosters = {f"t{i}": table(f"t{i}") for i in range(6)}
+    for sid, roster in rosters.items():
+        scene, actors = roster(PythonRNG(1))
+        host.open_scene(scene, actors).result(timeout=30)
+    placed = host.placement()
+    assert sorted(s for ss in placed.values() for s in ss) == sorted(rosters)
+
+    traces = []
+    host.bus.subscribe("rules.trace", traces.append)
+    futs = {sid: host.run_encounter(sid, FocusFire("physical.attack.basic", actor_stats=r.ctx,
+                                                   target_stats=r.ctx), max_rounds=50)
+            for sid, r in rosters.items()}
+    reports = {sid: f.result(timeout=30) for sid, f in futs.items()}
+    assert all(r.outcome == "decided" for r in reports.values())
+    assert len(traces) == sum(r.actions for r in reports.values())
+
+    # migrate one scene and keep using it; its state comes along
+    sid = "t0"
+    src = host.owner(sid)
+    dst = next(w for w in host.workers if w != src)
+    hp_before = {p.name: p.hp for p in _scene(host, sid).order()}
+    host.migrate(sid, dst)
+    assert host.owner(sid) == dst
+    assert {p.name: p.hp for p in _scene(host, sid).order()} == hp_before
+
+    for sid in rosters:
+        scene, _ = host.close_scene(sid)
+        assert scene.scene_id == sid
+    assert host.placement() == {w: [] for w in host.workers}
+
+def _scene(host, sid):
+    from baator.domain.snapshot import load_scene
+    return load_scene(host.snapshot(sid).result(timeout=30))[0]
+
+def test_dispatch_errors_and_rebalance(host):
+    a = Actor(id=uuid4(), name="Netrunner")
+    a.attach_facet(PhysicalFacet(hp=10)); a.attach_facet(CyberFacet(integrity=10))
+    scenes = [Scene(f"r{i}", [Participant(a.id, a.name, 10, hp=10)]) for i in range(8)]
+    for sc in scenes:
+        host.open_scene(sc, [a]).result(timeout=30)
+
+    hits = []
+    host.bus.subscribe("cyber.integrity_damaged", hits.append)
+    host.dispatch("r0", Command("cyber.ice_attack", {"layer": "cyber", "damage": 3,
+                                                     "target_id": str(a.id)})).result(timeout=30)
+    assert hits and hits[0].payload["integrity"] == 7
+    host.dispatch("r0", Command("physical.take_damage", {"amount": 4, "target_id": str(a.id)})).result(timeout=30)
+    assert _scene(host, "r0").by_name("Netrunner").hp == 6
+
+    with pytest.raises(LookupError):
+        host.dispatch("nope", Command("physical.take_damage", {}))
+    with pytest.raises(KeyError):
+        host.dispatch("r0", Command("no.such.command", {})).result(timeout=30)
+
+    n = len(host.workers)
+    moved = host.add_worker()
+    assert len(host.workers) == n + 1 and moved == len(host.placement()[host.workers[-1]])
+    moved_back = host.remove_worker(host.workers[-1])
+    assert moved_back == moved and len(host.workers) == n
+    assert _scene(host, "r0").by_name("Netrunner").hp == 6   # state survived two moves
+    for sc in scenes:
+        host.close_scene(sc.scene_id)
+
+def test_damage_and_healing_share_one_hp(host):
+    a = Actor(id=uuid4(), name="Medic")
+    a.attach_facet(PhysicalFacet(hp=20))
+    host.open_scene(Scene("heal", [Participant(a.id, a.name, 10, hp=20)]), [a]).result(timeout=30)
+    seen = []
+    for name in ("physical.damage_taken", "physical.healed"):
+        host.bus.subscribe(name, lambda e: seen.append((e.name, e.payload["hp"])))
+    host.dispatch("heal", Command("physical.take_damage", {"amount": 5, "target_id": str(a.id)})).result(timeout=30)
+    host.dispatch("heal", Command("physical.heal", {"layer": "physical", "amount": 3,
+                                                    "target_id": str(a.id)})).result(timeout=30)
+    scene, actors = host.close_scene("heal")
+    assert scene.by_name("Medic").hp == actors[a.id].facets[Layer.PHYSICAL].hp == 18
+    assert seen == [("physical.damage_taken", 15), ("physical.healed", 18)]
+
+def test_migrated_scene_continues_its_dice_stream(host):
+    hero, ogre = (Actor(id=uuid4(), name=n) for n in ("Hero", "Ogre"))
+    for a in (hero, ogre):
+        a.attach_facet(PhysicalFacet(hp=999))
+    extra = {"actor": {"stats": {"STR": 1}}, "target": {"AC": 12}}
+    rolls = []
+
+    def play(n):
+        for _ in range(n):
+            rolls.append(host.apply_rule("dice", "physical.attack.basic", actor="Hero", target="Ogre",
+                                         ctx_extra=extra).result(timeout=30)["roll"])
+
+    def reopen():
+        scene = Scene("dice", [Participant(hero.id, "Hero", 10, hp=999), Participant(ogre.id, "Ogre", 5, hp=999)])
+        host.open_scene(scene, [hero, ogre]).result(timeout=30)
+
+    reopen(); play(3)
+    host.migrate("dice", next(w for w in host.workers if w != host.owner("dice")))
+    play(3)
+    host.close_scene("dice")
+    migrated, rolls[:] = list(rolls), []
+    reopen(); play(6)                    # same seed, never moved
+    host.close_scene("dice")
+    assert len(migrated) == 6 and migrated == rolls
+
+def test_requests_to_a_dead_worker_fail():
+    import os, signal
+    from baator.interface import PythonRNG
+    with SceneHost(1, seed=1, liveness_interval=0.05) as h:
+        scene, actors = table("dead")(PythonRNG(1))
+        h.open_scene(scene, actors).result(timeout=30)
+        proc = h._workers[h.owner("dead")].process
+        os.kill(proc.pid, signal.SIGSTOP)        # alive but not serving: the request stays queued
+        fut = h.snapshot("dead")
+        proc.kill(); proc.join()
+        with pytest.raises(WorkerLost):
+            fut.result(timeout=10)
+        with pytest.raises(WorkerLost):
+            h.stats()
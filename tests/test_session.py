@@ -0,0 +1,48 @@
+from baator.kernel import CommandBus, EventBus, EvalSession, Layer, eval_safe
+from baator.runtime import DiceService, RulesEngine, Rule, Effect
+
+class FixedRNG:
+    def roll(self, sides: int) -> int: return 10
+    def random_int(self, low: int, high: int) -> int: return low
+    def ping(self) -> bool: return True
+
+class StaticProvider:
+    def __init__(self, ctx): self.ctx = ctx
+    def resolve(self, meta, paths=None): return self.ctx
+
+def test_eval_safe_session_memoizes_paths_and_results():
+    ctx = {"target": {"AC": 12, "hp": 3}}
+    s = EvalSession()
+    assert eval_safe("target.AC + 1", ctx, mode="number", session=s) == 13
+    assert eval_safe("target.AC + 1", ctx, mode="number", session=s) == 13
+    assert eval_safe("target.AC > target.hp", ctx, mode="predicate", session=s) is True
+    # second full eval + the AC path reused by the predicate
+    assert s.saved == 2
+    # a different ctx never sees another ctx's values
+    assert eval_safe("target.AC + 1", {"target": {"AC": 1}}, mode="number", session=s) == 2
+
+def test_apply_shares_lookups_and_invalidates_after_effects():
+    ctx = {"actor": {"stats": {"STR": 2}}, "target": {"hp": 10, "AC": 5}}
+    bus = EventBus(sync=True); cmd = CommandBus()
+    svc = DiceService(FixedRNG(), bus, cmd, StaticProvider(ctx))
+    cmd.register("dice.resolve_number", svc.handle)
+    hits = []
+    def on_damage(c):
+        hits.append(c.payload["amount"])
+        ctx["actor"]["stats"]["STR"] += 1          # effect mutates state
+    cmd.register("physical.take_damage", on_damage)
+
+    rule = Rule(id="atk", layer=Layer.PHYSICAL, when=["target.hp > 0"],
+                roll="1d20+actor.stats.STR", dc="target.AC",
+                on_success=[
+                    Effect("command", "physical.take_damage", {"amount": "actor.stats.STR"}),
+                    Effect("command", "physical.take_damage", {"amount": "actor.stats.STR"}),
+                ])
+    traces = []
+    bus.subscribe("rules.trace", lambda e: traces.append(e.payload))
+    s = EvalSession()
+    res = RulesEngine(cmd, bus).apply(rule, ctx=ctx, provenance={"source": "test"}, session=s)
+    assert res["success"] and res["roll"] == 12
+    assert hits == [2, 3]                 # second effect re-read after invalidation
+    assert s.invalidations == 2
+    assert traces[0]["lookups_saved"] == s.saved > 0
@@ -0,0 +1,34 @@
+import pickle
+from uuid import uuid4
+import pytest
+
+from baator.domain import Actor, Character, Participant, Scene
+from baator.domain.facets import CyberFacet, FacetStore, MythicFacet, PhysicalFacet
+from baator.kernel import Command, Event, Layer
+from baator.runtime import Effect, Rule, RulePack
+
+def test_domain_objects_have_no_instance_dict():
+    a = Actor(id=uuid4(), name="hero")
+    for f in (PhysicalFacet(), CyberFacet(), MythicFacet()):
+        a.attach_facet(f)
+    objs = [a, Character(id=uuid4()), Participant(uuid4(), "hero", 3), Scene("s"),
+            Command("x", {}), Event("x", {}), Effect("event", "x", {}),
+            Rule("r", Layer.PHYSICAL), RulePack("p", 1, "0.1", "ns"), *a.facets.values()]
+    for obj in objs:
+        assert not hasattr(obj, "__dict__"), type(obj).__name__
+    with pytest.raises(AttributeError):
+        a.nickname = "typo"
+
+def test_slotted_actor_keeps_events_and_pickles():
+    a = Actor(id=uuid4(), name="hero")
+    a.attach_facet(PhysicalFacet(hp=5))
+    a.act(Command("physical.take_damage", {"layer": "physical", "amount": 2}))
+    b = pickle.loads(pickle.dumps(a))
+    assert b == a and b.facets[Layer.PHYSICAL].hp == 3
+    assert [e.name for e in b.pull_events()] == ["physical.damage_taken"] and b.pull_events() == []
+
+def test_store_views_are_slotted_too():
+    a = Actor(id=uuid4(), name="hero")
+    a.attach_facet(PhysicalFacet())
+    FacetStore().adopt(a)
+    assert not hasattr(a.facets[Layer.PHYSICAL], "__dict__")
@@ -0,0 +1,80 @@
+from uuid import uuid4
+
+from baator.domain import Actor, Character, Participant, Scene
+from baator.domain.facets import CyberFacet, FacetStore, PhysicalFacet
+from baator.domain.snapshot import checkpoint, dump_scene, load_scene
+from baator.kernel import Command, Layer
+
+def hit(n):
+    return Command("physical.take_damage", {"layer": "physical", "amount": n})
+
+def mk(name, hp=10):
+    a = Actor(id=uuid4(), name=name)
+    a.attach_facet(PhysicalFacet(hp=hp))
+    a.attach_facet(CyberFacet())
+    return a
+
+def test_actor_fork_copies_a_facet_only_when_written():
+    a = mk("hero")
+    b = a.fork()
+    assert b.facets[Layer.CYBER] is a.facets[Layer.CYBER]
+    b.act(hit(4))
+    assert b.facets[Layer.PHYSICAL].hp == 6 and a.facets[Layer.PHYSICAL].hp == 10
+    assert b.facets[Layer.CYBER] is a.facets[Layer.CYBER]          # untouched: still shared
+    a.act(hit(1))                                                  # parent copies too
+    assert a.facets[Layer.PHYSICAL].hp == 9 and b.facets[Layer.PHYSICAL].hp == 6
+
+def test_fork_of_store_backed_actor_detaches_from_the_arrays():
+    a = mk("unit")
+    store = FacetStore(); slot = store.adopt(a)
+    b = a.fork()
+    b.act(hit(3))
+    store.take_damage([slot], 1, record=False)
+    assert a.facets[Layer.PHYSICAL].hp == 9 and b.facets[Layer.PHYSICAL].hp == 7
+
+def test_scene_fork_shares_participants_until_written():
+    p, q = Participant(uuid4(), "p", 10), Participant(uuid4(), "q", 5)
+    sc = Scene("s", [p, q])
+    fk = sc.fork()
+    assert fk.get(p.actor_id) is p
+    fk.update_initiative(q.actor_id, 20)
+    fk.writable(p.actor_id).hp = 1
+    assert [x.name for x in fk.order()] == ["q", "p"] and fk.get(p.actor_id).hp == 1
+    assert [x.name for x in sc.order()] == ["p", "q"] and p.hp == 10 and q.initiative == 5
+
+def test_scene_fork_copies_every_field():
+    from dataclasses import dataclass, field
+
+    @dataclass(slots=True)
+    class Tagged(Scene):
+        tags: list = field(default_factory=list)
+
+    sc = Tagged("s", [Participant(uuid4(), "p", 10)], round=3, tags=["night"])
+    fk = sc.fork()
+    assert type(fk) is Tagged and fk.round == 3 and fk.tags == ["night"]
+    fk.tags.append("rain")
+    assert sc.tags == ["night"]
+
+def test_checkpoint_forks_are_independent():
+    a = mk("hero")
+    cp = checkpoint(Scene("s", [Participant(a.id, "hero", 3)]), [a])
+    s1, actors1 = cp.fork()
+    actors1[a.id].act(hit(5))
+    _, actors2 = cp.fork()
+    a.act(hit(2))
+    assert actors2[a.id].facets[Layer.PHYSICAL].hp == 10
+    assert cp.actors[a.id].facets[Layer.PHYSICAL].hp == 10
+
+def test_binary_snapshot_round_trip():
+    actors = [mk(f"u{i}", hp=i) for i in range(5)]
+    ch = Character(id=uuid4(), name="pc", hp=7); ch.attach_facet(PhysicalFacet(hp=3))
+    actors.append(ch)
+    sc = Scene("battle", [Participant(a.id, a.name, i % 3) for i, a in enumerate(actors)], round=4)
+    sc.next_turn(); sc.next_turn()
+    scene, loaded = load_scene(dump_scene(sc, actors))
+    assert scene == sc and scene.current() == sc.current()
+    assert [p.name for p in scene.order()] == [p.name for p in sc.order()]
+    for a in actors:
+        b = loaded[a.id]
+        assert type(b) is type(a) and b.name == a.name and b.facets == a.facets
+    assert loaded[ch.id].hp == 7
@@ -0,0 +1,65 @@
+"""
+Single vs batched actor lookups at scale, in memory and in SQLite, plus
+write-behind facet updates vs one transaction per save.
+
+    PYTHONPATH=src python tools/bench/bench_actor_repo.py [n_actors]
+"""
+import pathlib
+import random
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+from baator.domain import Actor
+from baator.domain.facets import CyberFacet, PhysicalFacet
+from baator.interface import InMemoryActorRepo, SQLiteActorRepo
+from baator.kernel import Layer
+
+LOOKUPS = 20_000
+BATCH = 500
+
+def mk(i: int) -> Actor:
+    a = Actor(id=uuid4(), name=f"actor{i}")
+    a.attach_facet(PhysicalFacet(hp=10 + i % 7))
+    if i % 3 == 0:
+        a.attach_facet(CyberFacet())
+    return a
+
+def timed(label: str, n: int, fn) -> None:
+    t0 = time.perf_counter(); fn(); dt = time.perf_counter() - t0
+    print(f"  {label:<28}: {dt * 1000:9.1f} ms  ({dt / n * 1e6:7.2f} us/actor)")
+
+def bench(repo, ids) -> None:
+    sample = random.sample(ids, LOOKUPS)
+    timed("get x%d" % LOOKUPS, LOOKUPS, lambda: [repo.get(i) for i in sample])
+    timed("get_many %d x%d" % (BATCH, LOOKUPS // BATCH), LOOKUPS,
+          lambda: [repo.get_many(sample[j:j + BATCH]) for j in range(0, LOOKUPS, BATCH)])
+
+def main(n: int) -> None:
+    random.seed(1)
+    actors = [mk(i) for i in range(n)]
+    ids = [a.id for a in actors]
+    print(f"{n} actors, {LOOKUPS} lookups")
+
+    print("memory")
+    mem = InMemoryActorRepo()
+    timed("add_many", n, lambda: mem.add_many(actors))
+    bench(mem, ids)
+
+    with tempfile.TemporaryDirectory() as d:
+        print("sqlite")
+        repo = SQLiteActorRepo(pathlib.Path(d) / "bench.db")
+        timed("add_many", n, lambda: repo.add_many(actors))
+        bench(repo, ids)
+        upd = actors[:5000]
+        timed("add (one txn per save)", len(upd), lambda: [repo.add(a) for a in upd])
+        def write_behind():
+            for a in upd:
+                repo.update_facet(a.id, a.facets[Layer.PHYSICAL])
+            repo.flush()
+        timed("update_facet + flush", len(upd), write_behind)
+        repo.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
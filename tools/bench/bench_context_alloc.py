@@ -0,0 +1,82 @@
+"""
+Memory allocated per action (Simulator.apply_rule of physical.attack.basic,
+traced) by context handling: transient peak, what a subscriber that keeps
+every event retains, and time per action, as the per-call context grows
+wider (more top-level keys beside actor and target).
+
+    PYTHONPATH=src python tools/bench/bench_context_alloc.py [actions]
+"""
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+from baator.domain import Actor, Participant, Scene
+from baator.domain.facets import PhysicalFacet
+from baator.interface import InMemoryActorRepo, PythonRNG
+from baator.kernel import CommandBus, EventBus
+from baator.runtime import DiceService, RulesEngine, Simulator, load_rule_packs
+from baator.runtime.context_provider import SimpleContextProvider
+
+WIDTHS = (0, 8, 32)
+EVENTS = ("sim.trace.begin", "sim.trace.end", "rules.trace", "rng.requested", "rng.fulfilled", "dice.resolved")
+
+def extra(width):
+    ctx = {"actor": {"hp": 10**9, "stats": {"STR": 2}}, "target": {"hp": 10**9, "AC": 12}}
+    ctx.update((f"tag{i}", i) for i in range(width))
+    return ctx
+
+def wiring(keep, ctx_extra):
+    actors = []
+    for name in ("hero", "ogre"):
+        a = Actor(id=uuid4(), name=name)
+        a.attach_facet(PhysicalFacet(hp=10**9))
+        actors.append(a)
+    scene = Scene("bench", [Participant(a.id, a.name, 10, hp=10**9) for a in actors])
+    bus, cmd = EventBus(sync=True), CommandBus()
+    svc = DiceService(PythonRNG(1), bus, cmd, SimpleContextProvider(InMemoryActorRepo(actors)))
+    cmd.register("dice.resolve_number", svc.handle)
+    sim = Simulator(load_rule_packs("packs").registry, RulesEngine(cmd, bus), cmd, bus)
+    cmd.register("physical.take_damage", sim.take_damage)
+    sim.attach(scene)
+    for name in EVENTS:
+        bus.subscribe(name, (lambda e: keep.append(e.payload)) if keep is not None else (lambda e: None))
+    hero, ogre = scene.order()
+    return lambda: sim.apply_rule(scene, "physical.attack.basic", actor=hero, target=ogre, ctx_extra=ctx_extra)
+
+def measure(actions, width):
+    act = wiring(None, extra(width))
+    for _ in range(100):
+        act()
+    t0 = time.perf_counter()
+    for _ in range(actions):
+        act()
+    us = (time.perf_counter() - t0) * 1e6 / actions
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(actions):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        act()
+        peak += tracemalloc.get_traced_memory()[1] - base
+
+    kept: list = []
+    act = wiring(kept, extra(width))
+    act()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(actions):
+        act()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return peak / actions, retained / actions, us, len(kept) // (actions + 1)
+
+def main(actions: int) -> None:
+    print(f"{actions} actions per row; retained = a subscriber keeps every event")
+    print(f"{'extra keys':>10}{'events':>8}{'transient B':>13}{'retained B':>12}{'us/action':>11}")
+    for width in WIDTHS:
+        peak, retained, us, events = measure(actions, width)
+        print(f"{width:10d}{events:8d}{peak:13.0f}{retained:12.0f}{us:11.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
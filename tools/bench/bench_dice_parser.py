@@ -0,0 +1,94 @@
+"""
+exprlang (tokenizer + Pratt parser, cached) vs the regex-rewrite + ast.parse
+pipeline it replaced, on parsing and on evaluating rule expressions.
+
+    PYTHONPATH=src python tools/bench/bench_dice_parser.py [reps]
+"""
+import ast
+import re
+import sys
+import time
+
+from baator.kernel.exprlang import compile_expr
+from baator.kernel.paths import compile_path
+
+CTX = {"actor": {"stats": {"STR": 3, "DEX": 2}, "level": 5}, "target": {"AC": 14, "hp": 9}}
+EXPRS = ("target.AC", "1d20+actor.stats.STR", "10 + actor.stats.DEX * 2 - target.hp // 3",
+         "target.hp > 0", "actor.level * 2 + actor.stats.STR - 1")
+
+# ---- the old pipeline: whole-text dice regex, __DICE placeholders, ast walk ----
+
+_LEGACY_DICE = re.compile(
+    r"^\s*(?P<count>\d+)[dD](?P<sides>\d+)(?:k(?P<keep_mode>[hl])?(?P<keep>\d+))?"
+    r"(?:\s*(?P<sign>[+-])\s*(?P<modifier>(?:\d+|[A-Za-z_][\w.]*)))?\s*$")
+
+def legacy_parse(expr):
+    s = expr.strip()
+    slots, out, last = {}, [], 0
+    for i, m in enumerate(_LEGACY_DICE.finditer(s)):
+        out.append(s[last:m.start()])
+        slots[f"__DICE{i}"] = m.group(0)
+        out.append(f"__DICE{i}")
+        last = m.end()
+    out.append(s[last:])
+    return ast.parse("".join(out), mode="eval").body, slots
+
+def legacy_eval(expr, ctx, roll):
+    tree, slots = legacy_parse(expr)
+
+    def num(n):
+        if isinstance(n, ast.Constant): return n.value
+        if isinstance(n, ast.Name):
+            return roll(slots[n.id], ctx) if n.id in slots else compile_path(n.id)(ctx)
+        if isinstance(n, ast.Attribute):
+            parts, cur = [], n
+            while isinstance(cur, ast.Attribute):
+                parts.insert(0, cur.attr); cur = cur.value
+            return compile_path(".".join([cur.id, *parts]))(ctx)
+        if isinstance(n, ast.UnaryOp): return -num(n.operand)
+        if isinstance(n, ast.Compare): return int(num(n.left) > num(n.comparators[0]))
+        ops = {ast.Add: int.__add__, ast.Sub: int.__sub__, ast.Mult: int.__mul__, ast.FloorDiv: int.__floordiv__}
+        return ops[type(n.op)](num(n.left), num(n.right))
+    return num(tree)
+
+def legacy_roll(text, ctx):
+    # fixed dice, so both pipelines must agree; the modifier is resolved as the old roller did
+    m = _LEGACY_DICE.match(text)
+    mod = m.group("modifier")
+    val = 0 if mod is None else int(mod) if mod.isdigit() else compile_path(mod)(ctx)
+    return 10 + (val if m.group("sign") == "+" else -val)
+
+def new_eval(expr, ctx, roll):
+    e = compile_expr(expr)
+    return int(e.predicate(ctx, roll=roll)) if "<" in expr or ">" in expr else e.number(ctx, roll=roll)
+
+# ---------------------------------------------------------------------------------
+
+def per_call_us(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        for expr in EXPRS:
+            fn(expr)
+    return (time.perf_counter() - t0) * 1e6 / (reps * len(EXPRS))
+
+def main(reps: int) -> None:
+    def cold_parse(expr):
+        compile_expr.cache_clear()
+        compile_expr(expr)
+
+    roll = lambda term: 10
+    for expr in EXPRS:
+        assert new_eval(expr, CTX, roll) == legacy_eval(expr, CTX, legacy_roll), expr
+
+    rows = (
+        ("parse, uncached", per_call_us(legacy_parse, reps), per_call_us(cold_parse, reps)),
+        ("parse + evaluate", per_call_us(lambda e: legacy_eval(e, CTX, legacy_roll), reps),
+                             per_call_us(lambda e: new_eval(e, CTX, roll), reps)),
+    )
+    print(f"{len(EXPRS)} expressions, {reps} reps")
+    print(f"{'':<20}{'regex+ast us':>14}{'exprlang us':>13}{'speedup':>10}")
+    for name, old, new in rows:
+        print(f"{name:<20}{old:14.2f}{new:13.2f}{old / new:9.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,30 @@
+"""
+Per-die vs count-based rolling for large dice pools.
+
+    PYTHONPATH=src python tools/bench/bench_dice_pool.py [reps]
+"""
+import sys
+import time
+
+from baator.interface import PythonRNG
+from baator.kernel import roll_expr
+
+EXPRS = ("50d6", "200d6", "5000d6", "100000d10kh10", "20000d20kl5+3")
+
+def per_call_ms(expr, rng, threshold, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        roll_expr(expr, rng, pool_threshold=threshold)
+    return (time.perf_counter() - t0) * 1000.0 / reps
+
+def main(reps: int) -> None:
+    rng = PythonRNG(1)
+    print(f"{'expr':<16}{'per-die ms':>12}{'counts ms':>12}{'speedup':>10}")
+    for expr in EXPRS:
+        n = int(expr.split("d")[0])
+        slow = per_call_ms(expr, rng, 10**12, max(1, reps * 200 // n))
+        fast = per_call_ms(expr, rng, 1, reps)
+        print(f"{expr:<16}{slow:12.3f}{fast:12.3f}{slow / fast:9.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,75 @@
+"""
+DM roll latency during a simulation burst, with and without DiceScheduler.
+The shared RNG is made slow (like a busy rngd) and only `capacity` callers
+may use it at once.
+
+    PYTHONPATH=src python tools/bench/bench_dice_scheduler.py [background_threads]
+"""
+import statistics
+import sys
+import threading
+import time
+
+from baator.kernel import Command, CommandBus, EventBus
+from baator.runtime import DiceScheduler, DiceService
+from baator.runtime.context_provider import ActorRepo, SimpleContextProvider
+
+class SlowRNG:
+    """A remote generator with a fixed number of connections."""
+    def __init__(self, delay_s: float, connections: int):
+        self.delay_s = delay_s
+        self._conns = threading.Semaphore(connections)
+    def roll(self, sides):
+        with self._conns:
+            time.sleep(self.delay_s)
+            return 1 + int(time.perf_counter_ns()) % sides
+    def random_int(self, low, high): return low + self.roll(high - low + 1) - 1
+    def ping(self): return True
+
+class FastRNG:
+    def roll(self, sides): return 1 + int(time.perf_counter_ns()) % sides
+    def random_int(self, low, high): return low + self.roll(high - low + 1) - 1
+    def ping(self): return True
+
+def run(n_bg: int, scheduler) -> None:
+    bus, cmd = EventBus(sync=True), CommandBus()
+    svc = DiceService(SlowRNG(0.002, 2), bus, cmd, SimpleContextProvider(ActorRepo()),
+                      scheduler=scheduler, fallback_rng=FastRNG(), metrics_every=0)
+    cmd.register("dice.resolve_number", svc.handle)
+    stop = threading.Event()
+
+    def background():
+        while not stop.is_set():
+            try:
+                cmd.dispatch(Command("dice.resolve_number", {"expr": "3d6", "meta": {"priority": "background"}}))
+            except Exception:
+                pass
+
+    threads = [threading.Thread(target=background, daemon=True) for _ in range(n_bg)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    lat = []
+    for _ in range(30):
+        t0 = time.perf_counter()
+        cmd.dispatch(Command("dice.resolve_number", {"expr": "1d20", "meta": {"priority": "interactive"}}))
+        lat.append((time.perf_counter() - t0) * 1000.0)
+        time.sleep(0.01)
+    stop.set()
+    for t in threads:
+        t.join()
+    label = "scheduler" if scheduler else "no scheduler"
+    lat.sort()
+    print(f"  {label:<13} DM roll p50 {statistics.median(lat):7.2f} ms  p95 {lat[int(len(lat) * 0.95) - 1]:7.2f} ms")
+    if scheduler:
+        bg = scheduler.stats()["background"]
+        print(f"  {'':<13} background served {bg['served']}, degraded {bg['degraded']},"
+              f" wait p95 {bg['queue_wait']['p95_ms']:.1f} ms")
+
+def main(n_bg: int) -> None:
+    print(f"{n_bg} background threads rolling 3d6 in a loop")
+    run(n_bg, None)
+    run(n_bg, DiceScheduler(capacity=2))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
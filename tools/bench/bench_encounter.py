@@ -0,0 +1,53 @@
+"""
+Engine load test: headless encounters end to end (policy -> RulesEngine ->
+DiceService -> context provider -> effects), tracing off.
+
+    PYTHONPATH=src python tools/bench/bench_encounter.py [participants_per_side]
+"""
+import sys
+import time
+from uuid import uuid4
+
+from baator.domain import Actor, Participant, Scene
+from baator.domain.facets import PhysicalFacet
+from baator.interface import InMemoryActorRepo, PythonRNG
+from baator.kernel import CommandBus, EventBus
+from baator.runtime import DiceService, FocusFire, RulesEngine, Simulator, load_rule_packs
+from baator.runtime.context_provider import SimpleContextProvider
+
+def encounter(n):
+    parts, actors = [], []
+    for team in ("red", "blue"):
+        for i in range(n):
+            a = Actor(id=uuid4(), name=f"{team}{i}")
+            a.attach_facet(PhysicalFacet(hp=20))
+            actors.append(a)
+            parts.append(Participant(a.id, a.name, (i * 7) % 20, hp=20, team=team))
+    return Scene(f"bench-{n}", parts), actors
+
+def main(n: int) -> None:
+    registry = load_rule_packs("packs").registry
+    # hp comes from the scene; AC from the repo projection; stats from the policy
+    policy = FocusFire("physical.attack.basic", actor_stats=lambda p: {"stats": {"STR": 2}})
+    turns = rounds = actions = 0
+    busy = 0.0
+    reps = max(3, 200 // n)
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        scene, actors = encounter(n)
+        bus, cmd = EventBus(sync=True), CommandBus()
+        svc = DiceService(PythonRNG(), bus, cmd, SimpleContextProvider(InMemoryActorRepo(actors)))
+        cmd.register("dice.resolve_number", svc.handle)
+        sim = Simulator(registry, RulesEngine(cmd, bus), cmd, bus)
+        cmd.register("physical.take_damage", sim.take_damage)
+        rep = sim.run_encounter(scene, policy, max_rounds=1000)
+        turns += rep.turns; rounds += rep.rounds; actions += rep.actions
+        busy += rep.elapsed_s
+    wall = time.perf_counter() - t0
+    print(f"{reps} encounters, {n} vs {n}: {rounds / reps:.1f} rounds, {turns / reps:.0f} turns each")
+    print(f"  turns/s   : {turns / busy:10.0f}")
+    print(f"  actions/s : {actions / busy:10.0f}")
+    print(f"  wall      : {wall * 1000:10.1f} ms (incl. setup)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,64 @@
+"""
+Dataclass facets vs FacetStore arrays for a large battle: memory held by
+facet state, and one round of damage via Actor.act vs a bulk take_damage.
+
+    PYTHONPATH=src python tools/bench/bench_facet_store.py [n_units]
+"""
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+from baator.domain import Actor
+from baator.domain.facets import CyberFacet, FacetStore, MythicFacet, PhysicalFacet
+from baator.kernel import Command
+
+def facets():
+    return [PhysicalFacet(hp=500), CyberFacet(), MythicFacet()]
+
+def mem_kib(build) -> float:
+    tracemalloc.start()
+    keep = build()
+    cur, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return cur / 1024
+
+def army(n):
+    out = []
+    for _ in range(n):
+        a = Actor(id=uuid4(), name="unit")
+        for f in facets():
+            a.attach_facet(f)
+        out.append(a)
+    return out
+
+def main(n: int) -> None:
+    print(f"{n} units, 3 facets each")
+    plain = mem_kib(lambda: [facets() for _ in range(n)])
+    store = FacetStore()
+    store.adopt_many(army(n))
+    arrays = sum(store.column(c).buffer_info()[1] * store.column(c).itemsize
+                 for c in ("hp", "stamina", "firewall", "integrity", "essence", "wards")) / 1024
+    views = mem_kib(lambda: [store._views[l](0) for l in store._views for _ in range(n)])
+    print(f"  dataclass facets      : {plain:9.0f} KiB")
+    print(f"  FacetStore arrays     : {arrays:9.0f} KiB")
+    print(f"  + view facets         : {views:9.0f} KiB  (only while actors hold views)")
+
+    units = army(n)
+    cmd = Command("physical.take_damage", {"layer": "physical", "amount": 3})
+    t0 = time.perf_counter()
+    for a in units:
+        a.act(cmd)
+        a.pull_events()
+    per_actor = time.perf_counter() - t0
+
+    slots = list(range(n))
+    t0 = time.perf_counter(); store.take_damage(slots, 3, record=False); bulk = time.perf_counter() - t0
+    t0 = time.perf_counter(); store.take_damage(slots, 3); bulk_ev = time.perf_counter() - t0
+    print(f"  act() per unit        : {per_actor * 1000:9.2f} ms")
+    print(f"  take_damage bulk      : {bulk * 1000:9.2f} ms")
+    print(f"  take_damage + events  : {bulk_ev * 1000:9.2f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
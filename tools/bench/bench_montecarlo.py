@@ -0,0 +1,38 @@
+"""
+Monte Carlo scaling: encounters/s for 1..N worker processes, plus the
+party's win rate with its 95% confidence interval.
+
+    PYTHONPATH=src python tools/bench/bench_montecarlo.py [runs]
+"""
+import os
+import sys
+import time
+
+from baator.runtime import FocusFire
+from baator.runtime.montecarlo import Combatant, Roster, run_monte_carlo
+
+ROSTER = Roster((Combatant("Hero", "party", hp=30, ac=14, init_bonus=2, stats={"STR": 3}),
+                 Combatant("Medic", "party", hp=18, ac=12, stats={"STR": 1}),
+                 Combatant("Drone", "drones", hp=12, ac=11, stats={"STR": 2}),
+                 Combatant("Drone 2", "drones", hp=12, ac=11, stats={"STR": 2}),
+                 Combatant("Drone 3", "drones", hp=12, ac=11, stats={"STR": 2})))
+POLICY = FocusFire("physical.attack.basic", actor_stats=ROSTER.ctx, target_stats=ROSTER.ctx)
+
+def main(runs: int) -> None:
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, cpus // 2, cpus} - {0})
+    base = None
+    for w in counts:
+        t0 = time.perf_counter()
+        stats = run_monte_carlo(ROSTER, POLICY, runs, seed=1, shard_size=max(1, runs // (4 * cpus)),
+                                workers=w)
+        wall = time.perf_counter() - t0
+        rate = runs / wall
+        base = base or rate
+        print(f"  workers={w:<3} {rate:9.0f} encounters/s  speedup x{rate / base:4.2f}")
+    lo, hi = stats.win_rate_ci("party")
+    print(f"{runs} runs: party wins {stats.win_rate('party'):.3f} (95% CI {lo:.3f}-{hi:.3f}),"
+          f" rounds mean {stats.mean_rounds:.2f} p95 {stats.rounds_quantile(0.95)}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,47 @@
+"""
+Cold vs warm rule-pack load times.
+
+    PYTHONPATH=src python tools/bench/bench_pack_cache.py [n_rules]
+"""
+import pathlib
+import sys
+import tempfile
+import time
+
+from baator.runtime import PackCache, load_rule_pack
+
+RULE = """
+  - id: attack.r{i}
+    layer: physical
+    when: ["target.hp > 0", "actor.stats.STR >= {m}"]
+    roll: "1d20+actor.stats.STR"
+    dc: "target.AC + {m}"
+    on_success:
+      - type: command
+        name: "physical.take_damage"
+        payload: {{ amount: "1d8+actor.stats.STR", layer: "physical" }}
+    on_failure:
+      - type: event
+        name: "physical.attack_missed"
+        payload: {{}}
+"""
+
+def main(n: int) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        src = pathlib.Path(d) / "big.yaml"
+        src.write_text("pack_id: bench.big\nversion: 1\nengine_min: 0.4\nnamespace: bench\nrules:\n"
+                       + "".join(RULE.format(i=i, m=i % 5) for i in range(n)))
+
+        t0 = time.perf_counter(); load_rule_pack(src); plain = time.perf_counter() - t0
+        cache = PackCache()
+        cache.load(src)                     # cold: parse + write cache
+        for _ in range(5):
+            cache.load(src)                 # warm
+        r = cache.report()
+        print(f"{n} rules, {src.stat().st_size / 1024:.0f} KiB")
+        print(f"  load_rule_pack : {plain * 1000:8.2f} ms")
+        print(f"  cache cold     : {r['cold']['avg_ms']:8.2f} ms")
+        print(f"  cache warm     : {r['warm']['avg_ms']:8.2f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,45 @@
+"""
+Scenes per second through SceneHost: many tables each playing an encounter,
+with 1 worker process and with one per core.
+
+    PYTHONPATH=src python tools/bench/bench_scene_host.py [scenes]
+"""
+import os
+import sys
+import time
+
+from baator.interface import PythonRNG
+from baator.runtime import FocusFire
+from baator.runtime.montecarlo import Combatant, Roster
+from baator.runtime.scene_host import SceneHost
+
+def roster(sid):
+    return Roster((Combatant("Hero", "party", hp=30, ac=14, stats={"STR": 3}),
+                   Combatant("Medic", "party", hp=18, ac=12, stats={"STR": 1}),
+                   Combatant("Drone", "drones", hp=12, ac=11, stats={"STR": 2}),
+                   Combatant("Drone 2", "drones", hp=12, ac=11, stats={"STR": 2})), scene_id=sid)
+
+def run(workers, n):
+    with SceneHost(workers, seed=1) as host:
+        rosters = [roster(f"table-{i}") for i in range(n)]
+        rng = PythonRNG(1)
+        for r in rosters:
+            host.open_scene(*r(rng))
+        t0 = time.perf_counter()
+        futs = [host.run_encounter(r.scene_id, FocusFire("physical.attack.basic", actor_stats=r.ctx,
+                                                          target_stats=r.ctx), max_rounds=200)
+                for r in rosters]
+        turns = sum(f.result().turns for f in futs)
+        wall = time.perf_counter() - t0
+        spread = sorted(len(s) for s in host.placement().values())
+    print(f"  workers={workers:<3} {n / wall:8.1f} scenes/s  {turns / wall:9.0f} turns/s"
+          f"  scenes per worker {spread}")
+
+def main(n: int) -> None:
+    cpus = os.cpu_count() or 1
+    print(f"{n} scenes, one encounter each")
+    for w in sorted({1, cpus}):
+        run(w, n)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
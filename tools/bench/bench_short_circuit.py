@@ -0,0 +1,62 @@
+"""
+RNG draws and throughput of encounters with and without
+RulesEngine(short_circuit=True), over matchups where more or fewer attack
+rolls are foregone conclusions (attack 1d20+STR against dc target.AC).
+
+    PYTHONPATH=src python tools/bench/bench_short_circuit.py [encounters]
+"""
+import sys
+import time
+
+from baator.interface import InMemoryActorRepo, PythonRNG
+from baator.kernel import CommandBus, EventBus
+from baator.runtime import DiceService, FocusFire, RulesEngine, Simulator, load_rule_packs
+from baator.runtime.context_provider import SimpleContextProvider
+from baator.runtime.montecarlo import Combatant, Roster
+
+# (label, hero STR, hero AC, drone STR, drone AC)
+MATCHUPS = (("even", 3, 13, 3, 13), ("veteran vs mooks", 9, 22, 0, 8), ("hopeless", 0, 30, 9, 10))
+
+class CountingRNG(PythonRNG):
+    def __init__(self, seed):
+        super().__init__(seed)
+        self.draws = 0
+
+    def roll(self, sides):
+        self.draws += 1
+        return super().roll(sides)
+
+def play(registry, roster, encounters, short_circuit):
+    rng = CountingRNG(1)
+    policy = FocusFire("physical.attack.basic", actor_stats=roster.ctx, target_stats=roster.ctx)
+    repo = InMemoryActorRepo()
+    bus, cmd = EventBus(sync=True), CommandBus()
+    cmd.register("dice.resolve_number", DiceService(rng, bus, cmd, SimpleContextProvider(repo)).handle)
+    engine = RulesEngine(cmd, bus, short_circuit=short_circuit)
+    sim = Simulator(registry, engine, cmd, bus)
+    cmd.register("physical.take_damage", sim.take_damage)
+    actions = 0
+    t0 = time.perf_counter()
+    for _ in range(encounters):
+        scene, actors = roster(rng)
+        repo.add_many(actors)
+        actions += sim.run_encounter(scene, policy, max_rounds=50).actions
+        for a in actors:
+            repo.remove(a.id)
+    return rng.draws, actions, time.perf_counter() - t0, engine.short_circuits
+
+def main(encounters: int) -> None:
+    registry = load_rule_packs("packs").registry
+    print(f"{encounters} encounters per matchup")
+    print(f"{'matchup':<18}{'draws':>9}{'draws sc':>10}{'settled':>9}{'actions/s':>11}{'act/s sc':>10}")
+    for label, h_str, h_ac, d_str, d_ac in MATCHUPS:
+        roster = Roster((Combatant("Hero", "party", hp=30, ac=h_ac, stats={"STR": h_str}),
+                         Combatant("Drone", "drones", hp=10, ac=d_ac, stats={"STR": d_str}),
+                         Combatant("Drone 2", "drones", hp=10, ac=d_ac, stats={"STR": d_str})))
+        draws, actions, secs, _ = play(registry, roster, encounters, False)
+        draws_sc, actions_sc, secs_sc, settled = play(registry, roster, encounters, True)
+        print(f"{label:<18}{draws:9d}{draws_sc:10d}{settled / max(actions_sc, 1):8.0%}"
+              f"{actions / secs:11.0f}{actions_sc / secs_sc:10.0f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
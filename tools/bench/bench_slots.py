@@ -0,0 +1,66 @@
+"""
+Bytes per actor (3 facets) and per participant: the slotted domain classes
+vs plain-dataclass clones of the same fields (the layout before __slots__).
+
+    PYTHONPATH=src python tools/bench/bench_slots.py [n]
+"""
+import dataclasses
+import sys
+import tracemalloc
+from uuid import uuid4
+
+from baator.domain import Actor, Participant
+from baator.domain.facets import CyberFacet, MythicFacet, PhysicalFacet
+
+def unslotted(cls):
+    """Same fields, ordinary __dict__ instances."""
+    specs = []
+    for f in dataclasses.fields(cls):
+        kw = {}
+        if f.default is not dataclasses.MISSING:
+            kw["default"] = f.default
+        if f.default_factory is not dataclasses.MISSING:
+            kw["default_factory"] = f.default_factory
+        specs.append((f.name, f.type, dataclasses.field(**kw)))
+    return dataclasses.make_dataclass(cls.__name__ + "Dict", specs)
+
+def per_object(build, n: int) -> float:
+    ids = [uuid4() for _ in range(n)]     # shared by both layouts, not counted
+    tracemalloc.start()
+    keep = [build(i) for i in ids]
+    cur, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return cur / n
+
+def main(n: int) -> None:
+    facet_classes = (PhysicalFacet, CyberFacet, MythicFacet)
+    PlainActor = unslotted(Actor)
+    plain_facets = [unslotted(c) for c in facet_classes]
+    PlainParticipant = unslotted(Participant)
+
+    def slotted_actor(i):
+        a = Actor(id=i, name="unit")
+        for c in facet_classes:
+            a.attach_facet(c())
+        return a
+
+    def plain_actor(i):
+        a = PlainActor(id=i, name="unit")
+        for c in plain_facets:
+            f = c()
+            a.facets[f.layer] = f
+        return a
+
+    rows = [
+        ("actor + 3 facets", per_object(plain_actor, n), per_object(slotted_actor, n)),
+        ("participant", per_object(lambda i: PlainParticipant(i, "unit", 10), n),
+                        per_object(lambda i: Participant(i, "unit", 10), n)),
+    ]
+    print(f"{n} objects, bytes per object")
+    print(f"  {'':<18} {'__dict__':>9} {'slots':>9} {'saved':>7}")
+    for label, before, after in rows:
+        print(f"  {label:<18} {before:9.0f} {after:9.0f} {1 - after / before:7.0%}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
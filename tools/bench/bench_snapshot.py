@@ -0,0 +1,58 @@
+"""
+What-if forks vs copy.deepcopy, and binary snapshot size/speed.
+
+    PYTHONPATH=src python tools/bench/bench_snapshot.py [n_participants]
+"""
+import copy
+import sys
+import time
+from uuid import uuid4
+
+from baator.domain import Actor, Participant, Scene
+from baator.domain.facets import CyberFacet, MythicFacet, PhysicalFacet
+from baator.domain.snapshot import checkpoint, dump_scene, load_scene
+from baator.kernel import Command
+
+def world(n):
+    actors = []
+    for i in range(n):
+        a = Actor(id=uuid4(), name=f"u{i}")
+        for f in (PhysicalFacet(hp=20), CyberFacet(), MythicFacet()):
+            a.attach_facet(f)
+        actors.append(a)
+    scene = Scene("bench", [Participant(a.id, a.name, i % 20) for i, a in enumerate(actors)])
+    return scene, actors
+
+def per_call_ms(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) * 1000.0 / reps
+
+def main(n: int) -> None:
+    scene, actors = world(n)
+    by_id = {a.id: a for a in actors}
+    hit = Command("physical.take_damage", {"layer": "physical", "amount": 3})
+    cp = checkpoint(scene, actors)
+
+    def deep():
+        s, a = copy.deepcopy((scene, by_id))
+        next(iter(a.values())).act(hit)
+
+    def fork():
+        s, a = cp.fork()
+        next(iter(a.values())).act(hit)
+
+    reps = max(3, 2000 // n)
+    print(f"{n} participants/actors, one write per candidate")
+    print(f"  copy.deepcopy    : {per_call_ms(deep, reps):8.3f} ms")
+    print(f"  checkpoint.fork  : {per_call_ms(fork, reps):8.3f} ms")
+    print(f"  scene.fork only  : {per_call_ms(scene.fork, reps * 10):8.3f} ms")
+
+    blob = dump_scene(scene, actors)
+    print(f"  snapshot size    : {len(blob) / 1024:8.1f} KiB ({len(blob) / n:.0f} B per actor+participant)")
+    print(f"  dump_scene       : {per_call_ms(lambda: dump_scene(scene, actors), reps):8.3f} ms")
+    print(f"  load_scene       : {per_call_ms(lambda: load_scene(blob), reps):8.3f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)